@@ -35,423 +35,4221 @@ if hasattr(sys.stdout, 'reconfigure'):
 if hasattr(sys.stderr, 'reconfigure'):
     sys.stderr.reconfigure(encoding='utf-8')
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, g, has_request_context, send_file
+from flask import request_started, request_finished, before_render_template, template_rendered, stream_with_context
+from flask.sessions import SecureCookieSessionInterface
+from markupsafe import Markup
+from jinja2 import ChoiceLoader, ModuleLoader
+import click
 from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from sqlalchemy import text
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user, user_logged_in, user_logged_out
+from sqlalchemy import text, event, create_engine
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.sql.expression import Select, TextClause
+from sqlalchemy.exc import OperationalError
 from datetime import datetime, timezone, timedelta
 import os
+import time
+import shutil
+import sqlite3
+import base64
+import hashlib
+import secrets
+import io
+import csv
+import json
+import math
+import queue
+import socket
+import asyncio
+import re
+import posixpath
+import mimetypes
+import urllib.parse
+import atexit
 import logging
+import logging.handlers
+import random
+import threading
+from collections import OrderedDict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps, partial
+from contextlib import contextmanager
 from flask_wtf import FlaskForm
+from flask_wtf.csrf import generate_csrf, validate_csrf
+from flask_wtf.file import FileField, FileRequired
 from wtforms import StringField, PasswordField, EmailField
-from wtforms.validators import DataRequired, Length, Email, EqualTo
+from wtforms.csrf.core import CSRF
+from wtforms.validators import DataRequired, Length, Email, EqualTo, AnyOf, ValidationError
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.exceptions import NotFound
+from werkzeug.utils import safe_join
+from itsdangerous import URLSafeTimedSerializer
 
 # 로깅 설정
-if os.getenv('RAILWAY_ENVIRONMENT'):
-    # Railway 환경에서는 파일 로깅 제외
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler()
-        ]
+# 요청 스레드는 큐에 로그 레코드를 넣기만 하고, 파일/콘솔 출력은 별도 리스너 스레드가 처리합니다.
+LOG_FORMAT = os.getenv('MYTODO_LOG_FORMAT', 'text')  # text 또는 json
+LOG_FILE = os.getenv('MYTODO_LOG_FILE', 'mytodo.log')
+LOG_MAX_BYTES = int(os.getenv('MYTODO_LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('MYTODO_LOG_BACKUP_COUNT', 5))
+LOG_QUEUE_SIZE = int(os.getenv('MYTODO_LOG_QUEUE_SIZE', 10000))
+
+class JsonLogFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 로그를 출력하는 포매터"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 레코드를 버리는 QueueHandler"""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+_log_listener = None
+
+def setup_logging():
+    """큐 기반 비동기 로깅을 설정합니다. (gunicorn 워커에서는 포크 후 다시 호출)"""
+    global _log_listener
+    if _log_listener is not None:
+        try:
+            _log_listener.stop()
+        except Exception:
+            # 포크된 프로세스에는 리스너 스레드가 없음
+            pass
+
+    if LOG_FORMAT == 'json':
+        formatter = JsonLogFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    handlers = [logging.StreamHandler()]
+    # Railway 환경에서는 파일 로깅 제외, 로컬 환경에서는 파일과 콘솔 모두 로깅
+    if not os.getenv('RAILWAY_ENVIRONMENT') and LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(DroppingQueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    return _log_listener
+
+def stop_logging():
+    """남은 로그를 모두 기록하고 리스너를 종료합니다."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+setup_logging()
+atexit.register(stop_logging)
+logger = logging.getLogger(__name__)
+
+# 한국 시간대 설정
+KST = timezone(timedelta(hours=9))
+
+# 대시보드 페이징 설정
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = int(os.getenv('MYTODO_MAX_PER_PAGE', 50))
+# 필터 결과가 이 개수를 넘으면 번호 페이징 대신 키셋(커서) 페이징 사용
+KEYSET_PAGINATION_THRESHOLD = int(os.getenv('MYTODO_KEYSET_THRESHOLD', 200))
+# 일괄 처리 한 번에 허용하는 최대 항목 수
+BULK_MAX_ITEMS = int(os.getenv('MYTODO_BULK_MAX_ITEMS', 1000))
+
+# 데이터베이스 경로 설정
+def get_db_path():
+    """데이터베이스 경로를 반환합니다."""
+    # Railway나 다른 클라우드 환경에서는 DATABASE_URL 사용
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return normalize_database_url(database_url)
+    
+    # 로컬 환경에서는 SQLite 사용
+    db_path = os.path.join(get_data_dir(), "todo.db")
+    return f'sqlite:///{db_path}'
+
+def normalize_database_url(database_url):
+    """Railway 등의 PostgreSQL URL(postgres://)을 SQLAlchemy 형식으로 변환합니다."""
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    return database_url
+
+def get_data_dir():
+    """todo.db 등 데이터 파일을 저장할 폴더를 반환합니다."""
+    if getattr(sys, 'frozen', False):
+        # PyInstaller로 빌드된 경우
+        return os.path.dirname(sys.executable)
+    # 일반 Python 실행의 경우
+    return os.path.dirname(os.path.abspath(__file__))
+
+# 데이터베이스 성능 프로필 (MYTODO_DB_PROFILE=0 이면 기본 설정 사용)
+DB_PROFILE_ENABLED = os.getenv('MYTODO_DB_PROFILE', '1') != '0'
+
+# SQLite 연결마다 적용할 PRAGMA (WAL: 읽기와 쓰기가 서로를 막지 않음)
+SQLITE_PRAGMAS = {
+    # 네트워크 드라이브처럼 WAL을 쓸 수 없는 곳에서는 MYTODO_SQLITE_JOURNAL_MODE=DELETE
+    'journal_mode': os.getenv('MYTODO_SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.getenv('MYTODO_SQLITE_BUSY_TIMEOUT', 5000)),
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,  # 음수는 KiB 단위 (약 20MB)
+    'temp_store': 'MEMORY',
+}
+
+def get_engine_options(database_uri):
+    """데이터베이스 종류에 맞는 SQLAlchemy 엔진/풀 설정을 반환합니다."""
+    if not DB_PROFILE_ENABLED:
+        return {}
+    if database_uri.startswith('sqlite'):
+        if ':memory:' in database_uri or database_uri in ('sqlite://', 'sqlite:///'):
+            return {}
+        return {
+            # 스레드 간 연결 재사용 허용, 잠금 대기는 busy_timeout PRAGMA와 맞춤
+            'connect_args': {'check_same_thread': False, 'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000},
+            'pool_size': int(os.getenv('MYTODO_DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.getenv('MYTODO_DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': 30,
+        }
+    if database_uri.startswith('postgresql'):
+        return {
+            'pool_size': int(os.getenv('MYTODO_DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.getenv('MYTODO_DB_MAX_OVERFLOW', 20)),
+            'pool_pre_ping': True,
+            'pool_recycle': int(os.getenv('MYTODO_DB_POOL_RECYCLE', 1800)),
+            'pool_timeout': 30,
+        }
+    return {}
+
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """새 SQLite 연결에 성능 PRAGMA를 적용합니다."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        execute_sqlite_pragmas(dbapi_connection)
+
+def execute_sqlite_pragmas(dbapi_connection):
+    """SQLite DB-API 연결(sqlite3 또는 aiosqlite 어댑터)에 SQLITE_PRAGMAS를 실행합니다."""
+    if not DB_PROFILE_ENABLED:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+# 읽기 전용 복제본
+# MYTODO_REPLICA_URLS(쉼표 구분)를 지정하면 대시보드 통계/목록, 검색, 사용자 로드 같은 읽기 전용 조회를 복제본에 돌아가며 보냅니다.
+# 쓰기와, 쓰기를 커밋한 클라이언트의 이후 REPLICA_STICKY_SECONDS초 동안의 읽기는 기본 DB에서 처리합니다.
+REPLICA_URLS = [normalize_database_url(url.strip()) for url in os.getenv('MYTODO_REPLICA_URLS', '').split(',') if url.strip()]
+REPLICA_CHECK_INTERVAL = float(os.getenv('MYTODO_REPLICA_CHECK_INTERVAL', 10))  # 상태 확인 주기(초)
+REPLICA_MAX_LAG = float(os.getenv('MYTODO_REPLICA_MAX_LAG', 30))  # 복제 지연이 이보다 크면 제외(초, PostgreSQL)
+# 읽기에 쓰는 복제본은 최대 REPLICA_MAX_LAG초(다음 상태 확인까지 REPLICA_CHECK_INTERVAL초 더) 늦을 수 있으므로
+# 그보다 짧게 기본 DB에 고정하면 방금 쓴 내용이 안 보일 수 있음
+REPLICA_STICKY_MIN = REPLICA_MAX_LAG + REPLICA_CHECK_INTERVAL
+REPLICA_STICKY_SECONDS = float(os.getenv('MYTODO_REPLICA_STICKY_SECONDS', REPLICA_STICKY_MIN))
+if REPLICA_URLS and REPLICA_STICKY_SECONDS < REPLICA_STICKY_MIN:
+    logger.warning("MYTODO_REPLICA_STICKY_SECONDS(%s)가 복제 지연 허용치(MAX_LAG + CHECK_INTERVAL = %s)보다 짧아 %s초로 늘립니다.",
+                   REPLICA_STICKY_SECONDS, REPLICA_STICKY_MIN, REPLICA_STICKY_MIN)
+    REPLICA_STICKY_SECONDS = REPLICA_STICKY_MIN
+# 테이블까지 읽어 보아 스키마가 없는 복제본(예: 빈 SQLite 파일)도 걸러냄
+REPLICA_CHECK_SQL = text('SELECT 1 FROM user_stats LIMIT 1')
+# 받은 WAL을 모두 적용했으면 지연 0 (기본 DB에 쓰기가 없어 마지막 적용 시각이 오래된 경우 포함), 복제본이 아니면 NULL
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+class ReplicaPool:
+    """복제본 엔진을 돌아가며(round-robin) 고르고, 상태 확인이나 연결에 실패한 복제본은 복구될 때까지 제외합니다.
+
+    엔진과 상태 확인 스레드는 처음 고를 때 만들므로 gunicorn 워커마다 따로 생깁니다.
+    복제본은 첫 상태 확인을 통과하기 전까지 제외합니다. (그동안은 기본 DB에서 읽음)
+    """
+
+    def __init__(self, urls):
+        self.urls = urls
+        self.engines = []
+        self.healthy = []
+        self.errors = []
+        self.reads = []
+        self.fallbacks = 0  # 정상인 복제본이 없어 기본 DB에서 읽은 횟수
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.urls)
+
+    def _create_engines(self):
+        for index, url in enumerate(self.urls):
+            engine = create_engine(url, **get_engine_options(url))
+            event.listen(engine, 'handle_error', partial(self._on_error, index))
+            self.engines.append(engine)
+        self.healthy = [False] * len(self.engines)
+        self.errors = ['상태 확인 전'] * len(self.engines)
+        self.reads = [0] * len(self.engines)
+        threading.Thread(target=self._check_loop, name='mytodo-replicas', daemon=True).start()
+
+    def choose(self):
+        """다음 정상 복제본 엔진을 반환합니다. 정상인 복제본이 없으면 None을 반환합니다."""
+        with self._lock:
+            if not self.engines:
+                self._create_engines()
+            for _ in range(len(self.engines)):
+                index = self._next % len(self.engines)
+                self._next += 1
+                if self.healthy[index]:
+                    self.reads[index] += 1
+                    return self.engines[index]
+            self.fallbacks += 1
+        return None
+
+    def _set_health(self, index, healthy, error=None):
+        with self._lock:
+            changed = self.healthy[index] != healthy
+            self.healthy[index] = healthy
+            self.errors[index] = error
+        if changed and healthy:
+            logger.info("복제본 #%s이(가) 복구되어 다시 읽기에 사용합니다.", index)
+        elif changed:
+            logger.warning("복제본 #%s을(를) 읽기에서 제외합니다: %s", index, error)
+
+    def _on_error(self, index, context):
+        """복제본에서 연결이 끊기거나 연결할 수 없으면 다음 상태 확인까지 제외합니다."""
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+            self._set_health(index, False, str(context.original_exception))
+
+    def check(self):
+        """모든 복제본에 연결해 읽어 보고 (PostgreSQL은 복제 지연도 확인) 상태를 갱신합니다."""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(REPLICA_CHECK_SQL)
+                    lag = conn.execute(REPLICA_LAG_SQL).scalar() if engine.dialect.name == 'postgresql' else None
+                if lag is not None and lag > REPLICA_MAX_LAG:
+                    raise RuntimeError(f"복제 지연 {lag:.1f}초")
+                self._set_health(index, True)
+            except Exception as e:
+                self._set_health(index, False, str(getattr(e, 'orig', None) or e))
+
+    def _check_loop(self):
+        while True:
+            self.check()
+            time.sleep(REPLICA_CHECK_INTERVAL)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'replicas': [{'url': redact_database_url(url),
+                              'healthy': self.healthy[index] if self.engines else None,
+                              'reads': self.reads[index] if self.engines else 0,
+                              'error': self.errors[index] if self.engines else None}
+                             for index, url in enumerate(self.urls)],
+                'fallbacks': self.fallbacks,
+                'sticky_seconds': REPLICA_STICKY_SECONDS,
+            }
+
+replica_pool = ReplicaPool(REPLICA_URLS)
+
+def redact_database_url(url):
+    """지표에 보여 줄 데이터베이스 URL. 사용자명, 비밀번호와 쿼리 파라미터(sslkey 등)를 빼고 드라이버, 호스트, DB 이름만 남깁니다."""
+    url = make_url(url)
+    return URL.create(url.drivername, host=url.host, port=url.port, database=url.database).render_as_string()
+
+def is_read_only(clause):
+    """복제본에서 실행해도 되는 문장(SELECT)인지 확인합니다. 잠그는 SELECT는 execution_options(primary=True)로 표시합니다."""
+    if isinstance(clause, Select):
+        return not clause.get_execution_options().get('primary', False)
+    # 검색 인덱스 조회 같은 text() 문장은 SELECT로 시작하는 것만 읽기로 봄
+    return isinstance(clause, TextClause) and clause.text.lstrip()[:6].upper() == 'SELECT'
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """쓰기를 기록해 두는 세션. 읽기를 복제본으로 보내는 일은 do_orm_execute 이벤트(route_session_reads)가 합니다.
+
+    flush(clause 없음)와 INSERT/UPDATE/DELETE, 잠그는 SELECT는 기본 DB로 가고, 그 뒤의 읽기도 기본 DB에서 합니다. (자기 변경 읽기)
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and replica_pool and not is_read_only(clause):
+            self.info['wrote'] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+# 세션/CSRF 서명 키 관리
+SECRET_KEY_MAX_FALLBACKS = 2
+
+def get_secret_key_path():
+    """서명 키 파일 경로를 반환합니다. (기본값: todo.db와 같은 폴더의 secret_key)"""
+    return os.getenv('MYTODO_SECRET_KEY_FILE', os.path.join(get_data_dir(), 'secret_key'))
+
+def read_secret_key_file(path):
+    """키 파일을 읽어 키 목록을 반환합니다. 첫 줄이 현재 키, 나머지는 이전 키입니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def write_secret_key_file(path, keys):
+    """키 목록을 원자적으로 기록합니다. (다른 프로세스가 쓰다 만 파일을 읽지 않도록)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(keys) + '\n')
+    os.replace(tmp_path, path)
+
+def load_secret_keys():
+    """(현재 키, 이전 키 목록)을 반환합니다.
+
+    SECRET_KEY 환경 변수가 있으면 그것을 사용하고(이전 키는 SECRET_KEY_FALLBACKS, 쉼표 구분),
+    없으면 키 파일에서 읽습니다. 키 파일이 없으면 한 번만 생성하여 모든 워커와 재시작이 같은 키를 공유합니다.
+    """
+    env_key = os.getenv('SECRET_KEY')
+    if env_key:
+        fallbacks = [key for key in os.getenv('SECRET_KEY_FALLBACKS', '').split(',') if key]
+        return env_key, fallbacks
+
+    path = get_secret_key_path()
+    try:
+        try:
+            # O_EXCL: 여러 워커가 동시에 시작해도 한 프로세스만 키를 생성
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            keys = read_secret_key_file(path)
+            if keys:
+                return keys[0], keys[1:]
+            # 다른 프로세스가 아직 쓰는 중이면 잠시 후 다시 읽음
+            time.sleep(0.1)
+            keys = read_secret_key_file(path)
+            if keys:
+                return keys[0], keys[1:]
+            raise OSError(f"비어 있는 키 파일: {path}")
+        key = secrets.token_hex(32)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(key + '\n')
+        return key, []
+    except OSError as e:
+        # 읽기 전용 위치 등: 프로세스별 임시 키로 동작 (재시작 시 세션 만료)
+        logger.warning("서명 키 파일을 사용할 수 없어 임시 키를 사용합니다: %s", e)
+        return secrets.token_hex(32), []
+
+def rotate_secret_key():
+    """새 키를 만들고 기존 키를 이전 키로 보관합니다. 새 키를 반환합니다."""
+    path = get_secret_key_path()
+    try:
+        keys = read_secret_key_file(path)
+    except FileNotFoundError:
+        keys = []
+    new_key = secrets.token_hex(32)
+    write_secret_key_file(path, [new_key] + keys[:SECRET_KEY_MAX_FALLBACKS])
+    return new_key
+
+class RotatingSecureCookieSessionInterface(SecureCookieSessionInterface):
+    """현재 키로 서명하고, SECRET_KEY_FALLBACKS의 이전 키로 서명된 세션도 검증하는 세션 인터페이스"""
+
+    def get_signing_serializer(self, app):
+        if not app.secret_key:
+            return None
+        # itsdangerous는 키 목록을 오래된 것부터 받아 마지막 키로 서명합니다
+        keys = list(reversed(app.config.get('SECRET_KEY_FALLBACKS') or [])) + [app.secret_key]
+        signer_kwargs = dict(key_derivation=self.key_derivation, digest_method=self.digest_method)
+        return URLSafeTimedSerializer(keys, salt=self.salt, serializer=self.serializer, signer_kwargs=signer_kwargs)
+
+# Flask 및 DB 설정
+app = Flask('MyTODO')
+app.config['SECRET_KEY'], app.config['SECRET_KEY_FALLBACKS'] = load_secret_keys()
+app.session_interface = RotatingSecureCookieSessionInterface()
+app.config['SQLALCHEMY_DATABASE_URI'] = get_db_path()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = get_engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+# 인코딩 설정
+app.config['JSON_AS_ASCII'] = False
+app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+
+# Jinja2 템플릿 인코딩 설정
+app.jinja_env.default_encoding = 'utf-8'
+# 템플릿 변경 확인(auto_reload)은 개발 모드에서만 사용. 포터블 빌드/서버 환경은 프로덕션 모드
+TEMPLATE_PRODUCTION = (getattr(sys, 'frozen', False) or bool(os.getenv('RAILWAY_ENVIRONMENT'))
+                       or os.getenv('MYTODO_TEMPLATE_MODE') == 'production')
+app.jinja_env.auto_reload = not TEMPLATE_PRODUCTION
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
+
+# 복제본으로 읽는 라우트 (쓰기가 없는 조회 화면과 API)
+REPLICA_READ_ENDPOINTS = {
+    'dashboard', 'archived_todos', 'export_todos',
+    'api_list_todos', 'api_search_todos', 'api_get_todo_detail', 'api_archived_todos', 'api_export_todos',
+}
+
+def pin_primary_reads():
+    """쓰기를 커밋한 클라이언트가 REPLICA_STICKY_SECONDS초 동안 기본 DB에서 읽게 합니다. (세션 쿠키에 기록하여 워커 간 공유)"""
+    if replica_pool and has_request_context():
+        session['_primary_until'] = time.time() + REPLICA_STICKY_SECONDS
+
+def pinned_to_primary():
+    """이 클라이언트가 최근 REPLICA_STICKY_SECONDS초 안에 쓰기를 커밋했는지 확인합니다."""
+    return has_request_context() and session.get('_primary_until', 0) > time.time()
+
+@contextmanager
+def replica_reads(enabled=True):
+    """블록 안의 조회를 복제본으로 보냅니다. (enabled=False면 기본 DB) 방금 쓴 클라이언트는 기본 DB에서 읽습니다."""
+    info = db.session.info
+    previous = info.get('replica_reads', False)
+    info['replica_reads'] = enabled and bool(replica_pool) and not pinned_to_primary()
+    try:
+        yield
+    finally:
+        info['replica_reads'] = previous
+
+@app.before_request
+def route_reads_to_replica():
+    """읽기 전용 라우트의 조회를 복제본으로 보냅니다."""
+    if replica_pool and request.endpoint in REPLICA_READ_ENDPOINTS and not pinned_to_primary():
+        db.session.info['replica_reads'] = True
+
+@event.listens_for(db.session, 'do_orm_execute')
+def route_session_reads(orm_execute_state):
+    """replica_reads가 켜진 세션의 읽기를 복제본에서 실행합니다. 한 요청 안에서는 같은 복제본을 씁니다.
+
+    복제본 조회가 OperationalError로 실패하면 (_on_error가 복제본을 제외함) 이 요청의 읽기는 기본 DB에서 다시 합니다.
+    """
+    db_session = orm_execute_state.session
+    info = db_session.info
+    if not replica_pool or not info.get('replica_reads') or info.get('wrote'):
+        return None
+    if not is_read_only(orm_execute_state.statement):
+        return None
+    # 자동 flush할 변경이 남아 있으면 그 변경이 보이는 기본 DB에서 읽음
+    if db_session.autoflush and (db_session.new or db_session.dirty or db_session.deleted):
+        return None
+    engine = info.get('replica') or replica_pool.choose()
+    if engine is None:
+        return None
+    info['replica'] = engine
+    try:
+        return orm_execute_state.invoke_statement(bind_arguments={'bind': engine})
+    except OperationalError as e:
+        logger.warning("복제본 조회 실패로 기본 DB에서 다시 읽습니다: %s", e.orig or e)
+        db_session.rollback()
+        info['replica'] = None
+        info['replica_reads'] = False
+        return orm_execute_state.invoke_statement(bind_arguments={'bind': db.engine})
+
+@event.listens_for(db.session, 'after_commit')
+def pin_reads_to_primary(db_session):
+    """쓰기를 커밋한 클라이언트는 복제가 따라올 동안 기본 DB에서 읽게 합니다."""
+    if db_session.info.get('wrote'):
+        pin_primary_reads()
+
+# KST 시간 포맷을 위한 Jinja 필터
+@app.template_filter('kst')
+def kst_filter(dt):
+    if dt is None:
+        return ''
+    
+    # DB에서 읽어온 시간이 timezone 정보가 없는 naive datetime일 경우 (주로 SQLite), UTC로 간주
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    
+    # KST로 변환하여 포맷팅
+    return dt.astimezone(KST).strftime('%Y-%m-%d %H:%M')
+
+
+# Flask-Login 설정
+login_manager = LoginManager()
+login_manager.init_app(app)
+login_manager.login_view = 'login'
+login_manager.login_message = '이 페이지에 접근하려면 로그인이 필요합니다.'
+login_manager.login_message_category = 'info'
+
+# 사용자 모델
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
+    
+    # 사용자의 할 일 목록
+    todos = db.relationship('Todo', backref='user', lazy=True, cascade='all, delete-orphan')
+    
+    def set_password(self, password):
+        self.password_hash = password_hasher.generate(password)
+    
+    def check_password(self, password):
+        """비밀번호를 확인합니다. 맞지만 설정과 다른 방식의 해시면 새 해시로 바꿔 둡니다. (커밋은 호출한 쪽에서)"""
+        valid, new_hash = password_hasher.verify(self.password_hash, password)
+        if new_hash:
+            self.password_hash = new_hash
+        return valid
+
+# 할 일 모델
+class Todo(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    completed = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    # 대시보드 조회 경로용 복합 인덱스 (user_id 필터 + created_at 정렬)
+    __table_args__ = (
+        db.Index('ix_todo_user_completed_created', 'user_id', 'completed', 'created_at'),
+        db.Index('ix_todo_user_created', 'user_id', 'created_at'),
+        # 보관 작업이 오래전에 완료된 할 일을 찾는 인덱스 (미완료 항목은 NULL)
+        db.Index('ix_todo_completed_at', 'completed_at'),
+    )
+
+# 보관된 할 일 모델 (오래전에 완료된 할 일을 옮겨 두는 콜드 테이블, 보관 목록에서만 조회)
+class ArchivedTodo(db.Model):
+    __tablename__ = 'archived_todo'
+    id = db.Column(db.Integer, primary_key=True)
+    # 원래 할 일 id (SQLite는 삭제된 가장 큰 id를 재사용할 수 있어 기본 키로 쓰지 않음)
+    todo_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
+
+    __table_args__ = (
+        db.Index('ix_archived_todo_user_created', 'user_id', 'created_at'),
+    )
+
+    # 보관된 할 일은 모두 완료된 항목 (todo_to_dict, 목록 템플릿에서 Todo와 같은 모양으로 사용)
+    completed = True
+
+# 사용자별 통계 캐시 모델 (대시보드 COUNT 쿼리 대체)
+class UserStats(db.Model):
+    __tablename__ = 'user_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    # 보관 테이블로 옮긴 할 일 수 (total/completed에는 포함되지 않음)
+    archived = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # 사용자 데이터 변경 버전 (ETag 등 캐시 검증용, 변경마다 1씩 증가)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    @property
+    def pending(self):
+        return self.total - self.completed
+
+# 백그라운드 작업 모델 (요청과 같은 트랜잭션으로 추가되어 커밋된 작업만 실행됨)
+class Job(db.Model):
+    __tablename__ = 'job'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=True)  # 작업 함수에 넘길 키워드 인자 (JSON)
+    # 중복 방지 키 (예약 작업은 실행 주기마다 하나만 추가되도록 사용)
+    key = db.Column(db.String(200), unique=True, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    # 실행기가 다음 작업을 찾는 인덱스
+    __table_args__ = (
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+    )
+
+
+def rebuild_user_stats(user_id):
+    """Todo 테이블을 집계하여 사용자 통계를 다시 계산합니다. (커밋은 호출자가 수행)"""
+    total, completed = db.session.query(
+        db.func.count(Todo.id),
+        db.func.coalesce(db.func.sum(db.case((Todo.completed == True, 1), else_=0)), 0)
+    ).filter(Todo.user_id == user_id).one()
+    archived = db.session.query(db.func.count(ArchivedTodo.id)).filter(ArchivedTodo.user_id == user_id).scalar()
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(user_id=user_id)
+        db.session.add(stats)
+    stats.total = total
+    stats.completed = completed
+    stats.archived = archived
+    stats.version = (stats.version or 0) + 1
+    return stats
+
+def get_user_stats(user_id):
+    """기본 키 조회 한 번으로 사용자 통계를 반환합니다. 없으면 새로 집계합니다."""
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        # 복제본에 아직 없는 경우일 수 있으므로 집계와 저장은 기본 DB에서
+        with replica_reads(False):
+            stats = rebuild_user_stats(user_id)
+            db.session.commit()
+    return stats
+
+def user_stats_update(user_id, total=0, completed=0, archived=0):
+    """사용자 통계 증감과 버전 증가를 한 번에 하는 UPDATE 문을 만듭니다."""
+    return (db.update(UserStats)
+            .where(UserStats.user_id == user_id)
+            .values(total=UserStats.total + total, completed=UserStats.completed + completed,
+                    archived=UserStats.archived + archived, version=UserStats.version + 1))
+
+def bump_user_stats(user_id, total=0, completed=0, archived=0):
+    """사용자 통계를 증감하고 변경 버전을 올립니다. 할 일 변경과 같은 트랜잭션에서 호출해야 합니다."""
+    # 행이 아직 없으면 아무것도 갱신하지 않고, 다음 조회 시 get_user_stats가 새로 집계합니다.
+    db.session.execute(user_stats_update(user_id, total, completed, archived))
+    # 커밋이 끝나면 실시간 변경 알림을 보냄 (publish_committed_changes)
+    db.session.info.setdefault('changed_users', set()).add(user_id)
+
+
+TODO_CONTENT_MAX_LENGTH = 200
+
+def mask_csrf_token(token):
+    """CSRF 토큰을 응답마다 다른 임의 값과 XOR하여 감춥니다.
+
+    압축된 HTML에 반사된 입력(검색어 등)과 같은 토큰이 매번 들어가면 응답 크기로 토큰을 알아낼 수 있으므로(BREACH)
+    페이지마다 다른 문자열로 내보냅니다.
+    """
+    raw = token.encode('ascii')
+    pad = secrets.token_bytes(len(raw))
+    return base64.urlsafe_b64encode(pad + bytes(a ^ b for a, b in zip(pad, raw))).decode('ascii')
+
+def unmask_csrf_token(masked):
+    """mask_csrf_token으로 감춘 토큰을 원래 토큰으로 되돌립니다. 형식이 맞지 않으면 ValidationError를 발생시킵니다."""
+    try:
+        data = base64.urlsafe_b64decode(masked.encode('ascii'))
+    except (ValueError, UnicodeEncodeError):
+        raise ValidationError('The CSRF token is invalid.')
+    half = len(data) // 2
+    if not data or len(data) % 2:
+        raise ValidationError('The CSRF token is invalid.')
+    return bytes(a ^ b for a, b in zip(data[:half], data[half:])).decode('ascii', 'replace')
+
+class MaskedCSRF(CSRF):
+    """Flask-WTF의 서명된 CSRF 토큰을 응답마다 가려서 내보내고, 제출된 값을 되돌려 검증하는 CSRF 구현."""
+
+    def setup_form(self, form):
+        self.meta = form.meta
+        return super().setup_form(form)
+
+    def generate_csrf_token(self, csrf_token_field):
+        return mask_csrf_token(generate_csrf(secret_key=self.meta.csrf_secret, token_key=self.meta.csrf_field_name))
+
+    def validate_csrf_token(self, form, field):
+        if not field.data:
+            raise ValidationError('The CSRF token is missing.')
+        validate_csrf(unmask_csrf_token(field.data), self.meta.csrf_secret,
+                      self.meta.csrf_time_limit, self.meta.csrf_field_name)
+
+class MaskedCSRFForm(FlaskForm):
+    """CSRF 토큰을 가려서 내보내는 폼의 기본 클래스."""
+
+    class Meta:
+        csrf_class = MaskedCSRF
+
+class TodoForm(MaskedCSRFForm):
+    content = StringField('할 일', validators=[DataRequired(), Length(min=1, max=TODO_CONTENT_MAX_LENGTH)])
+
+class BulkTodoForm(MaskedCSRFForm):
+    action = StringField('작업', validators=[DataRequired(), AnyOf(['complete', 'uncomplete', 'delete'])])
+
+class ImportForm(MaskedCSRFForm):
+    file = FileField('파일', validators=[FileRequired('가져올 파일을 선택해주세요.')])
+
+class LoginForm(MaskedCSRFForm):
+    username = StringField('사용자명', validators=[DataRequired(), Length(min=3, max=80)])
+    password = PasswordField('비밀번호', validators=[DataRequired()])
+
+class RegisterForm(MaskedCSRFForm):
+    username = StringField('사용자명', validators=[DataRequired(), Length(min=3, max=80)])
+    email = EmailField('이메일', validators=[DataRequired(), Email()])
+    password = PasswordField('비밀번호', validators=[DataRequired(), Length(min=6)])
+    confirm_password = PasswordField('비밀번호 확인', validators=[DataRequired(), EqualTo('password')])
+
+class LRUCache:
+    """TTL이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# 비밀번호 해시 설정
+# 해시 방식과 비용 (Werkzeug 형식, 예: scrypt:32768:8:1, pbkdf2:sha256:600000)
+# 다른 방식/비용으로 저장된 기존 해시는 로그인에 성공할 때 이 설정으로 다시 해시합니다.
+PASSWORD_HASH_METHOD = os.getenv('MYTODO_PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+PASSWORD_HASH_WORKERS = int(os.getenv('MYTODO_PASSWORD_HASH_WORKERS', min(os.cpu_count() or 1, 4)))
+PASSWORD_HASH_QUEUE = int(os.getenv('MYTODO_PASSWORD_HASH_QUEUE', 16))
+# 로그인 시도 제한: 창(초)마다 IP별, 사용자명별 실패 수 (프로세스별로 세므로 gunicorn 워커가 여러 개이면 한도도 워커 수만큼 커짐)
+LOGIN_RATE_WINDOW = int(os.getenv('MYTODO_LOGIN_RATE_WINDOW', 300))
+LOGIN_IP_LIMIT = int(os.getenv('MYTODO_LOGIN_IP_LIMIT', 30))
+LOGIN_USERNAME_LIMIT = int(os.getenv('MYTODO_LOGIN_USERNAME_LIMIT', 10))
+# 앞단 프록시 수 (X-Forwarded-For에서 클라이언트 IP를 읽을 때 사용, Railway는 1)
+PROXY_COUNT = int(os.getenv('MYTODO_PROXY_COUNT', 1 if os.getenv('RAILWAY_ENVIRONMENT') else 0))
+
+class PasswordHashBusy(Exception):
+    """해시 작업자 풀의 대기열이 가득 찼을 때 발생합니다."""
+
+_password_hash_prefix = None
+
+def password_needs_rehash(password_hash):
+    """저장된 해시의 방식/비용이 PASSWORD_HASH_METHOD와 다른지 확인합니다."""
+    global _password_hash_prefix
+    if _password_hash_prefix is None:
+        # 'scrypt'처럼 기본값을 생략한 설정도 저장 형식(scrypt:32768:8:1)으로 맞춰 비교
+        _password_hash_prefix = generate_password_hash('', PASSWORD_HASH_METHOD).split('$', 1)[0]
+    return password_hash.split('$', 1)[0] != _password_hash_prefix
+
+def verify_password(password_hash, password):
+    """(작업자 풀에서 실행) 비밀번호를 확인하고 (일치 여부, 다시 만든 해시 또는 None)을 반환합니다."""
+    if not check_password_hash(password_hash, password):
+        return False, None
+    if password_needs_rehash(password_hash):
+        return True, generate_password_hash(password, PASSWORD_HASH_METHOD)
+    return True, None
+
+class PasswordHasher:
+    """비밀번호 해시 계산을 크기가 정해진 스레드 풀에서 실행합니다.
+
+    hashlib의 scrypt/pbkdf2는 계산하는 동안 GIL을 놓으므로 스레드로도 여러 코어를 쓸 수 있고,
+    동시에 계산하는 해시가 workers개로 묶이므로 로그인이 몰려도 나머지 요청 스레드가 CPU를 얻습니다.
+    실행 중 + 대기 중인 작업이 workers + queue_size개를 넘으면 PasswordHashBusy를 발생시킵니다.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.metrics = {'submitted': 0, 'rejected': 0, 'rehashed': 0}
+
+    def submit(self, func, *args):
+        """해시 작업을 풀에 넣고 Future를 반환합니다."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.metrics['rejected'] += 1
+            raise PasswordHashBusy()
+        with self._lock:
+            # gunicorn 워커가 fork된 뒤 처음 쓸 때 스레드를 만듦
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            self.metrics['submitted'] += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        return future
+
+    def generate(self, password):
+        return self.submit(generate_password_hash, password, PASSWORD_HASH_METHOD).result()
+
+    def verify(self, password_hash, password):
+        """(일치 여부, 다시 만든 해시 또는 None)을 반환합니다."""
+        valid, new_hash = self.submit(verify_password, password_hash, password).result()
+        if new_hash:
+            self.count_rehash()
+        return valid, new_hash
+
+    async def verify_async(self, password_hash, password):
+        valid, new_hash = await asyncio.wrap_future(self.submit(verify_password, password_hash, password))
+        if new_hash:
+            self.count_rehash()
+        return valid, new_hash
+
+    def count_rehash(self):
+        with self._lock:
+            self.metrics['rehashed'] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.metrics, workers=self.workers)
+
+class LoginRateLimiter:
+    """고정 창 방식의 로그인 시도 제한. 키별 (창 시작 시각, 횟수)를 프로세스 메모리에 보관합니다."""
+
+    def __init__(self, window, max_keys=100000):
+        self.window = window
+        self.max_keys = max_keys
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _current(self, key, now):
+        item = self._data.get(key)
+        if item is None or now - item[0] >= self.window:
+            return None
+        return item
+
+    def retry_after(self, key, limit):
+        """키가 제한에 걸렸으면 다시 시도할 수 있을 때까지 남은 초를, 아니면 0을 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._current(key, now)
+            if item is None or item[1] < limit:
+                return 0
+            self.rejected += 1
+            return max(1, math.ceil(item[0] + self.window - now))
+
+    def hit(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._current(key, now)
+            self._data[key] = (now, 1) if item is None else (item[0], item[1] + 1)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+
+    def reset(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE)
+login_limiter = LoginRateLimiter(LOGIN_RATE_WINDOW)
+
+def client_ip():
+    """요청한 클라이언트 IP. 앞단 프록시가 있으면 프록시가 덧붙인 X-Forwarded-For 값을 사용합니다."""
+    if PROXY_COUNT:
+        forwarded = [part.strip() for part in request.headers.get('X-Forwarded-For', '').split(',') if part.strip()]
+        if len(forwarded) >= PROXY_COUNT:
+            return forwarded[-PROXY_COUNT]
+    return request.remote_addr
+
+def login_rate_limit_response(form):
+    """로그인 시도 제한에 걸렸으면 429 응답을, 아니면 None을 반환합니다. (실패 수는 record_login_result가 기록)"""
+    ip = client_ip()
+    username = form.username.data.strip().lower()
+    retry_after = (login_limiter.retry_after(f'ip:{ip}', LOGIN_IP_LIMIT)
+                   or login_limiter.retry_after(f'user:{username}', LOGIN_USERNAME_LIMIT))
+    if retry_after:
+        logger.warning("로그인 시도 제한: %s (IP: %s)", form.username.data, ip)
+        flash(f'로그인 시도가 너무 많습니다. {retry_after}초 후 다시 시도해주세요.', 'error')
+        return render_template('login.html', form=form), 429, {'Retry-After': str(retry_after)}
+    return None
+
+def record_login_result(form, success):
+    """IP별, 사용자명별 실패 수를 기록합니다. 성공한 로그인은 세지 않고 사용자명의 실패 수를 초기화합니다.
+
+    같은 IP(NAT, 회사 프록시)에서 정상 사용자가 여러 번 로그인해도 제한에 걸리지 않도록 성공은 IP 한도에 넣지 않습니다.
+    """
+    key = f'user:{form.username.data.strip().lower()}'
+    if success:
+        login_limiter.reset(key)
+    else:
+        login_limiter.hit(f'ip:{client_ip()}')
+        login_limiter.hit(key)
+
+def password_busy_response(template, form):
+    """해시 작업자 풀이 가득 찼을 때의 503 응답을 반환합니다."""
+    logger.warning("비밀번호 해시 대기열이 가득 찼습니다. (%s)", request.path)
+    flash('요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.', 'error')
+    return render_template(template, form=form), 503, {'Retry-After': '1'}
+
+
+class CachedUser(UserMixin):
+    """세션 인증용 경량 사용자 정보. 화면 표시와 로깅에 필요한 필드만 담습니다."""
+
+    def __init__(self, id, username, email):
+        self.id = id
+        self.username = username
+        self.email = email
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username, user.email)
+
+    def to_claims(self):
+        return {'id': self.id, 'username': self.username, 'email': self.email, 'iat': int(time.time())}
+
+
+# 사용자 정보 캐시 설정
+USER_CACHE_SIZE = int(os.getenv('MYTODO_USER_CACHE_SIZE', 1024))
+USER_CACHE_TTL = int(os.getenv('MYTODO_USER_CACHE_TTL', 60))
+# 서명된 세션에 사용자 정보를 담아 DB 조회 없이 인증 (선택 기능)
+USER_SESSION_CLAIMS = os.getenv('MYTODO_USER_SESSION_CLAIMS', '0') == '1'
+USER_CLAIMS_TTL = int(os.getenv('MYTODO_USER_CLAIMS_TTL', 3600))
+
+user_cache = LRUCache(max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+user_cache_metrics = {'loads': 0, 'cache_hits': 0, 'claims_hits': 0, 'db_queries': 0}
+_user_cache_metrics_lock = threading.Lock()
+
+def _count_user_load(kind):
+    with _user_cache_metrics_lock:
+        user_cache_metrics['loads'] += 1
+        user_cache_metrics[kind] += 1
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    """사용자 정보가 바뀌면 캐시에서 제거합니다."""
+    # 다른 워커 프로세스의 캐시는 TTL(MYTODO_USER_CACHE_TTL)이 지나면 갱신됨
+    user_cache.invalidate(target.id)
+
+def find_loaded_user(user_id):
+    """세션에 담긴 사용자 정보나 캐시에서 사용자를 찾습니다. 없으면 None을 반환합니다. (DB 조회 없음)"""
+    if USER_SESSION_CLAIMS:
+        claims = session.get('_identity')
+        if claims and claims.get('id') == user_id and time.time() - claims.get('iat', 0) < USER_CLAIMS_TTL:
+            _count_user_load('claims_hits')
+            return CachedUser(claims['id'], claims['username'], claims['email'])
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        _count_user_load('cache_hits')
+        if USER_SESSION_CLAIMS:
+            session['_identity'] = cached.to_claims()
+    return cached
+
+def remember_user(user):
+    """DB에서 읽은 사용자(모델 또는 행)를 캐시에 넣고 CachedUser로 반환합니다."""
+    _count_user_load('db_queries')
+    if user is None:
+        return None
+    cached = CachedUser.from_user(user)
+    user_cache.set(cached.id, cached)
+    if USER_SESSION_CLAIMS:
+        session['_identity'] = cached.to_claims()
+    return cached
+
+@login_manager.user_loader
+def load_user(user_id):
+    user_id = int(user_id)
+    cached = find_loaded_user(user_id)
+    if cached is not None:
+        return cached
+    with replica_reads():
+        user = db.session.get(User, user_id)
+    if user is None and replica_pool:
+        # 방금 가입한 사용자는 복제본에 아직 없을 수 있으므로 기본 DB에서 다시 확인
+        with replica_reads(False):
+            user = db.session.get(User, user_id)
+    return remember_user(user)
+
+@user_logged_in.connect_via(app)
+def store_identity_claims(sender, user):
+    """로그인 시 서명된 세션에 사용자 정보를 저장합니다."""
+    if USER_SESSION_CLAIMS:
+        session['_identity'] = CachedUser.from_user(user).to_claims()
+
+@user_logged_out.connect_via(app)
+def clear_identity_claims(sender, user):
+    session.pop('_identity', None)
+    nonce = session.pop('_events_nonce', None)
+    if nonce is not None:
+        revoke_events_token(user.id, nonce)
+
+def set_todo_completed(user_id, todo_id, completed):
+    """할 일 하나의 완료 상태를 조건부 UPDATE로 바꾸고, 실제로 바뀐 경우에만 통계를 증감합니다. (커밋은 호출자가 수행)
+
+    바뀌었으면 True, 이미 그 상태였으면 False를 반환하고, 할 일이 없으면 NotFound를 발생시킵니다.
+    같은 요청이 동시에 와도 상태를 바꾼 한 요청만 통계를 증감합니다.
+    """
+    owned = (Todo.id == todo_id) & (Todo.user_id == user_id)
+    result = db.session.execute(
+        db.update(Todo).where(owned, Todo.completed == (not completed))
+        .values(completed=completed, completed_at=datetime.now(KST) if completed else None)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        bump_user_stats(user_id, completed=1 if completed else -1)
+        return True
+    if db.session.execute(db.select(Todo.id).where(owned)).first() is None:
+        raise NotFound()
+    return False
+
+def delete_todo_row(user_id, todo_id):
+    """할 일 하나를 지우고, 지운 행의 완료 상태만큼 통계를 줄입니다. 할 일이 없으면 NotFound를 발생시킵니다. (커밋은 호출자가 수행)"""
+    # DELETE ... RETURNING: 실제로 지운 요청만 통계를 줄임
+    deleted = db.session.execute(
+        db.delete(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
+        .returning(Todo.completed)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if deleted is None:
+        raise NotFound()
+    bump_user_stats(user_id, total=-1, completed=-1 if deleted.completed else 0)
+
+def apply_bulk_action(user_id, action, ids=None, contents=None):
+    """여러 할 일에 같은 작업을 집합 단위 SQL로 적용합니다. 처리된 개수를 반환합니다. (커밋은 호출자가 수행)"""
+    ids = list(ids or [])
+    owned = (Todo.user_id == user_id) & Todo.id.in_(ids)
+    if action == 'add':
+        now = datetime.now(KST)
+        rows = [{'user_id': user_id, 'content': content, 'completed': False, 'created_at': now}
+                for content in contents or []]
+        if rows:
+            # INSERT ... executemany 한 번으로 추가
+            db.session.execute(db.insert(Todo), rows)
+        bump_user_stats(user_id, total=len(rows))
+        return len(rows)
+    if not ids:
+        return 0
+    if action == 'complete':
+        result = db.session.execute(
+            db.update(Todo).where(owned, Todo.completed == False)
+            .values(completed=True, completed_at=datetime.now(KST))
+            .execution_options(synchronize_session=False)
+        )
+        bump_user_stats(user_id, completed=result.rowcount)
+        return result.rowcount
+    if action == 'uncomplete':
+        result = db.session.execute(
+            db.update(Todo).where(owned, Todo.completed == True)
+            .values(completed=False, completed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        bump_user_stats(user_id, completed=-result.rowcount)
+        return result.rowcount
+    if action == 'delete':
+        # 완료/미완료를 나누어 삭제하여 통계 증감량을 추가 조회 없이 계산
+        done = db.session.execute(
+            db.delete(Todo).where(owned, Todo.completed == True)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        rest = db.session.execute(
+            db.delete(Todo).where(owned).execution_options(synchronize_session=False)
+        ).rowcount
+        bump_user_stats(user_id, total=-(done + rest), completed=-done)
+        return done + rest
+    raise ValueError(f"알 수 없는 작업: {action}")
+
+# 백그라운드 작업
+# 요청은 중요하지 않은 일을 enqueue_job으로 job 테이블에 넣고 바로 응답하며, 커밋되면 프로세스마다 하나인 실행기가
+# 크기가 정해진 스레드 풀에서 실행합니다. 실패하면 지수 백오프로 다시 시도하고, 예약 작업은 주기마다 한 번 추가됩니다.
+JOB_RUNNER_ENABLED = os.getenv('MYTODO_JOBS', '1') != '0'
+JOB_WORKERS = int(os.getenv('MYTODO_JOB_WORKERS', 2))
+JOB_POLL_INTERVAL = float(os.getenv('MYTODO_JOB_POLL_INTERVAL', 5))  # 다른 프로세스가 추가한 작업을 확인하는 주기(초)
+JOB_MAX_ATTEMPTS = int(os.getenv('MYTODO_JOB_MAX_ATTEMPTS', 5))
+JOB_RETRY_DELAY = float(os.getenv('MYTODO_JOB_RETRY_DELAY', 10))  # 첫 재시도 대기(초), 시도마다 두 배
+JOB_RETRY_MAX_DELAY = 3600
+JOB_TIMEOUT = float(os.getenv('MYTODO_JOB_TIMEOUT', 900))  # 실행 중인 채로 이보다 오래되면 프로세스가 죽은 것으로 보고 다시 실행
+JOB_RETENTION_DAYS = int(os.getenv('MYTODO_JOB_RETENTION_DAYS', 7))  # 끝난 작업 기록 보관 기간
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+JOB_HANDLERS = {}
+JOB_SCHEDULES = {}
+
+def background_job(name):
+    """함수를 이름으로 실행할 수 있는 백그라운드 작업으로 등록합니다. 작업은 앱 컨텍스트 안에서 실행됩니다."""
+    def decorator(func):
+        JOB_HANDLERS[name] = func
+        return func
+    return decorator
+
+def schedule_job(name, interval, **payload):
+    """등록된 작업을 interval초마다 실행하도록 예약합니다. 프로세스가 여러 개여도 주기마다 한 번만 실행됩니다."""
+    JOB_SCHEDULES[name] = (interval, payload)
+
+def job_insert():
+    """작업 INSERT 문. key가 이미 있으면 추가하지 않습니다. (SQLite, PostgreSQL의 ON CONFLICT DO NOTHING)"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return db.insert(Job)
+    return insert(Job).on_conflict_do_nothing(index_elements=['key'])
+
+def enqueue_job(name, delay=0, key=None, max_attempts=JOB_MAX_ATTEMPTS, **payload):
+    """작업을 대기열에 추가합니다. 호출한 쪽의 트랜잭션과 함께 커밋되며, 커밋되면 실행기를 깨웁니다."""
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"알 수 없는 작업: {name}")
+    now = datetime.now(KST)
+    db.session.execute(job_insert(), [{
+        'name': name, 'payload': json.dumps(payload, ensure_ascii=False) if payload else None, 'key': key,
+        'status': 'queued', 'attempts': 0, 'max_attempts': max_attempts,
+        'run_at': now + timedelta(seconds=delay), 'created_at': now,
+    }])
+    db.session.info['jobs_enqueued'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def wake_job_runner(session):
+    """커밋된 작업이 있으면 실행기를 바로 깨웁니다."""
+    if session.info.pop('jobs_enqueued', False):
+        job_runner.notify()
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_rolled_back_jobs(session):
+    session.info.pop('jobs_enqueued', None)
+
+def claim_job(until=None):
+    """실행할 때가 된 작업 하나를 실행 중으로 바꾸고 반환합니다. 없으면 None을 반환합니다.
+
+    상태 조건을 UPDATE에도 두므로 여러 프로세스가 동시에 가져가도 한 곳에서만 실행됩니다.
+    """
+    now = datetime.now(KST)
+    # 먼저 읽기만 하여 작업이 없을 때는 쓰기 잠금을 잡지 않음
+    job_id = db.session.execute(
+        db.select(Job.id)
+        .where(Job.status == 'queued', Job.run_at <= (until or now))
+        .order_by(Job.run_at, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)  # PostgreSQL: 다른 프로세스가 잡은 행은 건너뜀
+        .execution_options(primary=True)
+    ).scalar()
+    if job_id is None:
+        db.session.rollback()
+        return None
+    job = db.session.execute(
+        db.update(Job).where(Job.id == job_id, Job.status == 'queued')
+        .values(status='running', attempts=Job.attempts + 1, started_at=now)
+        .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.session.commit()
+    return job
+
+def retry_delay(attempts):
+    """재시도 대기 시간(초). 시도마다 두 배로 늘리고, 여러 작업이 한꺼번에 몰리지 않도록 흔들어 줍니다."""
+    return min(JOB_RETRY_DELAY * 2 ** (attempts - 1), JOB_RETRY_MAX_DELAY) * random.uniform(0.5, 1.0)
+
+def execute_job(job):
+    """claim_job으로 가져온 작업을 실행하고 결과를 기록합니다. 결과 상태(done, queued, failed)를 반환합니다."""
+    started = time.perf_counter()
+    values = {}
+    try:
+        handler = JOB_HANDLERS.get(job.name)
+        if handler is None:
+            raise LookupError(f"알 수 없는 작업: {job.name}")
+        handler(**json.loads(job.payload or '{}'))
+        values = {'status': 'done', 'finished_at': datetime.now(KST), 'last_error': None}
+    except Exception as e:
+        db.session.rollback()
+        error = f"{type(e).__name__}: {e}"
+        if job.attempts < job.max_attempts:
+            values = {'status': 'queued', 'run_at': datetime.now(KST) + timedelta(seconds=retry_delay(job.attempts)),
+                      'last_error': error}
+            logger.warning("작업 실패, 다시 시도합니다: %s #%s (%s/%s) %s",
+                           job.name, job.id, job.attempts, job.max_attempts, error)
+        else:
+            values = {'status': 'failed', 'finished_at': datetime.now(KST), 'last_error': error}
+            logger.error("작업이 최종 실패했습니다: %s #%s %s", job.name, job.id, error)
+    db.session.execute(db.update(Job).where(Job.id == job.id).values(**values))
+    db.session.commit()
+    if values['status'] == 'done':
+        logger.debug("작업 완료: %s #%s (%.1f ms)", job.name, job.id, (time.perf_counter() - started) * 1000)
+    return values['status']
+
+def requeue_stale_jobs():
+    """JOB_TIMEOUT보다 오래 실행 중인 작업(프로세스가 중간에 종료된 작업)을 다시 대기열에 넣습니다."""
+    cutoff = datetime.now(KST) - timedelta(seconds=JOB_TIMEOUT)
+    stale = (Job.status == 'running') & (Job.started_at < cutoff)
+    result = db.session.execute(
+        db.update(Job).where(stale)
+        .values(status=db.case((Job.attempts < Job.max_attempts, 'queued'), else_='failed'),
+                last_error='실행 시간 초과 (프로세스 종료)')
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    if result.rowcount:
+        logger.warning("멈춘 작업 %s개를 다시 대기열에 넣었습니다.", result.rowcount)
+
+def drain_jobs(include_delayed=False):
+    """대기 중인 작업을 현재 스레드에서 모두 실행합니다. 상태별 개수를 반환합니다. (CLI, 테스트용)"""
+    until = datetime.max if include_delayed else None
+    counts = {}
+    while True:
+        job = claim_job(until)
+        if job is None:
+            return counts
+        status = execute_job(job)
+        counts[status] = counts.get(status, 0) + 1
+
+class JobRunner:
+    """job 테이블에서 실행할 때가 된 작업을 가져와 크기가 정해진 스레드 풀에서 실행합니다. (프로세스마다 하나)"""
+
+    def __init__(self, workers, poll_interval):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        # 빈 작업자 수만큼만 가져오므로 메모리에 쌓이는 작업이 없음
+        self.slots = threading.BoundedSemaphore(workers)
+        self.wake = threading.Event()
+        self.executor = None
+        self.scheduled = {}
+        self.last_requeue = 0
+        self.counts = {'done': 0, 'queued': 0, 'failed': 0}
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.executor is not None:
+            return
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='mytodo-job')
+        threading.Thread(target=self._loop, name='mytodo-jobs', daemon=True).start()
+        logger.info("백그라운드 작업 실행기 시작 (작업자 %s)", self.workers)
+
+    def notify(self):
+        self.wake.set()
+
+    def _loop(self):
+        startup_ready.wait()
+        while True:
+            if startup_state['status'] == 'ready':
+                try:
+                    with app.app_context():
+                        self.enqueue_due_schedules()
+                        if time.monotonic() - self.last_requeue > 60:
+                            requeue_stale_jobs()
+                            self.last_requeue = time.monotonic()
+                        self.dispatch()
+                except Exception as e:
+                    logger.error("백그라운드 작업 실행기 오류: %s", e)
+            self.wake.wait(self.poll_interval)
+            self.wake.clear()
+
+    def enqueue_due_schedules(self):
+        """주기가 바뀐 예약 작업을 추가합니다. 키가 주기마다 같으므로 다른 프로세스가 이미 추가했으면 무시됩니다."""
+        now = time.time()
+        for name, (interval, payload) in JOB_SCHEDULES.items():
+            slot = int(now // interval)
+            if self.scheduled.get(name) == slot:
+                continue
+            enqueue_job(name, key=f"schedule:{name}:{slot}", **payload)
+            db.session.commit()
+            self.scheduled[name] = slot
+
+    def dispatch(self):
+        while self.slots.acquire(blocking=False):
+            job = claim_job()
+            if job is None:
+                self.slots.release()
+                return
+            self.executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            with app.app_context():
+                status = execute_job(job)
+            with self.lock:
+                self.counts[status] += 1
+        except Exception as e:
+            logger.error("작업 결과를 기록하지 못했습니다: %s #%s %s", job.name, job.id, e)
+        finally:
+            self.slots.release()
+            # 작업자가 비었으므로 다음 작업을 바로 가져옴
+            self.wake.set()
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.counts)
+        return {'running': self.executor is not None, 'workers': self.workers, 'completed': counts['done'],
+                'retried': counts['queued'], 'failed': counts['failed'], 'schedules': sorted(JOB_SCHEDULES)}
+
+job_runner = JobRunner(JOB_WORKERS, JOB_POLL_INTERVAL)
+
+def start_job_runner():
+    """서버 프로세스에서 백그라운드 작업 실행기를 시작합니다. 데이터베이스 준비가 끝난 뒤부터 작업을 가져옵니다."""
+    if JOB_RUNNER_ENABLED:
+        job_runner.start()
+
+@background_job('purge-jobs')
+def purge_jobs(days=JOB_RETENTION_DAYS):
+    """끝난 지 days일이 지난 작업 기록을 지웁니다."""
+    cutoff = datetime.now(KST) - timedelta(days=days)
+    db.session.execute(db.delete(Job).where(Job.status.in_(('done', 'failed')), Job.finished_at < cutoff))
+    db.session.commit()
+
+schedule_job('purge-jobs', 86400)
+
+# 할 일 가져오기/내보내기 (CSV, NDJSON)
+# 내보내기는 서버 측 커서로 나누어 읽으며 스트리밍하고, 가져오기는 업로드를 한 줄씩 읽어
+# IMPORT_BATCH_SIZE개씩 한 트랜잭션으로 추가하므로 파일 크기와 관계없이 메모리 사용량이 일정합니다.
+EXPORT_CHUNK_SIZE = int(os.getenv('MYTODO_EXPORT_CHUNK_SIZE', 2000))
+IMPORT_BATCH_SIZE = int(os.getenv('MYTODO_IMPORT_BATCH_SIZE', 5000))
+IMPORT_MAX_ERRORS = 20  # 진행 상황에 담을 잘못된 행 수
+TRANSFER_MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+TRANSFER_FIELDS = ('id', 'content', 'completed', 'created_at', 'completed_at')
+IMPORT_TRUE_VALUES = {'1', 'true', 'yes', 'y', 'o', '완료'}
+IMPORT_FALSE_VALUES = {'', '0', 'false', 'no', 'n', '미완료'}
+# O/X 표기에서는 '아니오', 체크 표시([x])에서는 '완료'라 뜻이 갈리므로 추측하지 않고 행을 건너뜀
+IMPORT_AMBIGUOUS_VALUES = {'x'}
+
+def iter_export_chunks(user_id, fmt):
+    """사용자의 할 일을 EXPORT_CHUNK_SIZE개씩 읽어 fmt(csv, ndjson) 형식의 문자열 조각으로 반환(yield)합니다."""
+    statements = (
+        db.select(Todo.id, Todo.content, Todo.completed, Todo.created_at, Todo.completed_at)
+        .where(Todo.user_id == user_id)
+        .order_by(Todo.id),
+        # 보관된 할 일도 원래 id로 함께 내보냄
+        db.select(ArchivedTodo.todo_id.label('id'), ArchivedTodo.content, db.true().label('completed'),
+                  ArchivedTodo.created_at, ArchivedTodo.completed_at)
+        .where(ArchivedTodo.user_id == user_id)
+        .order_by(ArchivedTodo.created_at, ArchivedTodo.id),
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        # 엑셀에서 한글이 깨지지 않도록 BOM을 붙임
+        buffer.write('\ufeff')
+        writer.writerow(TRANSFER_FIELDS)
+    for statement in statements:
+        # PostgreSQL에서는 서버 측 커서 사용
+        result = db.session.execute(statement.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        for rows in result.partitions():
+            for row in rows:
+                todo = todo_to_dict(row)
+                if fmt == 'csv':
+                    writer.writerow([todo['id'], todo['content'], 'true' if todo['completed'] else 'false',
+                                     todo['created_at'] or '', todo['completed_at'] or ''])
+                else:
+                    buffer.write(json.dumps(todo, ensure_ascii=False))
+                    buffer.write('\n')
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def export_response(fmt):
+    """현재 사용자의 할 일을 내려받는 스트리밍 응답을 만듭니다."""
+    filename = f"mytodo-{datetime.now(KST):%Y%m%d}.{fmt}"
+    logger.info("할 일 내보내기: %s (사용자: %s)", fmt, current_user.username)
+    return app.response_class(
+        stream_with_context(iter_export_chunks(current_user.id, fmt)),
+        mimetype=TRANSFER_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"', 'Cache-Control': 'no-store'}
+    )
+
+def import_format(filename=None, mimetype=None):
+    """파일 이름 확장자나 Content-Type으로 가져오기 형식(csv, ndjson)을 정합니다. 알 수 없으면 None을 반환합니다."""
+    if mimetype:
+        for fmt, known in TRANSFER_MIMETYPES.items():
+            if mimetype == known:
+                return fmt
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    return None
+
+class WSGIInputReader(io.RawIOBase):
+    """read()만 보장되는 WSGI 입력 스트림(gunicorn, waitress 등)을 io.BufferedReader로 감쌀 수 있게 합니다."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def parse_import_rows(stream, fmt):
+    """바이너리 스트림을 한 줄씩 읽어 (줄 번호, dict 또는 None)을 반환(yield)합니다. 파일 전체를 메모리에 올리지 않습니다."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if fmt == 'csv' else None)
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = None
+        yield line_number, item if isinstance(item, dict) else None
+
+def parse_import_datetime(value):
+    """ISO 8601 문자열을 datetime으로 바꿉니다. 시간대가 있으면 한국 시간으로 맞춥니다."""
+    if value in (None, ''):
+        return None
+    if not isinstance(value, str):
+        raise ValueError('날짜 형식이 잘못되었습니다.')
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f'날짜 형식이 잘못되었습니다: {value[:40]}')
+    return parsed.astimezone(KST) if parsed.tzinfo else parsed
+
+def import_row(item, user_id, now):
+    """가져올 행을 검증하여 INSERT용 dict로 바꿉니다. 잘못된 행이면 ValueError를 발생시킵니다."""
+    if item is None:
+        raise ValueError('행 형식이 잘못되었습니다.')
+    content = item.get('content')
+    content = content.strip() if isinstance(content, str) else ''
+    if not content or len(content) > TODO_CONTENT_MAX_LENGTH:
+        raise ValueError(f'내용은 1~{TODO_CONTENT_MAX_LENGTH}자여야 합니다.')
+    completed = item.get('completed')
+    if not isinstance(completed, bool):
+        value = str(completed if completed is not None else '').strip().lower()
+        if value in IMPORT_AMBIGUOUS_VALUES:
+            raise ValueError(f'완료 여부 표기가 모호합니다: {value} (완료/미완료, o/n, 1/0 등으로 적어주세요)')
+        if value not in IMPORT_TRUE_VALUES and value not in IMPORT_FALSE_VALUES:
+            raise ValueError(f'완료 여부를 알 수 없습니다: {value[:20]}')
+        completed = value in IMPORT_TRUE_VALUES
+    created_at = parse_import_datetime(item.get('created_at')) or now
+    completed_at = (parse_import_datetime(item.get('completed_at')) or now) if completed else None
+    return {'user_id': user_id, 'content': content, 'completed': completed,
+            'created_at': created_at, 'completed_at': completed_at}
+
+def import_todos(user_id, rows):
+    """행을 IMPORT_BATCH_SIZE개씩 한 트랜잭션으로 추가하고, 배치마다 진행 상황을 반환(yield)합니다.
+
+    잘못된 행은 건너뛰고 앞의 IMPORT_MAX_ERRORS개만 기록합니다. 이미 커밋된 배치는 오류가 나도 유지됩니다.
+    """
+    now = datetime.now(KST)
+    progress = {'imported': 0, 'skipped': 0, 'errors': []}
+    batch = []
+
+    def flush():
+        # INSERT ... executemany 한 번과 통계 갱신을 한 트랜잭션으로
+        # (ORM 일괄 INSERT는 NULL인 열이 행마다 달라지면 문장을 나누므로 테이블 INSERT를 사용)
+        db.session.execute(Todo.__table__.insert(), batch)
+        bump_user_stats(user_id, total=len(batch), completed=sum(1 for row in batch if row['completed']))
+        db.session.commit()
+        progress['imported'] += len(batch)
+        batch.clear()
+
+    for line_number, item in rows:
+        try:
+            batch.append(import_row(item, user_id, now))
+        except ValueError as e:
+            progress['skipped'] += 1
+            if len(progress['errors']) < IMPORT_MAX_ERRORS:
+                progress['errors'].append({'line': line_number, 'error': str(e)})
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+            yield dict(progress, done=False)
+    if batch:
+        flush()
+    if progress['imported'] >= IMPORT_BATCH_SIZE:
+        # 대량 추가로 잘게 나뉜 검색 인덱스 정리는 응답을 기다리게 하지 않고 백그라운드에서
+        enqueue_job('optimize-search-index', key=f"optimize-search-index:{int(time.time() // 60)}")
+        db.session.commit()
+    yield dict(progress, done=True)
+
+def import_progress_response(rows):
+    """가져오기를 실행하면서 진행 상황을 한 줄에 하나씩 JSON으로 보내는 스트리밍 응답을 만듭니다."""
+    user_id = current_user.id
+    username = current_user.username
+
+    def generate():
+        start = time.perf_counter()
+        progress = {}
+        try:
+            for progress in import_todos(user_id, rows):
+                yield json.dumps(progress, ensure_ascii=False) + '\n'
+            logger.info("할 일 가져오기: %s개 추가, %s개 건너뜀, %.1f초 (사용자: %s)",
+                        progress['imported'], progress['skipped'], time.perf_counter() - start, username)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("할 일 가져오기 중 오류: %s", e)
+            yield json.dumps(dict(progress, done=True, error='할 일 가져오기 중 오류가 발생했습니다.'),
+                             ensure_ascii=False) + '\n'
+
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson',
+                              headers={'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'})
+
+# 완료된 할 일 보관 (콜드 테이블)
+# 완료된 지 ARCHIVE_AFTER_DAYS일이 지난 할 일을 예약된 백그라운드 작업이 조금씩 archived_todo 테이블로 옮깁니다.
+# todo 테이블과 인덱스에는 최근 항목만 남고, 보관된 개수는 사용자 통계(archived)에 더해 두어 스캔 없이 표시합니다.
+ARCHIVE_AFTER_DAYS = int(os.getenv('MYTODO_ARCHIVE_AFTER_DAYS', 30))  # 0이면 자동 보관 끔
+ARCHIVE_BATCH_SIZE = int(os.getenv('MYTODO_ARCHIVE_BATCH_SIZE', 500))
+ARCHIVE_INTERVAL = float(os.getenv('MYTODO_ARCHIVE_INTERVAL', 3600))  # 자동 보관 주기(초)
+ARCHIVE_BATCH_PAUSE = 0.1  # 배치 사이에 쉬어 요청의 쓰기가 오래 기다리지 않게 함
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """cutoff 이전에 완료된 할 일을 최대 batch_size개 보관 테이블로 옮기고 커밋합니다. 옮긴 개수를 반환합니다."""
+    old = (Todo.completed == True) & (Todo.completed_at < cutoff)
+    candidates = db.select(Todo.id).where(old).order_by(Todo.completed_at).limit(batch_size)
+    # DELETE ... RETURNING으로 실제로 지운 행만 옮기므로 여러 워커가 동시에 실행해도 두 번 옮기지 않음
+    # (조건을 바깥에도 두어 그 사이에 완료 취소된 항목은 지우지 않음)
+    rows = db.session.execute(
+        db.delete(Todo).where(Todo.id.in_(candidates), old)
+        .returning(Todo.id, Todo.user_id, Todo.content, Todo.created_at, Todo.completed_at)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not rows:
+        db.session.rollback()
+        return 0
+    now = datetime.now(KST)
+    db.session.execute(ArchivedTodo.__table__.insert(), [
+        {'todo_id': row.id, 'user_id': row.user_id, 'content': row.content, 'created_at': row.created_at,
+         'completed_at': row.completed_at, 'archived_at': now}
+        for row in rows
+    ])
+    for user_id, count in Counter(row.user_id for row in rows).items():
+        bump_user_stats(user_id, total=-count, completed=-count, archived=count)
+    db.session.commit()
+    return len(rows)
+
+def archive_old_todos(days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """완료된 지 days일이 지난 할 일을 대상이 없을 때까지 배치로 옮깁니다. 옮긴 전체 개수를 반환합니다."""
+    cutoff = datetime.now(KST) - timedelta(days=days)
+    archived = 0
+    while True:
+        count = archive_batch(cutoff, batch_size)
+        archived += count
+        if count < batch_size:
+            return archived
+        time.sleep(ARCHIVE_BATCH_PAUSE)
+
+@background_job('archive-todos')
+def archive_todos_job(days=ARCHIVE_AFTER_DAYS):
+    """자동 보관 작업. 배치마다 커밋하므로 중간에 실패해도 옮긴 항목은 유지되고, 다시 시도하면 남은 항목부터 옮깁니다."""
+    started = time.perf_counter()
+    count = archive_old_todos(days)
+    if count:
+        logger.info("완료된 할 일 %s개를 보관했습니다. (%.1f초)", count, time.perf_counter() - started)
+
+if ARCHIVE_AFTER_DAYS > 0 and ARCHIVE_INTERVAL > 0:
+    schedule_job('archive-todos', ARCHIVE_INTERVAL)
+
+def archived_page(user_id, per_page, cursor=None):
+    """보관된 할 일을 (created_at, id) 기준 키셋 페이지로 조회합니다. (todos, prev_cursor, next_cursor)를 반환합니다."""
+    position = decode_cursor(cursor) if cursor else None
+    query = ArchivedTodo.query.filter_by(user_id=user_id)
+    key = db.tuple_(ArchivedTodo.created_at, ArchivedTodo.id)
+    if position and position[0] == 'prev':
+        query = query.filter(key > position[1:]).order_by(ArchivedTodo.created_at.asc(), ArchivedTodo.id.asc())
+    else:
+        if position:
+            query = query.filter(key < position[1:])
+        query = query.order_by(ArchivedTodo.created_at.desc(), ArchivedTodo.id.desc())
+    return keyset_result(query.limit(per_page + 1).all(), position, per_page)
+
+# 전문 검색
+# SQLite: FTS5(trigram 토크나이저, 한글 부분 문자열 검색 지원) + 트리거로 todo 테이블과 동기화
+# PostgreSQL: pg_trgm GIN 인덱스(ILIKE) + simple 설정 tsvector GIN 인덱스
+SEARCH_MAX_LENGTH = 200
+SEARCH_MIN_TRIGRAM_LENGTH = 3  # trigram 인덱스는 3글자 이상부터 사용 가능
+SEARCH_SELECTIVE_LIMIT = 1000  # 일치 항목이 이보다 적으면 검색 인덱스에서 출발하여 조회
+
+_search_backends = {}
+
+def setup_search_index():
+    """데이터베이스 종류에 맞는 전문 검색 인덱스를 준비합니다. 이미 있으면 아무것도 하지 않습니다."""
+    dialect = db.engine.dialect.name
+    _search_backends.clear()
+    if dialect == 'sqlite':
+        with db.engine.begin() as conn:
+            if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'todo_fts'")).first():
+                return
+            try:
+                conn.execute(text("CREATE VIRTUAL TABLE todo_fts USING fts5("
+                                  "content, content='todo', content_rowid='id', tokenize='trigram')"))
+            except OperationalError as e:
+                # trigram 토크나이저가 없는 SQLite(3.34 미만)에서는 공백 단위 토크나이저 사용
+                logger.warning("FTS5 trigram 토크나이저를 사용할 수 없습니다: %s", e)
+                try:
+                    conn.execute(text("CREATE VIRTUAL TABLE todo_fts USING fts5("
+                                      "content, content='todo', content_rowid='id', tokenize='unicode61')"))
+                except OperationalError as e:
+                    logger.warning("FTS5를 사용할 수 없어 LIKE 검색을 사용합니다: %s", e)
+                    return
+            conn.execute(text("CREATE TRIGGER IF NOT EXISTS todo_fts_ai AFTER INSERT ON todo BEGIN "
+                              "INSERT INTO todo_fts(rowid, content) VALUES (new.id, new.content); END"))
+            conn.execute(text("CREATE TRIGGER IF NOT EXISTS todo_fts_ad AFTER DELETE ON todo BEGIN "
+                              "INSERT INTO todo_fts(todo_fts, rowid, content) VALUES ('delete', old.id, old.content); END"))
+            conn.execute(text("CREATE TRIGGER IF NOT EXISTS todo_fts_au AFTER UPDATE OF content ON todo BEGIN "
+                              "INSERT INTO todo_fts(todo_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+                              "INSERT INTO todo_fts(rowid, content) VALUES (new.id, new.content); END"))
+            # 기존 할 일로 인덱스 채우기
+            conn.execute(text("INSERT INTO todo_fts(todo_fts) VALUES ('rebuild')"))
+            logger.info("전문 검색 인덱스(todo_fts)를 생성했습니다.")
+    elif dialect == 'postgresql':
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_todo_content_trgm ON todo USING gin (content gin_trgm_ops)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_todo_content_tsv ON todo USING gin (to_tsvector('simple', content))"))
+        except Exception as e:
+            logger.warning("PostgreSQL 검색 인덱스를 만들 수 없어 LIKE 검색을 사용합니다: %s", e)
+
+@background_job('optimize-search-index')
+def optimize_search_index():
+    """대량 추가 뒤 검색 인덱스를 정리합니다. (SQLite: FTS5 세그먼트 병합, PostgreSQL: 통계 갱신)"""
+    backend = get_search_backend()
+    if backend == 'fts5':
+        db.session.execute(text("INSERT INTO todo_fts(todo_fts) VALUES ('optimize')"))
+    elif db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("ANALYZE todo"))
+    db.session.commit()
+
+def get_search_backend():
+    """현재 데이터베이스에서 사용할 검색 방식('fts5', 'pg_trgm', 'like')을 반환합니다."""
+    key = str(db.engine.url)
+    backend = _search_backends.get(key)
+    if backend is None:
+        dialect = db.engine.dialect.name
+        backend = 'like'
+        with db.engine.connect() as conn:
+            if dialect == 'sqlite':
+                if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'todo_fts'")).first():
+                    backend = 'fts5'
+            elif dialect == 'postgresql':
+                if conn.execute(text("SELECT 1 FROM pg_indexes WHERE indexname = 'ix_todo_content_trgm'")).first():
+                    backend = 'pg_trgm'
+        _search_backends[key] = backend
+    return backend
+
+def fts_phrase(search):
+    """검색어 전체를 하나의 FTS5 구문으로 만듭니다. (trigram에서는 부분 문자열 일치)"""
+    return '"' + search.replace('"', '""') + '"'
+
+def user_fts_matches(search, user_id):
+    """사용자의 할 일 중 FTS5 구문에 일치하는 todo.id를 고르는 SELECT를 반환합니다."""
+    fts = db.table('todo_fts', db.column('rowid'))
+    todo = Todo.__table__.alias('owned')  # 바깥 todo 쿼리와 상관(correlate)되지 않도록 별칭 사용
+    # 일치 항목에서 출발하여 기본 키로 소유자를 확인 (+ 0: user_id 인덱스로 돌며 행마다 MATCH를 다시 하지 않게 함)
+    return db.select(fts.c.rowid).select_from(fts.join(todo, todo.c.id == fts.c.rowid)).where(
+        text('todo_fts MATCH :search_phrase').bindparams(search_phrase=fts_phrase(search)),
+        (todo.c.user_id + 0) == user_id)
+
+def search_is_selective(search, user_id):
+    """사용자의 FTS5 일치 항목이 SEARCH_SELECTIVE_LIMIT개 이하인지 확인합니다."""
+    if get_search_backend() != 'fts5' or len(search) < SEARCH_MIN_TRIGRAM_LENGTH:
+        return False
+    rows = db.session.execute(user_fts_matches(search, user_id).limit(SEARCH_SELECTIVE_LIMIT + 1)).fetchall()
+    return len(rows) <= SEARCH_SELECTIVE_LIMIT
+
+def todo_search_clause(search, user_id=None):
+    """검색어에 해당하는 할 일을 고르는 WHERE 조건을 반환합니다.
+
+    user_id를 주면 (일치 항목이 적은 경우) 그 사용자의 FTS5 일치 항목으로 고르고,
+    아니면 사용자의 할 일을 최신순으로 훑으며 LIKE로 거릅니다. (흔한 검색어는 몇 행만 읽고 한 페이지가 참)
+    """
+    backend = get_search_backend()
+    escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    like = Todo.content.ilike(f'%{escaped}%', escape='\\')
+    if backend == 'fts5' and user_id is not None and len(search) >= SEARCH_MIN_TRIGRAM_LENGTH:
+        return Todo.id.in_(user_fts_matches(search, user_id))
+    if backend == 'pg_trgm':
+        tsquery = db.func.plainto_tsquery('simple', search)
+        return db.or_(db.func.to_tsvector('simple', Todo.content).op('@@')(tsquery), like)
+    return like
+
+def todo_list_query(user_id, filter_type='all', search=None):
+    """대시보드 목록 쿼리를 구성합니다. (복합 인덱스를 타도록 user_id/completed 필터 후 created_at 정렬)"""
+    selective = bool(search) and search_is_selective(search, user_id)
+    if selective:
+        # 일치 항목이 적으면 user_id 인덱스를 끝까지 훑는 대신 검색 인덱스의 rowid로 직접 조회
+        # (+ 0은 SQLite가 user_id 인덱스를 고르지 않게 하는 관용 표현)
+        query = Todo.query.filter((Todo.user_id + 0) == user_id)
+    else:
+        query = Todo.query.filter_by(user_id=user_id)
+    if filter_type == 'completed':
+        query = query.filter_by(completed=True)
+    elif filter_type == 'pending':
+        query = query.filter_by(completed=False)
+    if search:
+        query = query.filter(todo_search_clause(search, user_id if selective else None))
+    return query.order_by(Todo.created_at.desc(), Todo.id.desc())
+
+def encode_cursor(direction, todo):
+    """할 일의 (created_at, id) 위치를 불투명한 커서 문자열로 만듭니다."""
+    raw = f"{direction}|{todo.created_at.isoformat()}|{todo.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """커서 문자열을 (direction, created_at, id)로 해석합니다. 잘못된 커서는 None을 반환합니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        direction, created_at, todo_id = raw.split('|')
+        if direction not in ('next', 'prev'):
+            return None
+        return direction, datetime.fromisoformat(created_at), int(todo_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def keyset_query(user_id, filter_type, per_page, cursor=None, search=None):
+    """(created_at, id) 기준 키셋 페이지 쿼리와 커서 위치를 반환합니다. 결과 행은 keyset_result로 해석합니다."""
+    position = decode_cursor(cursor) if cursor else None
+    query = todo_list_query(user_id, filter_type, search).order_by(None)
+    key = db.tuple_(Todo.created_at, Todo.id)
+    if position and position[0] == 'prev':
+        # 이전 페이지: 커서보다 최신 항목을 오름차순으로 읽은 뒤 뒤집음
+        query = query.filter(key > position[1:]).order_by(Todo.created_at.asc(), Todo.id.asc())
+    else:
+        if position:
+            query = query.filter(key < position[1:])
+        query = query.order_by(Todo.created_at.desc(), Todo.id.desc())
+    return query.limit(per_page + 1), position
+
+def keyset_result(rows, position, per_page):
+    """키셋 쿼리 결과 행을 (todos, prev_cursor, next_cursor)로 바꿉니다."""
+    if position and position[0] == 'prev':
+        has_prev = len(rows) > per_page
+        has_next = True
+        todos = list(reversed(rows[:per_page]))
+    else:
+        has_prev = position is not None
+        has_next = len(rows) > per_page
+        todos = rows[:per_page]
+    prev_cursor = encode_cursor('prev', todos[0]) if todos and has_prev else None
+    next_cursor = encode_cursor('next', todos[-1]) if todos and has_next else None
+    return todos, prev_cursor, next_cursor
+
+def keyset_page(user_id, filter_type, per_page, cursor=None, search=None):
+    """(created_at, id) 기준 키셋 페이지를 조회합니다. (todos, prev_cursor, next_cursor)를 반환합니다."""
+    query, position = keyset_query(user_id, filter_type, per_page, cursor, search)
+    return keyset_result(query.all(), position, per_page)
+
+# 렌더링된 HTML 조각 캐시
+# 키에 사용자 데이터 버전이 들어가므로 변경 시 별도 무효화 없이 새 키로 바뀌고, 이전 조각은 LRU로 밀려남
+FRAGMENT_CACHE_BACKEND = os.getenv('MYTODO_FRAGMENT_CACHE', 'memory')  # memory, redis, off
+FRAGMENT_CACHE_MAX_BYTES = int(os.getenv('MYTODO_FRAGMENT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+FRAGMENT_CACHE_TTL = int(os.getenv('MYTODO_FRAGMENT_CACHE_TTL', 3600))
+
+class MemoryFragmentCache:
+    """프로세스 내 LRU 조각 캐시. 저장된 HTML의 총 바이트 수가 max_bytes를 넘지 않게 유지합니다."""
+
+    def __init__(self, max_bytes=FRAGMENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old.encode('utf-8'))
+            self._data[key] = value
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted.encode('utf-8'))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+class RedisFragmentCache:
+    """Redis 호환 서버(redis, valkey, KeyDB 등)를 쓰는 조각 캐시. 서버 오류는 캐시 미스로 처리합니다."""
+
+    def __init__(self, url, ttl=FRAGMENT_CACHE_TTL):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self.ttl = ttl
+
+    def get(self, key):
+        try:
+            value = self.client.get(f'mytodo:fragment:{key}')
+        except Exception as e:
+            logger.warning("조각 캐시 조회 실패: %s", e)
+            return None
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value):
+        try:
+            self.client.set(f'mytodo:fragment:{key}', value.encode('utf-8'), ex=self.ttl)
+        except Exception as e:
+            logger.warning("조각 캐시 저장 실패: %s", e)
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter('mytodo:fragment:*'):
+                self.client.delete(key)
+        except Exception as e:
+            logger.warning("조각 캐시 비우기 실패: %s", e)
+
+def create_fragment_cache():
+    """MYTODO_FRAGMENT_CACHE 설정에 맞는 조각 캐시를 만듭니다. off이면 None을 반환합니다."""
+    if FRAGMENT_CACHE_BACKEND == 'off':
+        return None
+    if FRAGMENT_CACHE_BACKEND == 'redis':
+        try:
+            return RedisFragmentCache(os.getenv('MYTODO_REDIS_URL', 'redis://127.0.0.1:6379/0'))
+        except ImportError:
+            logger.warning("redis 패키지가 없어 프로세스 내 조각 캐시를 사용합니다.")
+    return MemoryFragmentCache()
+
+fragment_cache = create_fragment_cache()
+
+def cached_fragment(key_parts, render):
+    """키에 해당하는 HTML 조각을 캐시에서 꺼내고, 없으면 render()로 만들어 저장합니다."""
+    if fragment_cache is None:
+        return Markup(render())
+    key = '|'.join(str(part) for part in key_parts)
+    html = fragment_cache.get(key)
+    if html is None:
+        html = render()
+        fragment_cache.set(key, html)
+    return Markup(html)
+
+async def cached_fragment_async(key_parts, render):
+    """cached_fragment의 비동기 버전. render는 HTML 문자열을 돌려주는 코루틴 함수입니다."""
+    if fragment_cache is None:
+        return Markup(await render())
+    key = '|'.join(str(part) for part in key_parts)
+    html = fragment_cache.get(key)
+    if html is None:
+        html = await render()
+        fragment_cache.set(key, html)
+    return Markup(html)
+
+# 실시간 변경 알림 (SSE)
+# 변경 알림은 별도 포트의 asyncio 서버 하나가 모든 연결을 처리하므로 연결마다 스레드를 쓰지 않음
+EVENTS_HEARTBEAT = int(os.getenv('MYTODO_EVENTS_HEARTBEAT', 15))
+EVENTS_MAX_CLIENTS = int(os.getenv('MYTODO_EVENTS_MAX_CLIENTS', 10000))
+# 토큰은 URL 쿼리에 실리므로 짧게 유지하고, 만료되면 대시보드가 /events/token에서 새로 받아 다시 연결
+EVENTS_TOKEN_MAX_AGE = int(os.getenv('MYTODO_EVENTS_TOKEN_MAX_AGE', 300))
+# 대시보드 자신의 출처(토큰에 기록) 외에 연결을 허용할 출처 (쉼표 구분, 예: 앞단 프록시 주소)
+EVENTS_ALLOWED_ORIGINS = {origin.strip().rstrip('/') for origin in os.getenv('MYTODO_EVENTS_ALLOWED_ORIGINS', '').split(',')
+                          if origin.strip()}
+# 다른 프로세스(gunicorn 워커, 관리 명령)에서 일어난 변경을 확인하는 주기(초)
+EVENTS_POLL_INTERVAL = float(os.getenv('MYTODO_EVENTS_POLL_INTERVAL', 2))
+EVENTS_POLL_CHUNK = 500  # 버전 조회 한 번에 묻는 사용자 수
+EVENTS_QUEUE_SIZE = 16
+
+class ChangeBroker:
+    """사용자별 변경 알림을 구독자 콜백에 전달하는 pub/sub. 콜백은 막히지 않아야 합니다.
+
+    변경은 user_stats.version으로 알아냅니다. 구독자가 있는 사용자의 버전을 poll_interval초마다 한 번에 조회하고,
+    이 프로세스에서 커밋한 변경은 notify()로 바로 조회하므로 다른 워커 프로세스에서 일어난 변경도 전달됩니다.
+    """
+
+    def __init__(self, poll_interval):
+        self.poll_interval = poll_interval
+        self._subscribers = {}
+        # 사용자별 마지막으로 확인한 버전 (None이면 다음 조회 값을 기준으로 삼음)
+        self._versions = {}
+        self._pending = set()
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id, callback, version=None):
+        """version은 구독자가 보고 있는 데이터의 버전입니다. 연결 전에 일어난 변경도 알리는 데 씁니다."""
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(callback)
+            stale = False
+            if user_id not in self._versions:
+                self._versions[user_id] = version
+                self._pending.add(user_id)
+            elif version is not None and self._versions[user_id] is not None:
+                stale = version < self._versions[user_id]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, name='mytodo-events-poll', daemon=True)
+                self._thread.start()
+        self._wake.set()
+        if stale:
+            callback({'type': 'changed'})
+
+    def unsubscribe(self, user_id, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(user_id)
+            if callbacks is not None:
+                callbacks.discard(callback)
+                if not callbacks:
+                    del self._subscribers[user_id]
+                    self._versions.pop(user_id, None)
+
+    def notify(self, user_id):
+        """이 프로세스에서 사용자의 변경을 커밋했음을 알립니다. 다음 주기를 기다리지 않고 그 사용자의 버전을 조회합니다."""
+        if user_id in self._versions:
+            with self._lock:
+                self._pending.add(user_id)
+            self._wake.set()
+
+    def _poll_loop(self):
+        last_full = 0
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._lock:
+                pending, self._pending = self._pending, set()
+                if time.monotonic() - last_full >= self.poll_interval:
+                    user_ids = list(self._versions)
+                    last_full = time.monotonic()
+                else:
+                    user_ids = [user_id for user_id in pending if user_id in self._versions]
+            if not user_ids:
+                continue
+            try:
+                self._poll(user_ids)
+            except Exception as e:
+                logger.warning("변경 알림 버전 조회 실패: %s", e)
+
+    def _poll(self, user_ids):
+        # 복제본은 늦을 수 있으므로 기본 DB에서 조회
+        with app.app_context(), db.engine.connect() as conn:
+            for start in range(0, len(user_ids), EVENTS_POLL_CHUNK):
+                rows = conn.execute(
+                    db.select(UserStats.user_id, UserStats.version)
+                    .where(UserStats.user_id.in_(user_ids[start:start + EVENTS_POLL_CHUNK]))
+                ).all()
+                for user_id, version in rows:
+                    with self._lock:
+                        if user_id not in self._versions:
+                            continue
+                        known = self._versions[user_id]
+                        if known is not None and version <= known:
+                            continue
+                        self._versions[user_id] = version
+                    if known is not None:
+                        self.publish(user_id, {'type': 'changed'})
+
+    def publish(self, user_id, message):
+        with self._lock:
+            callbacks = list(self._subscribers.get(user_id, ()))
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.warning("변경 알림 전달 실패 (사용자 %s): %s", user_id, e)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(callbacks) for callbacks in self._subscribers.values())
+
+change_broker = ChangeBroker(EVENTS_POLL_INTERVAL)
+
+def publish_change(user_id):
+    """사용자의 할 일 변경을 커밋했음을 알립니다. 구독자에게는 바뀐 버전을 확인한 뒤 전달됩니다."""
+    change_broker.notify(user_id)
+
+@event.listens_for(db.session, 'after_commit')
+def publish_committed_changes(session):
+    """커밋된 할 일 변경을 해당 사용자의 구독자에게 알립니다. (bump_user_stats가 사용자를 기록)"""
+    for user_id in session.info.pop('changed_users', ()):
+        publish_change(user_id)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_rolled_back_changes(session):
+    """롤백된 변경은 알리지 않습니다."""
+    session.info.pop('changed_users', None)
+
+def events_serializer():
+    """변경 알림 연결용 토큰 서명기. 세션과 같은 키 목록을 쓰고 salt로 용도를 구분합니다."""
+    keys = list(reversed(app.config.get('SECRET_KEY_FALLBACKS') or [])) + [app.secret_key]
+    return URLSafeTimedSerializer(keys, salt='mytodo-events')
+
+def load_events_token(token):
+    """알림 토큰을 확인하고 (내용, 만료 시각(epoch 초))를 반환합니다. 잘못되었거나 만료되었으면 None을 반환합니다.
+
+    내용: u(사용자 id), n(로그인 세션별 nonce, 로그아웃 시 폐기), o(토큰을 발급한 대시보드의 출처)
+    """
+    try:
+        claims, issued_at = events_serializer().loads(token, max_age=EVENTS_TOKEN_MAX_AGE, return_timestamp=True)
+    except Exception:
+        return None
+    if not isinstance(claims, dict) or 'u' not in claims:
+        return None
+    return claims, issued_at.timestamp() + EVENTS_TOKEN_MAX_AGE
+
+def events_origin_allowed(origin, claims):
+    """브라우저가 보낸 Origin이 토큰을 발급한 대시보드의 출처이거나 허용 목록에 있는지 확인합니다."""
+    origin = origin.rstrip('/')
+    return origin == claims.get('o') or origin in EVENTS_ALLOWED_ORIGINS
+
+def authorize_events_request(token, origin):
+    """알림 연결 요청의 토큰과 출처를 확인합니다. (거부할 때의 HTTP 상태 또는 None, 토큰 내용, 만료 시각)을 반환합니다."""
+    loaded = load_events_token(token)
+    if loaded is None:
+        return '401 Unauthorized', None, None
+    claims, expires_at = loaded
+    # 다른 사이트의 페이지가 토큰을 가져다 연결하지 못하도록 출처 확인 (Origin이 없는 비브라우저 클라이언트는 허용)
+    if origin and not events_origin_allowed(origin, claims):
+        return '403 Forbidden', None, None
+    return None, claims, expires_at
+
+def revoke_events_token(user_id, nonce):
+    """로그아웃한 세션의 알림 연결을 닫습니다. (이 프로세스의 연결은 바로, 다른 프로세스는 토큰 만료 시 새 토큰을 받지 못해 끝남)"""
+    change_broker.publish(user_id, {'type': 'revoked', 'nonce': nonce})
+
+def offer_change(events, message):
+    """알림 큐에 메시지를 넣습니다. 알림은 "다시 불러오라"는 신호뿐이므로 밀린 알림은 최신 것 하나로 합쳐도 됨"""
+    if events.full():
+        events.get_nowait()
+    events.put_nowait(message)
+
+async def stream_changes(broker, claims, expires_at, write):
+    """토큰의 사용자에 대한 변경 알림을 SSE 형식으로 write(bytes)에 씁니다. (응답 헤더는 호출자가 보냄)
+
+    토큰이 만료되거나 그 세션이 로그아웃하면 expired 이벤트를 보내고 끝납니다.
+    """
+    events = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+    loop = asyncio.get_running_loop()
+    user_id = claims['u']
+
+    def callback(message):
+        loop.call_soon_threadsafe(offer_change, events, message)
+
+    broker.subscribe(user_id, callback, claims.get('v'))
+    try:
+        await write(b'retry: 3000\n\n')
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(events.get(), min(EVENTS_HEARTBEAT, remaining))
+            except asyncio.TimeoutError:
+                # 끊긴 연결을 알아내고 프록시가 유휴 연결을 닫지 않도록 주석 줄을 보냄
+                chunk = ': ping\n\n'
+            else:
+                if message.get('type') == 'revoked':
+                    if message.get('nonce') == claims.get('n'):
+                        break
+                    continue
+                chunk = f'event: change\ndata: {json.dumps(message)}\n\n'
+            await write(chunk.encode())
+        # 대시보드는 이 이벤트를 받으면 새 토큰으로 다시 연결 (로그아웃했으면 새 토큰을 받지 못함)
+        await write(b'event: expired\ndata: {}\n\n')
+    finally:
+        broker.unsubscribe(user_id, callback)
+
+class EventStreamServer:
+    """SSE 연결을 asyncio 이벤트 루프 하나에서 처리하는 작은 HTTP 서버.
+
+    GET /events?token=... 요청을 받아 토큰의 사용자에 대한 변경 알림을 text/event-stream으로 보냅니다. (stream_changes)
+    대기 중인 연결은 코루틴과 작은 큐만 차지하므로 수천 개의 유휴 연결도 스레드 하나로 유지됩니다.
+    reuse_port이면 gunicorn 워커마다 같은 포트로 서버를 열고 커널이 연결을 나누어 줍니다.
+    """
+
+    def __init__(self, host, port, broker, reuse_port=False):
+        self.broker = broker
+        self.clients = 0
+        # 포트 충돌은 시작 시점에 바로 알 수 있도록 소켓은 호출한 스레드에서 엶
+        self._sock = socket.create_server((host, port), backlog=1024, reuse_port=reuse_port)
+        self.port = self._sock.getsockname()[1]
+
+    def start(self):
+        threading.Thread(target=asyncio.run, args=(self._serve(),), name='mytodo-events', daemon=True).start()
+
+    async def _serve(self):
+        server = await asyncio.start_server(self._handle, sock=self._sock, limit=8192)
+        async with server:
+            await server.serve_forever()
+
+    async def _respond(self, writer, status, body=b''):
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: text/plain; charset=utf-8\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 10)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = head.decode('latin-1').split('\r\n')
+        method, _, target = lines[0].partition(' ')
+        target = target.rsplit(' ', 1)[0]
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        url = urllib.parse.urlsplit(target)
+        token = urllib.parse.parse_qs(url.query).get('token', [''])[0]
+
+        try:
+            if method != 'GET' or url.path != '/events':
+                await self._respond(writer, '404 Not Found')
+                return
+            origin = headers.get('origin')
+            error, claims, expires_at = authorize_events_request(token, origin)
+            if error is not None:
+                await self._respond(writer, error)
+                return
+            if self.clients >= EVENTS_MAX_CLIENTS:
+                await self._respond(writer, '503 Service Unavailable')
+                return
+            await self._stream(reader, writer, claims, expires_at, origin)
+        except (ConnectionError, asyncio.CancelledError):
+            # 클라이언트 연결 끊김 (_cancel_on_disconnect가 취소한 경우 포함)
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _cancel_on_disconnect(reader, task):
+        # 클라이언트가 연결을 닫으면 다음 heartbeat를 기다리지 않고 바로 정리
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        task.cancel()
+
+    async def _stream(self, reader, writer, claims, expires_at, origin):
+        async def write(chunk):
+            writer.write(chunk)
+            await writer.drain()
+
+        self.clients += 1
+        watcher = asyncio.create_task(self._cancel_on_disconnect(reader, asyncio.current_task()))
+        try:
+            # 토큰으로 인증하므로 쿠키 없이 다른 포트(출처)의 대시보드에서 연결 가능 (허용한 출처에만 CORS 응답)
+            cors = f'Access-Control-Allow-Origin: {origin}\r\nVary: Origin\r\n' if origin else ''
+            await write(('HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n'
+                         f'{cors}Connection: keep-alive\r\n\r\n').encode())
+            await stream_changes(self.broker, claims, expires_at, write)
+        finally:
+            watcher.cancel()
+            self.clients -= 1
+
+event_stream_server = None
+# 비동기 서빙 모드에서는 별도 포트 대신 앱 포트의 /events에서 알림을 보냄 (AsyncTodoApp)
+events_on_app_port = False
+
+def start_event_stream(host, port, reuse_port=False):
+    """변경 알림 서버를 시작합니다. 포트를 열 수 없으면 실시간 업데이트 없이 계속 실행합니다."""
+    global event_stream_server
+    try:
+        server = EventStreamServer(host, port, change_broker, reuse_port)
+    except (OSError, ValueError) as e:
+        logger.warning("실시간 업데이트 서버를 시작할 수 없습니다 (포트 %s): %s", port, e)
+        return None
+    server.start()
+    event_stream_server = server
+    logger.info("실시간 업데이트 서버 시작: %s:%s", host, server.port)
+    return server
+
+def events_url(version=None):
+    """현재 사용자가 대시보드에서 연결할 변경 알림 주소를 반환합니다. 서버가 없으면 None.
+
+    version은 페이지에 그린 데이터의 버전으로, 연결하기 전에 일어난 변경도 알리는 데 씁니다.
+    """
+    if event_stream_server is None and not events_on_app_port:
+        return None
+    # 로그인 세션마다 nonce를 두어 로그아웃하면 그 세션의 토큰을 폐기
+    nonce = session.get('_events_nonce')
+    if nonce is None:
+        nonce = session['_events_nonce'] = secrets.token_urlsafe(12)
+    claims = {'u': current_user.id, 'n': nonce, 'o': request.host_url.rstrip('/')}
+    if version is not None:
+        claims['v'] = version
+    token = events_serializer().dumps(claims)
+    if event_stream_server is None:
+        return f'{request.script_root}/events?token={token}'
+    hostname = urllib.parse.urlsplit(request.host_url).hostname or '127.0.0.1'
+    if ':' in hostname:
+        hostname = f'[{hostname}]'
+    return f'{request.scheme}://{hostname}:{event_stream_server.port}/events?token={token}'
+
+@app.route('/events/token')
+@login_required
+def events_token():
+    """만료된 변경 알림 토큰 대신 새 연결 주소를 발급합니다. (대시보드 스크립트가 사용)"""
+    response = jsonify({'url': events_url(get_user_stats(current_user.id).version)})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/')
+def index():
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+    return redirect(url_for('login'))
+
+# 메인 대시보드
+def dashboard_paging_args():
+    """대시보드 페이징 파라미터 (page, per_page, cursor)를 읽습니다. (per_page는 서버에서 상한 적용)"""
+    page = request.args.get('page', 1, type=int)
+    per_page = min(max(request.args.get('per_page', DEFAULT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    return page, per_page, request.args.get('cursor')
+
+def dashboard_filtered_total(total, completed, filter_type):
+    """필터에 해당하는 할 일 수를 통계에서 계산합니다."""
+    if filter_type == 'completed':
+        return completed
+    if filter_type == 'pending':
+        return total - completed
+    return total
+
+def use_keyset_pagination(filtered_total, cursor, search):
+    """키셋 페이징: 이력이 길어도 OFFSET 스캔 없이 커서 위치부터 조회 (검색 결과는 개수를 모르므로 항상 사용)"""
+    return bool(cursor or search or filtered_total > KEYSET_PAGINATION_THRESHOLD)
+
+def render_dashboard_list(todos, filter_type, search, page, per_page, pagination_mode,
+                          pages=0, has_prev=False, has_next=False, prev_cursor=None, next_cursor=None):
+    """할 일 목록과 페이징 조각을 렌더링합니다."""
+    return render_template(
+        '_dashboard_list.html',
+        todos=todos,
+        filter_type=filter_type,
+        search=search,
+        page=page,
+        per_page=per_page,
+        pages=pages,
+        has_prev=has_prev,
+        has_next=has_next,
+        pagination_mode=pagination_mode,
+        prev_cursor=prev_cursor,
+        next_cursor=next_cursor
+    )
+
+def dashboard_response(form, bulk_form, filter_type, search, total_todos, completed_todos, version, list_html,
+                       archived_todos=0):
+    """통계 조각을 붙여 대시보드 페이지(또는 실시간 업데이트용 조각 JSON)를 만듭니다."""
+    # 통계 카드와 목록은 데이터 버전이 같으면 캐시된 HTML 조각을 그대로 사용
+    # (전체/완료 수에는 보관된 할 일도 포함)
+    stats_html = cached_fragment(
+        ('stats', current_user.id, version),
+        lambda: render_template('_dashboard_stats.html', total_todos=total_todos + archived_todos,
+                                completed_todos=completed_todos + archived_todos,
+                                pending_todos=total_todos - completed_todos, archived_todos=archived_todos)
+    )
+
+    # 실시간 업데이트: 변경 알림을 받은 페이지는 통계와 목록 조각만 다시 받아 바꿔 끼움
+    if request.args.get('fragment'):
+        response = jsonify({'stats': str(stats_html), 'list': str(list_html)})
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    return render_template(
+        'dashboard.html',
+        form=form,
+        bulk_form=bulk_form,
+        import_form=ImportForm(),
+        filter_type=filter_type,
+        search=search,
+        stats_html=stats_html,
+        list_html=list_html,
+        events_url=events_url(version)
+    )
+
+@app.route('/dashboard')
+@login_required
+def dashboard():
+    form = TodoForm()
+    bulk_form = BulkTodoForm()
+    filter_type = request.args.get('filter', 'all')
+    search = request.args.get('q', '').strip()[:SEARCH_MAX_LENGTH]
+    try:
+        page, per_page, cursor = dashboard_paging_args()
+
+        # 통계: 사용자 통계 캐시에서 기본 키로 조회
+        stats = get_user_stats(current_user.id)
+        filtered_total = dashboard_filtered_total(stats.total, stats.completed, filter_type)
+
+        def render_list():
+            if use_keyset_pagination(filtered_total, cursor, search):
+                todos, prev_cursor, next_cursor = keyset_page(current_user.id, filter_type, per_page, cursor, search)
+                return render_dashboard_list(todos, filter_type, search, page, per_page, 'keyset',
+                                             has_prev=prev_cursor is not None, has_next=next_cursor is not None,
+                                             prev_cursor=prev_cursor, next_cursor=next_cursor)
+            # 번호 페이징: 결과가 적을 때만 사용
+            # 전체 개수는 통계 캐시로 대신하므로 paginate의 COUNT 쿼리는 생략
+            query = todo_list_query(current_user.id, filter_type)
+            todos_pagination = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+            todos_pagination.total = filtered_total
+            return render_dashboard_list(todos_pagination.items, filter_type, search, page, per_page, 'pages',
+                                         pages=todos_pagination.pages, has_prev=todos_pagination.has_prev,
+                                         has_next=todos_pagination.has_next)
+
+        list_html = cached_fragment(
+            ('list', current_user.id, stats.version, filter_type, page, per_page, cursor, search),
+            render_list
+        )
+        return dashboard_response(form, bulk_form, filter_type, search, stats.total, stats.completed,
+                                  stats.version, list_html, stats.archived)
+    except Exception as e:
+        logger.error("대시보드 조회 중 오류: %s", e)
+        flash('대시보드 정보를 불러오는 중 오류가 발생했습니다.', 'error')
+        stats_html = Markup(render_template('_dashboard_stats.html', total_todos=0, completed_todos=0, pending_todos=0))
+        list_html = Markup(render_dashboard_list([], filter_type, search, 1, DEFAULT_PER_PAGE, 'pages', pages=1))
+        return render_template('dashboard.html', form=form, bulk_form=bulk_form, filter_type=filter_type,
+                               search=search, stats_html=stats_html, list_html=list_html, events_url=None)
+
+# 할 일 관리
+@app.route('/add_todo', methods=['POST'])
+@login_required
+def add_todo():
+    form = TodoForm()
+    if form.validate_on_submit():
+        try:
+            content = form.content.data
+            todo = Todo(content=content, user_id=current_user.id)
+            db.session.add(todo)
+            bump_user_stats(current_user.id, total=1)
+            db.session.commit()
+            flash('할 일이 추가되었습니다.', 'success')
+            logger.info("새 할 일 추가: %s... (사용자: %s)", content[:50], current_user.username)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("할 일 추가 중 오류: %s", e)
+            flash('할 일 추가 중 오류가 발생했습니다.', 'error')
+    else:
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f'{error}', 'error')
+    
+    return redirect(url_for('dashboard'))
+
+@app.route('/edit_todo/<int:todo_id>', methods=['GET', 'POST'])
+@login_required
+def edit_todo(todo_id):
+    todo = Todo.query.filter_by(id=todo_id, user_id=current_user.id).first_or_404()
+    form = TodoForm(obj=todo)
+    if form.validate_on_submit():
+        try:
+            todo.content = form.content.data
+            bump_user_stats(current_user.id)
+            db.session.commit()
+            flash('할 일이 수정되었습니다.', 'success')
+            logger.info("할 일 수정: ID %s, 내용: %s... (사용자: %s)", todo_id, todo.content[:50], current_user.username)
+            return redirect(url_for('dashboard'))
+        except Exception as e:
+            db.session.rollback()
+            logger.error("할 일 수정 중 오류: %s", e)
+            flash('할 일 수정 중 오류가 발생했습니다.', 'error')
+    
+    for field, errors in form.errors.items():
+        for error in errors:
+            flash(f'{error}', 'error')
+    return render_template('edit_todo.html', todo=todo, form=form)
+
+@app.route('/complete_todo/<int:todo_id>')
+@login_required
+def complete_todo(todo_id):
+    try:
+        set_todo_completed(current_user.id, todo_id, True)
+        db.session.commit()
+        flash('할 일이 완료되었습니다.', 'success')
+        logger.info("할 일 완료: ID %s (사용자: %s)", todo_id, current_user.username)
+        return redirect(url_for('dashboard'))
+    except Exception as e:
+        db.session.rollback()
+        logger.error("할 일 완료 처리 중 오류: %s", e)
+        flash('할 일 완료 처리 중 오류가 발생했습니다.', 'error')
+        return redirect(url_for('dashboard'))
+
+@app.route('/uncomplete_todo/<int:todo_id>')
+@login_required
+def uncomplete_todo(todo_id):
+    try:
+        set_todo_completed(current_user.id, todo_id, False)
+        db.session.commit()
+        flash('할 일이 미완료로 변경되었습니다.', 'success')
+        logger.info("할 일 미완료 변경: ID %s (사용자: %s)", todo_id, current_user.username)
+        return redirect(url_for('dashboard'))
+    except Exception as e:
+        db.session.rollback()
+        logger.error("할 일 미완료 변경 중 오류: %s", e)
+        flash('할 일 미완료 변경 중 오류가 발생했습니다.', 'error')
+        return redirect(url_for('dashboard'))
+
+@app.route('/delete_todo/<int:todo_id>')
+@login_required
+def delete_todo(todo_id):
+    try:
+        delete_todo_row(current_user.id, todo_id)
+        db.session.commit()
+        flash('할 일이 삭제되었습니다.', 'success')
+        logger.info("할 일 삭제: ID %s (사용자: %s)", todo_id, current_user.username)
+        return redirect(url_for('dashboard'))
+    except Exception as e:
+        db.session.rollback()
+        logger.error("할 일 삭제 중 오류: %s", e)
+        flash('할 일 삭제 중 오류가 발생했습니다.', 'error')
+        return redirect(url_for('dashboard'))
+
+@app.route('/bulk_todos', methods=['POST'])
+@login_required
+def bulk_todos():
+    form = BulkTodoForm()
+    if form.validate_on_submit():
+        todo_ids = request.form.getlist('todo_ids', type=int)[:BULK_MAX_ITEMS]
+        if not todo_ids:
+            flash('선택된 할 일이 없습니다.', 'error')
+            return redirect(request.referrer or url_for('dashboard'))
+        try:
+            count = apply_bulk_action(current_user.id, form.action.data, ids=todo_ids)
+            db.session.commit()
+            flash(f'{count}개의 할 일을 처리했습니다.', 'success')
+            logger.info("할 일 일괄 처리: %s %s개 (사용자: %s)", form.action.data, count, current_user.username)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("할 일 일괄 처리 중 오류: %s", e)
+            flash('할 일 일괄 처리 중 오류가 발생했습니다.', 'error')
+    else:
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f'{error}', 'error')
+    return redirect(request.referrer or url_for('dashboard'))
+
+@app.route('/export_todos')
+@login_required
+def export_todos():
+    fmt = request.args.get('format', 'csv')
+    if fmt not in TRANSFER_MIMETYPES:
+        flash('지원하지 않는 내보내기 형식입니다.', 'error')
+        return redirect(url_for('dashboard'))
+    return export_response(fmt)
+
+@app.route('/import_todos', methods=['POST'])
+@login_required
+def import_todos_view():
+    form = ImportForm()
+    if not form.validate_on_submit():
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f'{error}', 'error')
+        return redirect(url_for('dashboard'))
+    upload = form.file.data
+    fmt = import_format(upload.filename)
+    if fmt is None:
+        flash('CSV(.csv) 또는 NDJSON(.ndjson, .jsonl) 파일만 가져올 수 있습니다.', 'error')
+        return redirect(url_for('dashboard'))
+    rows = parse_import_rows(upload.stream, fmt)
+
+    # 대시보드 스크립트는 진행 상황을 스트리밍으로 받음
+    if request.accept_mimetypes.best == 'application/x-ndjson':
+        return import_progress_response(rows)
+
+    try:
+        for progress in import_todos(current_user.id, rows):
+            pass
+        flash(f"{progress['imported']}개의 할 일을 가져왔습니다."
+              + (f" (잘못된 행 {progress['skipped']}개 건너뜀)" if progress['skipped'] else ''), 'success')
+        logger.info("할 일 가져오기: %s개 추가, %s개 건너뜀 (사용자: %s)",
+                    progress['imported'], progress['skipped'], current_user.username)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("할 일 가져오기 중 오류: %s", e)
+        flash('할 일 가져오기 중 오류가 발생했습니다.', 'error')
+    return redirect(url_for('dashboard'))
+
+@app.route('/archived')
+@login_required
+def archived_todos():
+    """보관된 할 일 목록. 보관 테이블은 이 화면에서만 조회합니다."""
+    per_page = min(max(request.args.get('per_page', DEFAULT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    try:
+        stats = get_user_stats(current_user.id)
+        todos, prev_cursor, next_cursor = archived_page(current_user.id, per_page, request.args.get('cursor'))
+    except Exception as e:
+        logger.error("보관된 할 일 조회 중 오류: %s", e)
+        flash('보관된 할 일을 불러오는 중 오류가 발생했습니다.', 'error')
+        return redirect(url_for('dashboard'))
+    return render_template('archived.html', todos=todos, archived_todos=stats.archived, per_page=per_page,
+                           prev_cursor=prev_cursor, next_cursor=next_cursor, archive_after_days=ARCHIVE_AFTER_DAYS)
+
+# 인증 관련 라우트
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+    
+    form = LoginForm()
+    if form.validate_on_submit():
+        limited = login_rate_limit_response(form)
+        if limited:
+            return limited
+        user = User.query.filter_by(username=form.username.data).first()
+        try:
+            valid = user is not None and user.check_password(form.password.data)
+        except PasswordHashBusy:
+            return password_busy_response('login.html', form)
+        record_login_result(form, valid)
+        if valid:
+            if db.session.is_modified(user):
+                db.session.commit()
+                logger.info("비밀번호 해시 갱신: %s", user.username)
+            login_user(user)
+            flash(f'환영합니다, {user.username}님!', 'success')
+            logger.info("사용자 로그인: %s", user.username)
+            return redirect(url_for('dashboard'))
+        else:
+            flash('사용자명 또는 비밀번호가 올바르지 않습니다.', 'error')
+    
+    return render_template('login.html', form=form)
+
+@app.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('dashboard'))
+    
+    form = RegisterForm()
+    if form.validate_on_submit():
+        # 사용자명 중복 확인
+        if User.query.filter_by(username=form.username.data).first():
+            flash('이미 사용 중인 사용자명입니다.', 'error')
+            return render_template('register.html', form=form)
+        
+        # 이메일 중복 확인
+        if User.query.filter_by(email=form.email.data).first():
+            flash('이미 사용 중인 이메일입니다.', 'error')
+            return render_template('register.html', form=form)
+        
+        try:
+            user = User(username=form.username.data, email=form.email.data)
+            user.set_password(form.password.data)
+        except PasswordHashBusy:
+            return password_busy_response('register.html', form)
+
+        try:
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(UserStats(user_id=user.id, total=0, completed=0))
+            db.session.commit()
+            
+            login_user(user)
+            flash(f'회원가입이 완료되었습니다! 환영합니다, {user.username}님!', 'success')
+            logger.info("새 사용자 등록: %s (%s)", user.username, user.email)
+            return redirect(url_for('dashboard'))
+        except Exception as e:
+            db.session.rollback()
+            logger.error("회원가입 중 오류: %s", e)
+            flash('회원가입 중 오류가 발생했습니다.', 'error')
+    
+    return render_template('register.html', form=form)
+
+@app.route('/logout')
+@login_required
+def logout():
+    username = current_user.username
+    logout_user()
+    flash(f'{username}님, 로그아웃되었습니다.', 'info')
+    logger.info("사용자 로그아웃: %s", username)
+    return redirect(url_for('login'))
+
+# JSON API (v1)
+def api_login_required(view):
+    """API용 로그인 확인 데코레이터. 로그인 페이지로 리다이렉트하지 않고 401을 반환합니다."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return api_error('로그인이 필요합니다.', 401)
+        return view(*args, **kwargs)
+    return wrapper
+
+def api_error(message, status):
+    """JSON 오류 응답을 만듭니다."""
+    return jsonify({'error': message}), status
+
+def todo_to_dict(todo):
+    """할 일을 JSON 직렬화 가능한 dict로 변환합니다."""
+    return {
+        'id': todo.id,
+        'content': todo.content,
+        'completed': bool(todo.completed),
+        'created_at': todo.created_at.isoformat() if todo.created_at else None,
+        'completed_at': todo.completed_at.isoformat() if todo.completed_at else None,
+    }
+
+def api_etag(version, full_path=None):
+    """사용자 변경 버전과 요청 경로로 ETag를 계산합니다."""
+    key = f"{current_user.id}:{version}:{full_path or request.full_path}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def api_if_match_version(todo_id):
+    """If-Match를 할 일 조회(GET) 응답의 ETag와 비교합니다.
+
+    헤더가 없거나 *이면 None, 맞으면 그 ETag의 변경 버전, 맞지 않으면 False를 반환합니다.
+    """
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    version = get_user_stats(current_user.id).version
+    # GET 응답과 같은 경로 형식 (full_path는 쿼리가 없어도 ?로 끝남)
+    etag = api_etag(version, url_for('api_get_todo_detail', todo_id=todo_id) + '?')
+    return version if request.if_match.contains_weak(etag) else False
+
+def claim_user_version(user_id, version):
+    """변경 버전이 아직 version일 때만 올립니다. 그 사이 다른 변경이 커밋되었으면 False를 반환합니다.
+
+    If-Match 검사를 읽기가 아니라 이 UPDATE가 실제로 일치시킨 행으로 하므로, 같은 ETag로 온 동시 요청은 하나만 통과합니다.
+    """
+    result = db.session.execute(user_stats_update(user_id).where(UserStats.version == version))
+    return result.rowcount == 1
+
+def api_precondition_failed():
+    return api_error('다른 요청이 먼저 변경했습니다. 다시 조회한 뒤 시도해주세요.', 412)
+
+def api_conditional(build_payload):
+    """변경 버전 기반 조건부 GET을 처리합니다. 변경이 없으면 본문을 만들지 않고 304를 반환합니다."""
+    stats = get_user_stats(current_user.id)
+    etag = api_etag(stats.version)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        payload = build_payload(stats)
+        if isinstance(payload, tuple):
+            return payload
+        response = jsonify(payload)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def api_json_body():
+    """요청 본문을 JSON 객체로 읽습니다. JSON이 아니면 None을 반환합니다."""
+    # JSON Content-Type을 요구하여 다른 사이트의 폼 전송(CSRF)을 막음
+    if not request.is_json:
+        return None
+    payload = request.get_json(silent=True)
+    return payload if isinstance(payload, dict) else None
+
+def api_validate_content(payload):
+    """TodoForm 규칙으로 내용을 검증합니다. (내용, 오류 메시지)를 반환합니다."""
+    content = payload.get('content')
+    form = TodoForm(formdata=None, data={'content': content if isinstance(content, str) else None}, meta={'csrf': False})
+    if not form.validate():
+        return None, ' '.join(error for errors in form.errors.values() for error in errors)
+    return form.content.data, None
+
+def api_get_todo(todo_id):
+    """현재 사용자의 할 일을 조회합니다."""
+    return Todo.query.filter_by(id=todo_id, user_id=current_user.id).first()
+
+@app.route('/api/v1/todos', methods=['GET'])
+@api_login_required
+def api_list_todos():
+    filter_type = request.args.get('filter', 'all')
+    per_page = min(max(request.args.get('per_page', DEFAULT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    cursor = request.args.get('cursor')
+
+    search = request.args.get('q', '').strip()[:SEARCH_MAX_LENGTH] or None
+
+    def build(stats):
+        todos, prev_cursor, next_cursor = keyset_page(current_user.id, filter_type, per_page, cursor, search)
+        return {
+            'todos': [todo_to_dict(todo) for todo in todos],
+            'prev_cursor': prev_cursor,
+            'next_cursor': next_cursor,
+            'stats': {'total': stats.total + stats.archived, 'completed': stats.completed + stats.archived,
+                      'pending': stats.pending, 'archived': stats.archived},
+            'version': stats.version,
+        }
+    return api_conditional(build)
+
+@app.route('/api/v1/todos/search', methods=['GET'])
+@api_login_required
+def api_search_todos():
+    if not request.args.get('q', '').strip():
+        return api_error('검색어(q)가 필요합니다.', 400)
+    return api_list_todos()
+
+@app.route('/api/v1/todos', methods=['POST'])
+@api_login_required
+def api_create_todo():
+    payload = api_json_body()
+    if payload is None:
+        return api_error('JSON 객체 본문이 필요합니다.', 415)
+    content, error = api_validate_content(payload)
+    if error:
+        return api_error(error, 400)
+    try:
+        todo = Todo(content=content, user_id=current_user.id)
+        db.session.add(todo)
+        bump_user_stats(current_user.id, total=1)
+        db.session.commit()
+        logger.info("API 할 일 추가: ID %s (사용자: %s)", todo.id, current_user.username)
+        return jsonify(todo_to_dict(todo)), 201
+    except Exception as e:
+        db.session.rollback()
+        logger.error("API 할 일 추가 중 오류: %s", e)
+        return api_error('할 일 추가 중 오류가 발생했습니다.', 500)
+
+@app.route('/api/v1/todos/<int:todo_id>', methods=['GET'])
+@api_login_required
+def api_get_todo_detail(todo_id):
+    def build(stats):
+        todo = api_get_todo(todo_id)
+        if todo is None:
+            return api_error('할 일을 찾을 수 없습니다.', 404)
+        return todo_to_dict(todo)
+    return api_conditional(build)
+
+@app.route('/api/v1/todos/<int:todo_id>', methods=['PATCH'])
+@api_login_required
+def api_update_todo(todo_id):
+    payload = api_json_body()
+    if payload is None:
+        return api_error('JSON 객체 본문이 필요합니다.', 415)
+    if 'content' in payload:
+        content, error = api_validate_content(payload)
+        if error:
+            return api_error(error, 400)
+    expected = api_if_match_version(todo_id)
+    if expected is False:
+        return api_precondition_failed()
+    try:
+        if expected is not None and not claim_user_version(current_user.id, expected):
+            db.session.rollback()
+            return api_precondition_failed()
+        owned = (Todo.id == todo_id) & (Todo.user_id == current_user.id)
+        if 'content' in payload:
+            result = db.session.execute(
+                db.update(Todo).where(owned).values(content=content).execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
+                raise NotFound()
+        if 'completed' in payload:
+            set_todo_completed(current_user.id, todo_id, bool(payload['completed']))
+        bump_user_stats(current_user.id)
+        db.session.commit()
+        todo = api_get_todo(todo_id)
+        if todo is None:
+            raise NotFound()
+        logger.info("API 할 일 수정: ID %s (사용자: %s)", todo_id, current_user.username)
+        return jsonify(todo_to_dict(todo))
+    except NotFound:
+        db.session.rollback()
+        return api_error('할 일을 찾을 수 없습니다.', 404)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("API 할 일 수정 중 오류: %s", e)
+        return api_error('할 일 수정 중 오류가 발생했습니다.', 500)
+
+@app.route('/api/v1/todos/<int:todo_id>/complete', methods=['POST'])
+@api_login_required
+def api_complete_todo(todo_id):
+    if api_json_body() is None:
+        return api_error('JSON 객체 본문이 필요합니다.', 415)
+    expected = api_if_match_version(todo_id)
+    if expected is False:
+        return api_precondition_failed()
+    try:
+        if expected is not None and not claim_user_version(current_user.id, expected):
+            db.session.rollback()
+            return api_precondition_failed()
+        changed = set_todo_completed(current_user.id, todo_id, True)
+        db.session.commit()
+        if changed:
+            logger.info("API 할 일 완료: ID %s (사용자: %s)", todo_id, current_user.username)
+        todo = api_get_todo(todo_id)
+        if todo is None:
+            raise NotFound()
+        return jsonify(todo_to_dict(todo))
+    except NotFound:
+        db.session.rollback()
+        return api_error('할 일을 찾을 수 없습니다.', 404)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("API 할 일 완료 처리 중 오류: %s", e)
+        return api_error('할 일 완료 처리 중 오류가 발생했습니다.', 500)
+
+@app.route('/api/v1/todos/<int:todo_id>/uncomplete', methods=['POST'])
+@api_login_required
+def api_uncomplete_todo(todo_id):
+    if api_json_body() is None:
+        return api_error('JSON 객체 본문이 필요합니다.', 415)
+    expected = api_if_match_version(todo_id)
+    if expected is False:
+        return api_precondition_failed()
+    try:
+        if expected is not None and not claim_user_version(current_user.id, expected):
+            db.session.rollback()
+            return api_precondition_failed()
+        changed = set_todo_completed(current_user.id, todo_id, False)
+        db.session.commit()
+        if changed:
+            logger.info("API 할 일 미완료 변경: ID %s (사용자: %s)", todo_id, current_user.username)
+        todo = api_get_todo(todo_id)
+        if todo is None:
+            raise NotFound()
+        return jsonify(todo_to_dict(todo))
+    except NotFound:
+        db.session.rollback()
+        return api_error('할 일을 찾을 수 없습니다.', 404)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("API 할 일 미완료 변경 중 오류: %s", e)
+        return api_error('할 일 미완료 변경 중 오류가 발생했습니다.', 500)
+
+@app.route('/api/v1/todos/<int:todo_id>', methods=['DELETE'])
+@api_login_required
+def api_delete_todo(todo_id):
+    expected = api_if_match_version(todo_id)
+    if expected is False:
+        return api_precondition_failed()
+    try:
+        if expected is not None and not claim_user_version(current_user.id, expected):
+            db.session.rollback()
+            return api_precondition_failed()
+        delete_todo_row(current_user.id, todo_id)
+        db.session.commit()
+        logger.info("API 할 일 삭제: ID %s (사용자: %s)", todo_id, current_user.username)
+        return '', 204
+    except NotFound:
+        db.session.rollback()
+        return api_error('할 일을 찾을 수 없습니다.', 404)
+    except Exception as e:
+        db.session.rollback()
+        logger.error("API 할 일 삭제 중 오류: %s", e)
+        return api_error('할 일 삭제 중 오류가 발생했습니다.', 500)
+
+@app.route('/api/v1/todos/bulk', methods=['POST'])
+@api_login_required
+def api_bulk_todos():
+    payload = api_json_body()
+    if payload is None:
+        return api_error('JSON 객체 본문이 필요합니다.', 415)
+    action = payload.get('action')
+    if action not in ('add', 'complete', 'uncomplete', 'delete'):
+        return api_error('action은 add, complete, uncomplete, delete 중 하나여야 합니다.', 400)
+    items = payload.get('contents' if action == 'add' else 'ids')
+    if not isinstance(items, list) or len(items) > BULK_MAX_ITEMS:
+        return api_error(f'항목 목록은 최대 {BULK_MAX_ITEMS}개의 배열이어야 합니다.', 400)
+    if action == 'add':
+        contents = []
+        for content in items:
+            content, error = api_validate_content({'content': content})
+            if error:
+                return api_error(error, 400)
+            contents.append(content)
+        ids = None
+    else:
+        if not all(isinstance(todo_id, int) for todo_id in items):
+            return api_error('ids는 정수 배열이어야 합니다.', 400)
+        contents, ids = None, items
+    try:
+        count = apply_bulk_action(current_user.id, action, ids=ids, contents=contents)
+        db.session.commit()
+        logger.info("API 할 일 일괄 처리: %s %s개 (사용자: %s)", action, count, current_user.username)
+        return jsonify({'action': action, 'count': count})
+    except Exception as e:
+        db.session.rollback()
+        logger.error("API 할 일 일괄 처리 중 오류: %s", e)
+        return api_error('할 일 일괄 처리 중 오류가 발생했습니다.', 500)
+
+@app.route('/api/v1/todos/archived', methods=['GET'])
+@api_login_required
+def api_archived_todos():
+    per_page = min(max(request.args.get('per_page', DEFAULT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+    cursor = request.args.get('cursor')
+
+    def build(stats):
+        todos, prev_cursor, next_cursor = archived_page(current_user.id, per_page, cursor)
+        return {
+            # id는 보관하기 전 할 일의 id
+            'todos': [dict(todo_to_dict(todo), id=todo.todo_id,
+                           archived_at=todo.archived_at.isoformat() if todo.archived_at else None)
+                      for todo in todos],
+            'prev_cursor': prev_cursor,
+            'next_cursor': next_cursor,
+            'archived': stats.archived,
+            'version': stats.version,
+        }
+    return api_conditional(build)
+
+@app.route('/api/v1/todos/export', methods=['GET'])
+@api_login_required
+def api_export_todos():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in TRANSFER_MIMETYPES:
+        return api_error('format은 csv 또는 ndjson이어야 합니다.', 400)
+    return export_response(fmt)
+
+@app.route('/api/v1/todos/import', methods=['POST'])
+@api_login_required
+def api_import_todos():
+    # text/csv, application/x-ndjson 본문만 받아 다른 사이트의 폼 전송(CSRF)을 막음
+    fmt = import_format(mimetype=request.mimetype)
+    if fmt is None:
+        return api_error('Content-Type은 text/csv 또는 application/x-ndjson이어야 합니다.', 415)
+    # 요청 본문을 받는 대로 한 줄씩 읽어 처리
+    stream = io.BufferedReader(WSGIInputReader(request.stream), 64 * 1024)
+    return import_progress_response(parse_import_rows(stream, fmt))
+
+# 운영 지표 접근 제한: MYTODO_METRICS_TOKEN이 있으면 그 토큰을 Bearer로 보낸 요청만, 없으면 서버 자신(localhost)의 요청만 허용
+METRICS_TOKEN = os.getenv('MYTODO_METRICS_TOKEN') or None
+METRICS_LOCAL_ADDRESSES = {'127.0.0.1', '::1'}
+
+def metrics_access_required(view):
+    """/metrics 계열 엔드포인트용 접근 확인 데코레이터. 허용되지 않은 요청에는 401/403을 반환합니다."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if METRICS_TOKEN is not None:
+            scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+            if scheme.lower() != 'bearer' or not secrets.compare_digest(credentials.strip().encode(), METRICS_TOKEN.encode()):
+                return '인증이 필요합니다.', 401, {'WWW-Authenticate': 'Bearer'}
+        elif client_ip() not in METRICS_LOCAL_ADDRESSES:
+            return '이 서버에서만 조회할 수 있습니다. (MYTODO_METRICS_TOKEN을 설정하면 토큰으로 조회)', 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/metrics/user-cache')
+@metrics_access_required
+def user_cache_metrics_view():
+    """사용자 정보 캐시 적중률과 절약한 DB 조회 수를 반환합니다."""
+    with _user_cache_metrics_lock:
+        metrics = dict(user_cache_metrics)
+    saved = metrics['cache_hits'] + metrics['claims_hits']
+    loads = metrics['loads']
+    # 인증된 요청마다 load_user가 한 번 호출되므로 loads는 인증된 요청 수와 같음
+    metrics.update({
+        'hit_rate': round(saved / loads, 4) if loads else 0.0,
+        'queries_saved': saved,
+        'queries_saved_per_request': round(saved / loads, 4) if loads else 0.0,
+        'cache_size': len(user_cache),
+        'session_claims': USER_SESSION_CLAIMS,
+    })
+    return jsonify(metrics)
+
+@app.route('/metrics/login')
+@metrics_access_required
+def login_metrics_view():
+    """비밀번호 해시 작업자 풀과 로그인 시도 제한 상태를 반환합니다."""
+    metrics = password_hasher.stats()
+    metrics.update({
+        'queue_limit': PASSWORD_HASH_QUEUE,
+        'hash_method': PASSWORD_HASH_METHOD,
+        'rate_limited': login_limiter.rejected,
+        'rate_limit_keys': len(login_limiter),
+    })
+    return jsonify(metrics)
+
+@app.route('/metrics/replicas')
+@metrics_access_required
+def replica_metrics_view():
+    """이 프로세스의 복제본별 상태와 읽기 횟수를 반환합니다."""
+    return jsonify(replica_pool.stats())
+
+@app.route('/metrics/jobs')
+@metrics_access_required
+def job_metrics_view():
+    """이 프로세스의 백그라운드 작업 실행기 상태와 대기열의 상태별 작업 수를 반환합니다."""
+    metrics = job_runner.stats()
+    counts = dict(db.session.execute(db.select(Job.status, db.func.count()).group_by(Job.status)).all())
+    metrics['queue'] = {name: counts.get(name, 0) for name in JOB_STATUSES}
+    return jsonify(metrics)
+
+# 요청별 계측 (SQL 쿼리 수/시간, 템플릿 렌더링 시간, 가장 느린 쿼리)
+# 응답의 Server-Timing 헤더와 요청 로그로 내보내고, /metrics에서 라우트별로 집계해 Prometheus 텍스트 형식으로 제공합니다.
+INSTRUMENTATION_ENABLED = os.getenv('MYTODO_INSTRUMENTATION', '1') != '0'
+REQUEST_LOG = os.getenv('MYTODO_REQUEST_LOG', 'slow')  # all, slow, off
+SLOW_REQUEST_MS = float(os.getenv('MYTODO_SLOW_REQUEST_MS', 500))
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+class RequestMetrics:
+    """라우트별 요청 계측값을 누적합니다. (프로세스별)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}   # (route, method, status) -> 요청 수
+        self.routes = {}     # route -> 누적값과 히스토그램
+
+    def observe(self, route, method, status, duration, timing):
+        with self._lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    'duration_sum': 0.0,
+                    'duration_buckets': [0] * len(REQUEST_DURATION_BUCKETS),
+                    'queries_buckets': [0] * len(QUERY_COUNT_BUCKETS),
+                    'count': 0, 'queries': 0, 'db_seconds': 0.0, 'render_seconds': 0.0, 'slowest_query': 0.0,
+                }
+            stats['count'] += 1
+            stats['duration_sum'] += duration
+            stats['queries'] += timing['queries']
+            stats['db_seconds'] += timing['db']
+            stats['render_seconds'] += timing['render']
+            stats['slowest_query'] = max(stats['slowest_query'], timing['slowest'][0])
+            for i, bound in enumerate(REQUEST_DURATION_BUCKETS):
+                if duration <= bound:
+                    stats['duration_buckets'][i] += 1
+            for i, bound in enumerate(QUERY_COUNT_BUCKETS):
+                if timing['queries'] <= bound:
+                    stats['queries_buckets'][i] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.requests), {route: dict(stats, duration_buckets=list(stats['duration_buckets']),
+                                                     queries_buckets=list(stats['queries_buckets']))
+                                         for route, stats in self.routes.items()}
+
+request_metrics = RequestMetrics()
+
+def current_timing():
+    """현재 요청의 계측값. 요청 밖(백그라운드 작업 등)이거나 계측이 꺼져 있으면 None을 반환합니다."""
+    if not has_request_context():
+        return None
+    return g.get('_timing')
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_start'] = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop('query_start', time.perf_counter())
+    timing = current_timing()
+    if timing is None:
+        return
+    timing['queries'] += 1
+    timing['db'] += elapsed
+    if elapsed > timing['slowest'][0]:
+        timing['slowest'] = (elapsed, ' '.join(statement.split())[:200])
+
+@before_render_template.connect_via(app)
+def start_render_timer(sender, template, context, **extra):
+    timing = current_timing()
+    if timing is not None:
+        timing['render_start'].append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def record_render_time(sender, template, context, **extra):
+    timing = current_timing()
+    if timing is not None and timing['render_start']:
+        elapsed = time.perf_counter() - timing['render_start'].pop()
+        # 템플릿 안에서 다른 템플릿을 렌더링한 경우 바깥 시간만 더함
+        if not timing['render_start']:
+            timing['render'] += elapsed
+
+@request_started.connect_via(app)
+def start_request_timing(sender, **extra):
+    if INSTRUMENTATION_ENABLED:
+        g._timing = {'start': time.perf_counter(), 'queries': 0, 'db': 0.0, 'render': 0.0,
+                     'render_start': [], 'slowest': (0.0, None)}
+
+@request_finished.connect_via(app)
+def finish_request_timing(sender, response, **extra):
+    """Server-Timing 헤더를 붙이고, 요청 로그를 남기고, 라우트별 집계에 더합니다."""
+    timing = current_timing()
+    if timing is None:
+        return
+    duration = time.perf_counter() - timing['start']
+    response.headers['Server-Timing'] = (
+        f'db;dur={timing["db"] * 1000:.2f};desc="{timing["queries"]} queries", '
+        f'render;dur={timing["render"] * 1000:.2f}, total;dur={duration * 1000:.2f}'
+    )
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    request_metrics.observe(route, request.method, response.status_code, duration, timing)
+
+    slow = duration * 1000 >= SLOW_REQUEST_MS
+    if REQUEST_LOG == 'all' or (REQUEST_LOG == 'slow' and slow):
+        slowest_ms, slowest_sql = timing['slowest']
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            "요청 처리: %s %s %s %.1fms (SQL %s개 %.1fms, 렌더링 %.1fms, 가장 느린 쿼리 %.1fms: %s)",
+            request.method, request.path, response.status_code, duration * 1000, timing['queries'],
+            timing['db'] * 1000, timing['render'] * 1000, slowest_ms * 1000, slowest_sql or '-'
+        )
+
+def prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus_metrics():
+    """누적된 계측값을 Prometheus 텍스트 형식으로 만듭니다."""
+    requests_by_key, routes = request_metrics.snapshot()
+    lines = [
+        '# HELP mytodo_requests_total 처리한 HTTP 요청 수',
+        '# TYPE mytodo_requests_total counter',
+    ]
+    for (route, method, status), count in sorted(requests_by_key.items()):
+        lines.append(f'mytodo_requests_total{{route="{prometheus_label(route)}",method="{method}",status="{status}"}} {count}')
+
+    histograms = (
+        ('mytodo_request_duration_seconds', '요청 처리 시간(초)', REQUEST_DURATION_BUCKETS, 'duration_buckets', 'duration_sum'),
+        ('mytodo_request_db_queries', '요청당 SQL 쿼리 수', QUERY_COUNT_BUCKETS, 'queries_buckets', 'queries'),
     )
-else:
-    # 로컬 환경에서는 파일과 콘솔 모두 로깅
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('mytodo.log', encoding='utf-8')
-        ]
+    for name, help_text, bounds, buckets_key, sum_key in histograms:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for route, stats in sorted(routes.items()):
+            label = f'route="{prometheus_label(route)}"'
+            for bound, count in zip(bounds, stats[buckets_key]):
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {stats["count"]}')
+            lines.append(f'{name}_sum{{{label}}} {stats[sum_key]}')
+            lines.append(f'{name}_count{{{label}}} {stats["count"]}')
+
+    counters = (
+        ('mytodo_db_query_seconds_total', 'counter', 'SQL 실행 시간 합계(초)', 'db_seconds'),
+        ('mytodo_template_render_seconds_total', 'counter', '템플릿 렌더링 시간 합계(초)', 'render_seconds'),
+        ('mytodo_slowest_query_seconds', 'gauge', '가장 느렸던 SQL 실행 시간(초)', 'slowest_query'),
     )
-logger = logging.getLogger(__name__)
+    for name, kind, help_text, key in counters:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        for route, stats in sorted(routes.items()):
+            lines.append(f'{name}{{route="{prometheus_label(route)}"}} {stats[key]}')
+
+    with _user_cache_metrics_lock:
+        user_loads = dict(user_cache_metrics)
+    hasher = password_hasher.stats()
+    lines += [
+        '# HELP mytodo_user_loads_total 로그인 사용자 정보 조회 수 (출처별)',
+        '# TYPE mytodo_user_loads_total counter',
+    ]
+    for kind in ('cache_hits', 'claims_hits', 'db_queries'):
+        lines.append(f'mytodo_user_loads_total{{source="{kind}"}} {user_loads[kind]}')
+    lines += [
+        '# HELP mytodo_password_hash_rejected_total 대기열이 가득 차 거절한 비밀번호 해시 요청 수',
+        '# TYPE mytodo_password_hash_rejected_total counter',
+        f'mytodo_password_hash_rejected_total {hasher["rejected"]}',
+        '# HELP mytodo_login_rate_limited_total 시도 제한으로 거절한 로그인 수',
+        '# TYPE mytodo_login_rate_limited_total counter',
+        f'mytodo_login_rate_limited_total {login_limiter.rejected}',
+        '# HELP mytodo_event_stream_clients 실시간 업데이트 연결 수',
+        '# TYPE mytodo_event_stream_clients gauge',
+        f'mytodo_event_stream_clients {change_broker.subscriber_count()}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+@app.route('/metrics')
+@metrics_access_required
+def prometheus_metrics_view():
+    """요청 계측값을 Prometheus 텍스트 형식으로 반환합니다. (gunicorn 워커가 여러 개이면 워커별 값)"""
+    return render_prometheus_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+# 정적 파일 (Bootstrap, Font Awesome을 static/vendor에 포함하여 CDN 없이 제공)
+# build-assets 명령이 파일을 내용 해시 이름으로 복사하고 gzip/brotli 압축본을 미리 만들어 두면(빌드 스크립트가 실행)
+# 프로덕션 모드에서 /assets/ 경로로 1년 캐시와 함께 제공합니다. 빌드 결과가 없으면 원본 /static/ 경로를 사용합니다.
+ASSET_MAX_AGE = 31536000  # 내용이 바뀌면 파일 이름도 바뀌므로 오래 캐시해도 안전
+ASSET_COMPRESSIBLE = ('.css', '.js', '.svg', '.ttf', '.json', '.txt')  # woff2, 이미지는 이미 압축됨
+ASSET_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))  # 선호 순서
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+# HTML/JSON 응답 gzip 압축
+GZIP_RESPONSES = os.getenv('MYTODO_GZIP', '1') != '0'
+GZIP_MIN_SIZE = 500  # 이보다 작은 응답은 압축 이득이 없음
+GZIP_LEVEL = int(os.getenv('MYTODO_GZIP_LEVEL', 6))
+GZIP_MIMETYPES = {'text/html', 'application/json'}
+asset_manifest = {}
+
+def get_static_dir():
+    """원본 정적 파일 폴더 경로를 반환합니다."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+def get_built_assets_dir():
+    """빌드된 정적 파일 폴더 경로를 반환합니다. (빌드 시 build-assets 명령으로 생성)"""
+    base_dir = sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    return os.getenv('MYTODO_ASSETS_DIR', os.path.join(base_dir, 'static_dist'))
+
+def rewrite_css_urls(name, css, manifest):
+    """CSS 안의 상대 경로 url()을 manifest의 해시 이름으로 바꿉니다."""
+    base = posixpath.dirname(name)
+
+    def replace(match):
+        quote, url = match.groups()
+        path, suffix = re.match(r'([^?#]*)(.*)', url).groups()
+        if not path or path.startswith('/') or ':' in path:
+            return match.group(0)
+        hashed = manifest.get(posixpath.normpath(posixpath.join(base, path)))
+        if hashed is None:
+            return match.group(0)
+        return f'url({quote}{posixpath.relpath(hashed, base)}{suffix}{quote})'
+    return CSS_URL_PATTERN.sub(replace, css)
+
+def build_assets(source, target):
+    """source의 정적 파일을 내용 해시 이름으로 target에 복사하고 압축본과 manifest.json을 만듭니다. 파일 수를 반환합니다."""
+    import gzip
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        logger.warning("brotli 패키지가 없어 gzip 압축본만 만듭니다. (pip install brotli)")
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    names = []
+    for root, _, files in os.walk(source):
+        for filename in files:
+            names.append(os.path.relpath(os.path.join(root, filename), source).replace(os.sep, '/'))
+    # CSS가 참조하는 글꼴 등의 해시 이름이 먼저 정해지도록 CSS는 마지막에 처리
+    names.sort(key=lambda name: (name.endswith('.css'), name))
+    manifest = {}
+    for name in names:
+        with open(os.path.join(source, name), 'rb') as f:
+            data = f.read()
+        if name.endswith('.css'):
+            data = rewrite_css_urls(name, data.decode('utf-8'), manifest).encode('utf-8')
+        stem, extension = posixpath.splitext(name)
+        hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{extension}"
+        path = os.path.join(target, *hashed.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        variants = {'': data}
+        if extension in ASSET_COMPRESSIBLE:
+            variants['.gz'] = gzip.compress(data, 9, mtime=0)
+            if brotli is not None:
+                variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, content in variants.items():
+            # 압축해도 작아지지 않으면 압축본을 만들지 않음
+            if suffix and len(content) >= len(data):
+                continue
+            with open(path + suffix, 'wb') as f:
+                f.write(content)
+        manifest[name] = hashed
+    with open(os.path.join(target, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return len(manifest)
+
+def configure_assets(production=None):
+    """프로덕션 모드이고 빌드된 정적 파일이 있으면 해시 이름 URL을 사용하도록 manifest를 읽습니다."""
+    if production is None:
+        production = TEMPLATE_PRODUCTION
+    asset_manifest.clear()
+    if not production:
+        return
+    try:
+        with open(os.path.join(get_built_assets_dir(), 'manifest.json'), encoding='utf-8') as f:
+            asset_manifest.update(json.load(f))
+    except (OSError, ValueError):
+        return
+    logger.info("빌드된 정적 파일을 사용합니다: %s", get_built_assets_dir())
+
+@app.template_global()
+def asset_url(filename):
+    """정적 파일 URL. 빌드된 파일이 있으면 해시 이름(/assets/...), 없으면 원본(/static/...)을 반환합니다."""
+    hashed = asset_manifest.get(filename)
+    if hashed:
+        return url_for('built_asset', filename=hashed)
+    return url_for('static', filename=filename)
+
+@app.route('/assets/<path:filename>')
+def built_asset(filename):
+    """해시 이름의 정적 파일. 브라우저가 받을 수 있으면 미리 압축한 br/gzip 파일을 보냅니다."""
+    path = safe_join(get_built_assets_dir(), filename)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in ASSET_ENCODINGS:
+        if request.accept_encodings[name] > 0 and os.path.isfile(path + suffix):
+            path += suffix
+            encoding = name
+            break
+    response = send_file(path, mimetype=mimetype, max_age=ASSET_MAX_AGE, download_name=posixpath.basename(filename))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@app.after_request
+def compress_response(response):
+    """HTML/JSON 응답을 gzip으로 압축합니다. 스트리밍 응답과 파일 응답은 그대로 보냅니다.
+
+    페이지의 CSRF 토큰은 응답마다 다르게 가려지므로(MaskedCSRF) 검색어가 함께 담겨도 압축 크기로 알아낼 수 없습니다. (BREACH)
+    """
+    if not GZIP_RESPONSES or response.mimetype not in GZIP_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or request.accept_encodings['gzip'] <= 0):
+        return response
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+    import gzip
+    response.set_data(gzip.compress(data, GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+# 시작 준비 상태 (서버가 먼저 요청을 받고, 데이터베이스 준비는 백그라운드에서 진행)
+STARTUP_WAIT_TIMEOUT = float(os.getenv('MYTODO_STARTUP_WAIT_TIMEOUT', 30))
+startup_ready = threading.Event()
+startup_ready.set()
+startup_state = {'status': 'ready', 'duration_ms': None}
+
+@app.before_request
+def wait_for_startup():
+    """데이터베이스 준비가 끝날 때까지 요청을 기다리게 합니다. 실패하거나 시간이 지나면 503을 반환합니다."""
+    if startup_ready.is_set() and startup_state['status'] == 'ready':
+        return None
+    if request.endpoint in ('healthz', 'built_asset', 'static'):
+        return None
+    if startup_ready.wait(STARTUP_WAIT_TIMEOUT) and startup_state['status'] == 'ready':
+        return None
+    if startup_state['status'] == 'error':
+        message = '데이터베이스를 초기화하지 못했습니다. 서버 로그를 확인해주세요.'
+    else:
+        message = '서비스를 준비하는 중입니다. 잠시 후 다시 시도해주세요.'
+    if request.path.startswith('/api/'):
+        return api_error(message, 503)
+    return message, 503, {'Retry-After': '1'}
+
+@app.route('/healthz')
+def healthz():
+    """준비 상태 확인용 엔드포인트. 시작 작업이 끝나고 DB에 연결되면 200, 아니면 503을 반환합니다."""
+    payload = {'status': startup_state['status']}
+    if startup_state['duration_ms'] is not None:
+        payload['startup_ms'] = startup_state['duration_ms']
+    if startup_state['status'] == 'ready':
+        if check_database_connection():
+            return jsonify(payload)
+        payload['status'] = 'unavailable'
+    return jsonify(payload), 503
+
+def find_available_port(start_port=5002, max_attempts=10):
+    """사용 가능한 포트를 찾습니다."""
+    import socket
+    
+    for port in range(start_port, start_port + max_attempts):
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.bind(('127.0.0.1', port))
+                return port
+        except OSError:
+            continue
+    return None
+
+def get_local_ip():
+    """현재 시스템의 로컬 IP 주소를 반환합니다. (DNS 조회 없이 라우팅 정보만 사용)"""
+    import socket
+    try:
+        # UDP connect는 패킷을 보내지 않고 나갈 인터페이스만 정하므로 오프라인에서도 바로 끝남
+        # (gethostbyname(gethostname())은 DNS 설정에 따라 수 초간 멈출 수 있어 사용하지 않음)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+
+def announce_network_address(port, timeout=30):
+    """서버가 포트를 연 뒤 백그라운드에서 로컬 IP를 찾아 네트워크 주소를 안내합니다. (시작 경로를 늦추지 않음)"""
+    def run():
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    return
+                time.sleep(0.05)
+        local_ip = get_local_ip()
+        if local_ip != '127.0.0.1':
+            print(f"네트워크: http://{local_ip}:{port}")
+    threading.Thread(target=run, name='mytodo-announce', daemon=True).start()
+
+def check_database_connection():
+    """데이터베이스 연결 상태를 확인합니다."""
+    try:
+        # 간단한 쿼리로 연결 테스트
+        db.session.execute(text('SELECT 1'))
+        db.session.commit()
+        return True
+    except Exception as e:
+        logger.error("데이터베이스 연결 확인 실패: %s", e)
+        return False
+
+def migrate_database():
+    """테이블을 생성하고, 기존 데이터베이스에 없는 인덱스를 추가합니다."""
+    # create_all()은 이미 존재하는 테이블을 변경하지 않으므로 컬럼과 인덱스는 별도로 확인하여 추가
+    db.create_all()
+    inspector = db.inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = (f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} "
+                       f"{column.type.compile(dialect=db.engine.dialect)}")
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+                logger.info("컬럼 추가: %s.%s", table.name, column.name)
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    setup_search_index()
+
+def explain_dashboard_queries(user_id=1):
+    """대시보드 목록 쿼리의 실행 계획을 (필터, 계획, 인덱스 사용 여부) 목록으로 반환합니다."""
+    dialect = db.engine.dialect
+    index_names = [index.name for index in Todo.__table__.indexes]
+    results = []
+    with db.engine.connect() as conn:
+        if dialect.name == 'postgresql':
+            # 데이터가 적으면 순차 스캔이 선택되므로, 인덱스 사용 가능 여부만 확인
+            conn.execute(text('SET enable_seqscan = off'))
+            explain = 'EXPLAIN '
+        else:
+            explain = 'EXPLAIN QUERY PLAN '
+        for filter_type in ('all', 'pending', 'completed'):
+            query = todo_list_query(user_id, filter_type).limit(10)
+            sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+            rows = conn.execute(text(explain + sql)).fetchall()
+            plan = '\n'.join(str(row[-1]) for row in rows)
+            uses_index = any(name in plan for name in index_names)
+            results.append((filter_type, plan, uses_index))
+        conn.rollback()
+    return results
+
+@app.cli.command('migrate-db')
+def migrate_db_command():
+    """기존 데이터베이스에 테이블과 인덱스를 적용합니다."""
+    migrate_database()
+    print("데이터베이스 마이그레이션이 완료되었습니다.")
+
+@app.cli.command('explain-dashboard')
+def explain_dashboard_command():
+    """대시보드 쿼리가 복합 인덱스를 사용하는지 EXPLAIN으로 확인합니다."""
+    migrate_database()
+    ok = True
+    for filter_type, plan, uses_index in explain_dashboard_queries():
+        print(f"[{filter_type}] {'인덱스 사용' if uses_index else '인덱스 미사용'}")
+        print(plan)
+        ok = ok and uses_index
+    if not ok:
+        sys.exit(1)
+
+@app.cli.command('rotate-secret-key')
+def rotate_secret_key_command():
+    """세션 서명 키를 교체합니다. 기존 키는 이전 키로 보관되어 발급된 세션이 유지됩니다."""
+    if os.getenv('SECRET_KEY'):
+        print("SECRET_KEY 환경 변수를 사용 중입니다. 새 키를 SECRET_KEY에, 기존 키를 SECRET_KEY_FALLBACKS에 설정하세요.")
+        sys.exit(1)
+    rotate_secret_key()
+    print(f"서명 키를 교체했습니다: {get_secret_key_path()} (서버를 재시작하면 적용됩니다)")
+
+@app.cli.command('compile-templates')
+@click.argument('target', required=False)
+def compile_templates_command(target):
+    """템플릿을 파이썬 모듈로 미리 컴파일합니다. (빌드 스크립트에서 사용)"""
+    target = target or get_compiled_templates_dir()
+    count = compile_templates(target)
+    print(f"{count}개의 템플릿을 컴파일했습니다: {target}")
+
+@app.cli.command('build-assets')
+@click.argument('target', required=False)
+def build_assets_command(target):
+    """정적 파일을 해시 이름과 gzip/brotli 압축본으로 빌드합니다. (빌드 스크립트에서 사용)"""
+    target = target or get_built_assets_dir()
+    count = build_assets(get_static_dir(), target)
+    print(f"{count}개의 정적 파일을 빌드했습니다: {target}")
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """모든 사용자의 통계 캐시를 Todo 테이블 기준으로 다시 계산합니다."""
+    migrate_database()
+    user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+    for user_id in user_ids:
+        rebuild_user_stats(user_id)
+    db.session.commit()
+    print(f"{len(user_ids)}명의 사용자 통계를 다시 계산했습니다.")
+
+@app.cli.command('archive-todos')
+@click.option('--days', type=int, default=None, help="완료된 지 이 일수가 지난 할 일을 보관 (기본: MYTODO_ARCHIVE_AFTER_DAYS)")
+def archive_todos_command(days):
+    """완료된 지 오래된 할 일을 지금 보관 테이블로 옮깁니다."""
+    migrate_database()
+    if days is None:
+        if ARCHIVE_AFTER_DAYS <= 0:
+            print("자동 보관이 꺼져 있습니다. --days로 기간을 지정하세요.")
+            sys.exit(1)
+        days = ARCHIVE_AFTER_DAYS
+    count = archive_old_todos(days)
+    print(f"완료된 지 {days}일이 지난 할 일 {count}개를 보관했습니다.")
+
+@app.cli.command('jobs')
+@click.option('--status', type=click.Choice(JOB_STATUSES), default=None, help="이 상태의 작업만 표시")
+@click.option('--limit', type=int, default=20, help="표시할 최근 작업 수")
+def jobs_command(status, limit):
+    """백그라운드 작업 대기열의 상태별 개수와 최근 작업을 표시합니다."""
+    migrate_database()
+    counts = dict(db.session.execute(db.select(Job.status, db.func.count()).group_by(Job.status)).all())
+    print(', '.join(f"{name} {counts.get(name, 0)}" for name in JOB_STATUSES))
+    query = db.select(Job).order_by(Job.id.desc()).limit(limit)
+    if status:
+        query = query.where(Job.status == status)
+    for job in db.session.scalars(query):
+        line = f"#{job.id} {job.name} [{job.status}] 시도 {job.attempts}/{job.max_attempts} 실행 시각 {job.run_at:%Y-%m-%d %H:%M:%S}"
+        if job.last_error:
+            line += f" - {job.last_error}"
+        print(line)
+
+@app.cli.command('drain-jobs')
+@click.option('--all', 'include_delayed', is_flag=True, help="재시도 대기 중인 작업도 지금 실행")
+def drain_jobs_command(include_delayed):
+    """대기 중인 백그라운드 작업을 지금 모두 실행합니다."""
+    migrate_database()
+    counts = drain_jobs(include_delayed)
+    print(f"작업 {sum(counts.values())}개 실행: 완료 {counts.get('done', 0)}, "
+          f"재시도 대기 {counts.get('queued', 0)}, 실패 {counts.get('failed', 0)}")
+
+def get_compiled_templates_dir():
+    """미리 컴파일된 템플릿 폴더 경로를 반환합니다. (빌드 시 compile-templates 명령으로 생성)"""
+    base_dir = sys._MEIPASS if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    return os.getenv('MYTODO_COMPILED_TEMPLATES', os.path.join(base_dir, 'compiled_templates'))
+
+def compile_templates(target):
+    """templates/*.html을 파이썬 모듈로 컴파일하여 target 폴더에 저장합니다. 컴파일한 템플릿 수를 반환합니다."""
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.makedirs(target)
+    names = app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    app.jinja_env.compile_templates(target, zip=None, ignore_errors=False,
+                                    filter_func=lambda name: name.endswith('.html'))
+    return len(names)
+
+def configure_templates(production=None):
+    """템플릿 로딩 방식을 설정합니다. 프로덕션 모드에서는 auto_reload를 끄고 컴파일된 템플릿을 우선 사용합니다."""
+    if production is None:
+        production = TEMPLATE_PRODUCTION
+    app.jinja_env.auto_reload = not production
+    compiled_dir = get_compiled_templates_dir()
+    if production and os.path.isdir(compiled_dir) and not isinstance(app.jinja_env.loader, ChoiceLoader):
+        # 컴파일된 모듈에 없는 템플릿은 기존 templates 폴더에서 읽음
+        app.jinja_env.loader = ChoiceLoader([ModuleLoader(compiled_dir), app.jinja_env.loader])
+        logger.info("컴파일된 템플릿을 사용합니다: %s", compiled_dir)
+
+def prepare_database():
+    """테이블과 인덱스를 준비합니다. 마이그레이션 쿼리가 성공하면 연결 확인도 끝난 것으로 봅니다."""
+    started = time.perf_counter()
+    with app.app_context():
+        migrate_database()
+    startup_state['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    startup_state['status'] = 'ready'
+    logger.info("데이터베이스 테이블과 인덱스가 준비되었습니다. (%.1f ms)", startup_state['duration_ms'])
+
+def start_database_setup():
+    """데이터베이스 준비를 백그라운드 스레드에서 시작합니다. 끝날 때까지 요청은 wait_for_startup에서 대기합니다."""
+    startup_ready.clear()
+    startup_state['status'] = 'starting'
+
+    def run():
+        try:
+            prepare_database()
+        except Exception as e:
+            startup_state['status'] = 'error'
+            logger.error("데이터베이스 초기화 중 오류: %s", e)
+            print(f"데이터베이스 초기화 중 오류가 발생했습니다: {e}")
+        finally:
+            startup_ready.set()
 
-# 한국 시간대 설정
-KST = timezone(timedelta(hours=9))
+    threading.Thread(target=run, name='mytodo-startup', daemon=True).start()
 
-# 데이터베이스 경로 설정
-def get_db_path():
-    """데이터베이스 경로를 반환합니다."""
-    # Railway나 다른 클라우드 환경에서는 DATABASE_URL 사용
-    database_url = os.getenv('DATABASE_URL')
-    if database_url:
-        # Railway PostgreSQL URL을 SQLAlchemy 형식으로 변환
-        if database_url.startswith('postgres://'):
-            database_url = database_url.replace('postgres://', 'postgresql://', 1)
-        return database_url
-    
-    # 로컬 환경에서는 SQLite 사용
+def create_app(production=None, background=False):
+    """실행 환경에 맞게 앱을 설정하고 데이터베이스를 준비한 뒤 반환합니다. (WSGI 서버용 애플리케이션 팩토리)
+
+    background=True이면 데이터베이스 준비를 기다리지 않고 바로 반환하여 서버가 먼저 포트를 열 수 있게 합니다.
+    """
+    # PyInstaller 호환성을 위한 템플릿 폴더 설정
     if getattr(sys, 'frozen', False):
-        # PyInstaller로 빌드된 경우
-        current_dir = os.path.dirname(sys.executable)
+        app.template_folder = os.path.join(sys._MEIPASS, 'templates')
+    configure_templates(production)
+    configure_assets(production)
+
+    if background:
+        start_database_setup()
     else:
-        # 일반 Python 실행의 경우
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    db_path = os.path.join(current_dir, "todo.db")
-    return f'sqlite:///{db_path}'
+        prepare_database()
+    return app
 
-# Flask 및 DB 설정
-app = Flask('MyTODO')
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', os.urandom(24))
-app.config['SQLALCHEMY_DATABASE_URI'] = get_db_path()
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+def default_worker_count():
+    """기본 워커 프로세스 수. 로컬 포터블 실행은 1, 서버 환경은 CPU 수 기준입니다."""
+    if os.getenv('RAILWAY_ENVIRONMENT'):
+        return min((os.cpu_count() or 1) * 2 + 1, 8)
+    return 1
 
-# 인코딩 설정
-app.config['JSON_AS_ASCII'] = False
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+def _sigterm_to_keyboard_interrupt():
+    """SIGTERM을 KeyboardInterrupt로 바꾸어 Ctrl+C와 같은 정상 종료 경로를 타게 합니다."""
+    import signal
 
-# Jinja2 템플릿 인코딩 설정
-app.jinja_env.default_encoding = 'utf-8'
-app.jinja_env.auto_reload = True
+    def handler(signum, frame):
+        raise KeyboardInterrupt
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, handler)
 
-db = SQLAlchemy(app)
+def default_events_port(port):
+    """변경 알림(SSE) 서버 포트. 지정하지 않으면 로컬은 웹 포트+1, Railway는 공개 포트가 하나뿐이라 끕니다. 0이면 끔.
 
-# KST 시간 포맷을 위한 Jinja 필터
-@app.template_filter('kst')
-def kst_filter(dt):
-    if dt is None:
-        return ''
-    
-    # DB에서 읽어온 시간이 timezone 정보가 없는 naive datetime일 경우 (주로 SQLite), UTC로 간주
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    
-    # KST로 변환하여 포맷팅
-    return dt.astimezone(KST).strftime('%Y-%m-%d %H:%M')
+    비동기 서빙 모드는 이 포트 대신 앱 포트의 /events를 사용합니다.
+    """
+    value = os.getenv('MYTODO_EVENTS_PORT')
+    if value is None:
+        return None if os.getenv('RAILWAY_ENVIRONMENT') else port + 1
+    return int(value) or None
 
+def serve(wsgi_app, host, port, workers=None, threads=None):
+    """프로덕션 WSGI 서버로 앱을 실행합니다.
 
-# Flask-Login 설정
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
-login_manager.login_message = '이 페이지에 접근하려면 로그인이 필요합니다.'
-login_manager.login_message_category = 'info'
+    gunicorn(gthread, 멀티 프로세스 + 멀티 스레드)을 우선 사용하고, 설치되지 않았거나
+    Windows인 경우 waitress(멀티 스레드), 둘 다 없으면 Werkzeug 스레드 서버를 사용합니다.
+    """
+    workers = workers or int(os.getenv('MYTODO_WORKERS', default_worker_count()))
+    threads = threads or int(os.getenv('MYTODO_THREADS', 8))
+    keepalive = int(os.getenv('MYTODO_KEEPALIVE', 5))
+    graceful_timeout = int(os.getenv('MYTODO_GRACEFUL_TIMEOUT', 30))
+    events_port = default_events_port(port)
 
-# 사용자 모델
-class User(UserMixin, db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
-    
-    # 사용자의 할 일 목록
-    todos = db.relationship('Todo', backref='user', lazy=True, cascade='all, delete-orphan')
-    
-    def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
-    
-    def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
 
-# 할 일 모델
-class Todo(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    content = db.Column(db.Text, nullable=False)
-    completed = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
-    completed_at = db.Column(db.DateTime, nullable=True)
+    if BaseApplication is not None:
+        def pre_fork(server, worker):
+            # 소켓은 이미 열려 있으므로 연결은 대기열에 쌓이고, 워커는 DB 준비가 끝난 상태를 물려받음
+            startup_ready.wait()
 
+        def post_fork(server, worker):
+            # 포크 전에 만들어진 DB 연결을 워커가 공유하지 않도록 풀을 버림
+            with wsgi_app.app_context():
+                db.engine.dispose(close=False)
+            # 로그 리스너 스레드는 포크 후 자식 프로세스에 남지 않으므로 다시 시작
+            setup_logging()
+            # 변경 알림 서버는 워커마다 같은 포트로 열고, 다른 워커의 변경은 버전 조회로 받음
+            if events_port:
+                start_event_stream(host, events_port, reuse_port=workers > 1)
+            # 작업은 job 테이블에서 한 프로세스만 가져가므로 워커마다 실행기를 시작해도 됨
+            start_job_runner()
 
-class TodoForm(FlaskForm):
-    content = StringField('할 일', validators=[DataRequired(), Length(min=1, max=200)])
+        class GunicornApplication(BaseApplication):
+            def load_config(self):
+                options = {
+                    'bind': f'{host}:{port}',
+                    'workers': workers,
+                    'threads': threads,
+                    'worker_class': 'gthread',
+                    'keepalive': keepalive,
+                    'graceful_timeout': graceful_timeout,
+                    'timeout': int(os.getenv('MYTODO_WORKER_TIMEOUT', 60)),
+                    'pre_fork': pre_fork,
+                    'post_fork': post_fork,
+                }
+                for key, value in options.items():
+                    self.cfg.set(key, value)
 
-class LoginForm(FlaskForm):
-    username = StringField('사용자명', validators=[DataRequired(), Length(min=3, max=80)])
-    password = PasswordField('비밀번호', validators=[DataRequired()])
+            def load(self):
+                return wsgi_app
 
-class RegisterForm(FlaskForm):
-    username = StringField('사용자명', validators=[DataRequired(), Length(min=3, max=80)])
-    email = EmailField('이메일', validators=[DataRequired(), Email()])
-    password = PasswordField('비밀번호', validators=[DataRequired(), Length(min=6)])
-    confirm_password = PasswordField('비밀번호 확인', validators=[DataRequired(), EqualTo('password')])
+        logger.info("gunicorn 서버 시작: %s:%s (워커 %s, 스레드 %s)", host, port, workers, threads)
+        GunicornApplication().run()
+        return
 
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
+    _sigterm_to_keyboard_interrupt()
+    if events_port:
+        start_event_stream(host, events_port)
+    start_job_runner()
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        waitress_serve = None
 
-@app.route('/')
-def index():
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    return redirect(url_for('login'))
+    if waitress_serve is not None:
+        logger.info("waitress 서버 시작: %s:%s (스레드 %s)", host, port, threads)
+        waitress_serve(wsgi_app, host=host, port=port, threads=threads,
+                       channel_timeout=max(keepalive, 1) * 12, ident='MyTODO')
+        return
 
-# 메인 대시보드
-@app.route('/dashboard')
-@login_required
-def dashboard():
-    form = TodoForm()
-    filter_type = request.args.get('filter', 'all')
+    from werkzeug.serving import make_server
+    logger.info("Werkzeug 스레드 서버 시작: %s:%s", host, port)
+    server = make_server(host, port, wsgi_app, threaded=True)
     try:
-        # 페이징 파라미터
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-
-        # 통계: DB에서 직접 집계
-        total_todos = db.session.query(Todo).filter_by(user_id=current_user.id).count()
-        completed_todos = db.session.query(Todo).filter_by(user_id=current_user.id, completed=True).count()
-        pending_todos = total_todos - completed_todos
-
-        # 필터링: DB에서 직접 수행 + 페이징
-        query = Todo.query.filter_by(user_id=current_user.id)
-        if filter_type == 'completed':
-            query = query.filter_by(completed=True)
-        elif filter_type == 'pending':
-            query = query.filter_by(completed=False)
-        query = query.order_by(Todo.created_at.desc())
-
-        todos_pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-        todos = todos_pagination.items
-
-        return render_template(
-            'dashboard.html',
-            todos=todos,
-            form=form,
-            filter_type=filter_type,
-            total_todos=total_todos,
-            completed_todos=completed_todos,
-            pending_todos=pending_todos,
-            page=page,
-            per_page=per_page,
-            pages=todos_pagination.pages,
-            has_prev=todos_pagination.has_prev,
-            has_next=todos_pagination.has_next
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+# 비동기 서빙 모드 (ASGI)
+# 대시보드, 할 일 변경, 로그인 확인은 이벤트 루프에서 SQLAlchemy 비동기 엔진(aiosqlite/asyncpg)으로 처리하고
+# 나머지 요청은 기존 Flask 앱을 스레드 풀에서 실행합니다. 모델, 폼, 템플릿, 세션은 Flask 앱과 공유합니다.
+# 필요 패키지: pip install -r requirements-async.txt (uvicorn, a2wsgi, aiosqlite, asyncpg)
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+ASYNC_VIEWS = {}
+
+def get_async_db_uri(database_uri):
+    """동기 데이터베이스 URI를 비동기 드라이버 URI로 바꿉니다."""
+    url = make_url(database_uri)
+    url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+    if 'sslmode' in url.query:
+        # asyncpg는 psycopg2의 sslmode 대신 ssl 파라미터를 사용
+        url = url.difference_update_query(['sslmode']).update_query_dict({'ssl': url.query['sslmode']})
+    return url
+
+def create_async_db_engine(database_uri):
+    """Flask 앱과 같은 데이터베이스를 가리키는 비동기 엔진을 만듭니다. 풀/PRAGMA 설정도 같게 적용합니다."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    engine = create_async_engine(get_async_db_uri(database_uri), **get_engine_options(database_uri))
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine.sync_engine, 'connect',
+                     lambda dbapi_connection, connection_record: execute_sqlite_pragmas(dbapi_connection))
+    return engine
+
+def async_view(endpoint, methods=('GET',), login=True):
+    """비동기 서빙 모드에서 endpoint를 이벤트 루프에서 처리하도록 등록합니다. 뷰가 None을 반환하면 Flask 뷰가 처리합니다."""
+    def decorator(func):
+        ASYNC_VIEWS[endpoint] = (func, set(methods), login)
+        return func
+    return decorator
+
+@async_view('dashboard')
+async def dashboard_async(engine):
+    filter_type = request.args.get('filter', 'all')
+    search = request.args.get('q', '').strip()[:SEARCH_MAX_LENGTH]
+    if search:
+        # 검색은 검색 인덱스 선택(search_is_selective)이 동기 쿼리이므로 Flask 뷰에서 처리
+        return None
+    page, per_page, cursor = dashboard_paging_args()
+    user_id = current_user.id
+    async with engine.connect() as conn:
+        stats = (await conn.execute(
+            db.select(UserStats.total, UserStats.completed, UserStats.archived, UserStats.version)
+            .where(UserStats.user_id == user_id)
+        )).first()
+        if stats is None:
+            # 통계 행이 아직 없으면 Flask 뷰(get_user_stats)가 새로 집계
+            return None
+        filtered_total = dashboard_filtered_total(stats.total, stats.completed, filter_type)
+
+        async def render_list():
+            if use_keyset_pagination(filtered_total, cursor, search):
+                query, position = keyset_query(user_id, filter_type, per_page, cursor)
+                rows = (await conn.execute(query.statement)).all()
+                todos, prev_cursor, next_cursor = keyset_result(rows, position, per_page)
+                return render_dashboard_list(todos, filter_type, search, page, per_page, 'keyset',
+                                             has_prev=prev_cursor is not None, has_next=next_cursor is not None,
+                                             prev_cursor=prev_cursor, next_cursor=next_cursor)
+            # paginate(error_out=False)와 같은 규칙: 1보다 작은 페이지는 1페이지, 전체 개수는 통계 캐시 사용
+            offset = (max(page, 1) - 1) * per_page
+            statement = todo_list_query(user_id, filter_type).statement.limit(per_page).offset(offset)
+            todos = (await conn.execute(statement)).all()
+            pages = math.ceil(filtered_total / per_page) if filtered_total else 0
+            return render_dashboard_list(todos, filter_type, search, page, per_page, 'pages', pages=pages,
+                                         has_prev=max(page, 1) > 1, has_next=max(page, 1) < pages)
+
+        list_html = await cached_fragment_async(
+            ('list', user_id, stats.version, filter_type, page, per_page, cursor, search),
+            render_list
         )
-    except Exception as e:
-        logger.error(f"대시보드 조회 중 오류: {e}")
-        flash('대시보드 정보를 불러오는 중 오류가 발생했습니다.', 'error')
-        return render_template('dashboard.html', todos=[], form=form, filter_type=filter_type, total_todos=0, completed_todos=0, pending_todos=0, page=1, per_page=10, pages=1, has_prev=False, has_next=False)
+    return dashboard_response(TodoForm(), BulkTodoForm(), filter_type, search, stats.total, stats.completed,
+                              stats.version, list_html, stats.archived)
 
-# 할 일 관리
-@app.route('/add_todo', methods=['POST'])
-@login_required
-def add_todo():
+@async_view('add_todo', methods=('POST',))
+async def add_todo_async(engine):
     form = TodoForm()
     if form.validate_on_submit():
         try:
             content = form.content.data
-            todo = Todo(content=content, user_id=current_user.id)
-            db.session.add(todo)
-            db.session.commit()
+            async with engine.begin() as conn:
+                await conn.execute(db.insert(Todo).values(content=content, user_id=current_user.id))
+                await conn.execute(user_stats_update(current_user.id, total=1))
+            pin_primary_reads()
+            publish_change(current_user.id)
             flash('할 일이 추가되었습니다.', 'success')
-            logger.info(f"새 할 일 추가: {content[:50]}... (사용자: {current_user.username})")
+            logger.info("새 할 일 추가: %s... (사용자: %s)", content[:50], current_user.username)
         except Exception as e:
-            db.session.rollback()
-            logger.error(f"할 일 추가 중 오류: {e}")
+            logger.error("할 일 추가 중 오류: %s", e)
             flash('할 일 추가 중 오류가 발생했습니다.', 'error')
     else:
         for field, errors in form.errors.items():
             for error in errors:
                 flash(f'{error}', 'error')
-    
+
     return redirect(url_for('dashboard'))
 
-@app.route('/edit_todo/<int:todo_id>', methods=['GET', 'POST'])
-@login_required
-def edit_todo(todo_id):
-    todo = Todo.query.filter_by(id=todo_id, user_id=current_user.id).first_or_404()
+@async_view('edit_todo', methods=('GET', 'POST'))
+async def edit_todo_async(engine, todo_id):
+    owned = (Todo.id == todo_id) & (Todo.user_id == current_user.id)
+    async with engine.connect() as conn:
+        todo = (await conn.execute(db.select(Todo).where(owned))).first()
+    if todo is None:
+        return None  # Flask 뷰가 404 처리
     form = TodoForm(obj=todo)
     if form.validate_on_submit():
         try:
-            todo.content = form.content.data
-            db.session.commit()
+            async with engine.begin() as conn:
+                await conn.execute(db.update(Todo).where(owned).values(content=form.content.data))
+                await conn.execute(user_stats_update(current_user.id))
+            pin_primary_reads()
+            publish_change(current_user.id)
             flash('할 일이 수정되었습니다.', 'success')
-            logger.info(f"할 일 수정: ID {todo_id}, 내용: {todo.content[:50]}... (사용자: {current_user.username})")
+            logger.info("할 일 수정: ID %s, 내용: %s... (사용자: %s)", todo_id, form.content.data[:50], current_user.username)
             return redirect(url_for('dashboard'))
         except Exception as e:
-            db.session.rollback()
-            logger.error(f"할 일 수정 중 오류: {e}")
+            logger.error("할 일 수정 중 오류: %s", e)
             flash('할 일 수정 중 오류가 발생했습니다.', 'error')
-    
+
     for field, errors in form.errors.items():
         for error in errors:
             flash(f'{error}', 'error')
     return render_template('edit_todo.html', todo=todo, form=form)
 
-@app.route('/complete_todo/<int:todo_id>')
-@login_required
-def complete_todo(todo_id):
+async def set_todo_completed_async(engine, todo_id, completed):
+    """할 일의 완료 상태를 바꾸고 통계를 갱신합니다. 할 일이 없으면 NotFound를 발생시킵니다."""
+    owned = (Todo.id == todo_id) & (Todo.user_id == current_user.id)
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            db.update(Todo).where(owned, Todo.completed == (not completed))
+            .values(completed=completed, completed_at=datetime.now(KST) if completed else None)
+        )
+        if result.rowcount:
+            await conn.execute(user_stats_update(current_user.id, completed=1 if completed else -1))
+        elif (await conn.execute(db.select(Todo.id).where(owned))).first() is None:
+            raise NotFound()
+    if result.rowcount:
+        pin_primary_reads()
+        publish_change(current_user.id)
+
+@async_view('complete_todo')
+async def complete_todo_async(engine, todo_id):
     try:
-        todo = Todo.query.filter_by(id=todo_id, user_id=current_user.id).first_or_404()
-        todo.completed = True
-        todo.completed_at = datetime.now(KST)
-        db.session.commit()
+        await set_todo_completed_async(engine, todo_id, True)
         flash('할 일이 완료되었습니다.', 'success')
-        logger.info(f"할 일 완료: ID {todo_id} (사용자: {current_user.username})")
-        return redirect(url_for('dashboard'))
+        logger.info("할 일 완료: ID %s (사용자: %s)", todo_id, current_user.username)
     except Exception as e:
-        db.session.rollback()
-        logger.error(f"할 일 완료 처리 중 오류: {e}")
+        logger.error("할 일 완료 처리 중 오류: %s", e)
         flash('할 일 완료 처리 중 오류가 발생했습니다.', 'error')
-        return redirect(url_for('dashboard'))
+    return redirect(url_for('dashboard'))
 
-@app.route('/uncomplete_todo/<int:todo_id>')
-@login_required
-def uncomplete_todo(todo_id):
+@async_view('uncomplete_todo')
+async def uncomplete_todo_async(engine, todo_id):
     try:
-        todo = Todo.query.filter_by(id=todo_id, user_id=current_user.id).first_or_404()
-        todo.completed = False
-        todo.completed_at = None
-        db.session.commit()
+        await set_todo_completed_async(engine, todo_id, False)
         flash('할 일이 미완료로 변경되었습니다.', 'success')
-        logger.info(f"할 일 미완료 변경: ID {todo_id} (사용자: {current_user.username})")
-        return redirect(url_for('dashboard'))
+        logger.info("할 일 미완료 변경: ID %s (사용자: %s)", todo_id, current_user.username)
     except Exception as e:
-        db.session.rollback()
-        logger.error(f"할 일 미완료 변경 중 오류: {e}")
+        logger.error("할 일 미완료 변경 중 오류: %s", e)
         flash('할 일 미완료 변경 중 오류가 발생했습니다.', 'error')
-        return redirect(url_for('dashboard'))
+    return redirect(url_for('dashboard'))
 
-@app.route('/delete_todo/<int:todo_id>')
-@login_required
-def delete_todo(todo_id):
+@async_view('delete_todo')
+async def delete_todo_async(engine, todo_id):
     try:
-        todo = Todo.query.filter_by(id=todo_id, user_id=current_user.id).first_or_404()
-        db.session.delete(todo)
-        db.session.commit()
+        owned = (Todo.id == todo_id) & (Todo.user_id == current_user.id)
+        async with engine.begin() as conn:
+            # DELETE ... RETURNING: 실제로 지운 요청만 통계를 줄임
+            todo = (await conn.execute(db.delete(Todo).where(owned).returning(Todo.completed))).first()
+            if todo is None:
+                raise NotFound()
+            await conn.execute(user_stats_update(current_user.id, total=-1, completed=-1 if todo.completed else 0))
+        pin_primary_reads()
+        publish_change(current_user.id)
         flash('할 일이 삭제되었습니다.', 'success')
-        logger.info(f"할 일 삭제: ID {todo_id} (사용자: {current_user.username})")
-        return redirect(url_for('dashboard'))
+        logger.info("할 일 삭제: ID %s (사용자: %s)", todo_id, current_user.username)
     except Exception as e:
-        db.session.rollback()
-        logger.error(f"할 일 삭제 중 오류: {e}")
+        logger.error("할 일 삭제 중 오류: %s", e)
         flash('할 일 삭제 중 오류가 발생했습니다.', 'error')
-        return redirect(url_for('dashboard'))
+    return redirect(url_for('dashboard'))
 
-# 인증 관련 라우트
-@app.route('/login', methods=['GET', 'POST'])
-def login():
+@async_view('login', methods=('POST',), login=False)
+async def login_async(engine):
     if current_user.is_authenticated:
         return redirect(url_for('dashboard'))
-    
+
     form = LoginForm()
     if form.validate_on_submit():
-        user = User.query.filter_by(username=form.username.data).first()
-        if user and user.check_password(form.password.data):
-            login_user(user)
+        limited = login_rate_limit_response(form)
+        if limited:
+            return limited
+        async with engine.connect() as conn:
+            user = (await conn.execute(
+                db.select(User.id, User.username, User.email, User.password_hash)
+                .where(User.username == form.username.data)
+            )).first()
+        # 비밀번호 해시 검증은 CPU를 오래 쓰므로 이벤트 루프 밖의 해시 작업자 풀에서 실행
+        valid, new_hash = False, None
+        if user:
+            try:
+                valid, new_hash = await password_hasher.verify_async(user.password_hash, form.password.data)
+            except PasswordHashBusy:
+                return password_busy_response('login.html', form)
+        record_login_result(form, valid)
+        if valid:
+            if new_hash:
+                async with engine.begin() as conn:
+                    await conn.execute(db.update(User).where(User.id == user.id).values(password_hash=new_hash))
+                user_cache.invalidate(user.id)
+                logger.info("비밀번호 해시 갱신: %s", user.username)
+            login_user(CachedUser.from_user(user))
             flash(f'환영합니다, {user.username}님!', 'success')
-            logger.info(f"사용자 로그인: {user.username}")
+            logger.info("사용자 로그인: %s", user.username)
             return redirect(url_for('dashboard'))
         else:
             flash('사용자명 또는 비밀번호가 올바르지 않습니다.', 'error')
-    
+
     return render_template('login.html', form=form)
 
-@app.route('/register', methods=['GET', 'POST'])
-def register():
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard'))
-    
-    form = RegisterForm()
-    if form.validate_on_submit():
-        # 사용자명 중복 확인
-        if User.query.filter_by(username=form.username.data).first():
-            flash('이미 사용 중인 사용자명입니다.', 'error')
-            return render_template('register.html', form=form)
-        
-        # 이메일 중복 확인
-        if User.query.filter_by(email=form.email.data).first():
-            flash('이미 사용 중인 이메일입니다.', 'error')
-            return render_template('register.html', form=form)
-        
+def asgi_scope_to_environ(scope, body=b''):
+    """ASGI HTTP scope를 Flask 요청 컨텍스트용 WSGI environ으로 바꿉니다."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': '',
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        value = value.decode('latin-1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'content-length':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+class AsyncTodoApp:
+    """비동기 서빙 모드의 ASGI 앱. ASYNC_VIEWS에 등록된 요청은 이벤트 루프에서, 나머지는 Flask 앱(스레드 풀)에서 처리합니다.
+
+    events이면 변경 알림(SSE)도 같은 포트의 /events에서 보내므로 공개 포트가 하나뿐인 환경에서도 실시간 업데이트를 쓸 수 있습니다.
+    """
+
+    def __init__(self, flask_app, threads=8, events=True):
+        global events_on_app_port
+        from a2wsgi import WSGIMiddleware
+        self.app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=threads)
+        self.engine = create_async_db_engine(flask_app.config['SQLALCHEMY_DATABASE_URI'])
+        self.events = events
+        self.event_clients = 0
+        if events:
+            events_on_app_port = True
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            await self.wsgi(scope, receive, send)
+            return
+        if self.events and scope['path'] == '/events' and scope['method'] == 'GET':
+            await self._events(scope, receive, send)
+            return
+
+        environ = asgi_scope_to_environ(scope)
         try:
-            user = User(username=form.username.data, email=form.email.data)
-            user.set_password(form.password.data)
-            db.session.add(user)
-            db.session.commit()
-            
-            login_user(user)
-            flash(f'회원가입이 완료되었습니다! 환영합니다, {user.username}님!', 'success')
-            logger.info(f"새 사용자 등록: {user.username} ({user.email})")
-            return redirect(url_for('dashboard'))
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"회원가입 중 오류: {e}")
-            flash('회원가입 중 오류가 발생했습니다.', 'error')
-    
-    return render_template('register.html', form=form)
+            endpoint, view_args = self.app.url_map.bind_to_environ(environ).match()
+        except Exception:
+            endpoint = None
+        view = ASYNC_VIEWS.get(endpoint)
+        if view is None or scope['method'] not in view[1]:
+            await self.wsgi(scope, receive, send)
+            return
 
-@app.route('/logout')
-@login_required
-def logout():
-    username = current_user.username
-    logout_user()
-    flash(f'{username}님, 로그아웃되었습니다.', 'info')
-    logger.info(f"사용자 로그아웃: {username}")
-    return redirect(url_for('login'))
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+        environ['wsgi.input'] = io.BytesIO(body)
 
-def find_available_port(start_port=5002, max_attempts=10):
-    """사용 가능한 포트를 찾습니다."""
-    import socket
-    
-    for port in range(start_port, start_port + max_attempts):
+        response = await self._dispatch(environ, view)
+        if response is None:
+            # 비동기 뷰가 처리하지 않는 경우: 읽은 본문을 다시 넘겨 Flask 뷰로 처리
+            replayed = False
+
+            async def replay_receive():
+                nonlocal replayed
+                if not replayed:
+                    replayed = True
+                    return {'type': 'http.request', 'body': body, 'more_body': False}
+                return await receive()
+            await self.wsgi(scope, replay_receive, send)
+            return
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in response.headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    async def _dispatch(self, environ, view):
+        """Flask 요청 컨텍스트 안에서 비동기 뷰를 실행하고 Response를 반환합니다. (세션 저장 포함)"""
+        func, methods, login = view
+        ctx = self.app.request_context(environ)
+        ctx.push()
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('127.0.0.1', port))
-                return port
-        except OSError:
-            continue
-    return None
+            # full_dispatch_request를 거치지 않으므로 요청 시그널(계측 등)을 직접 보냄
+            request_started.send(self.app)
+            try:
+                rv = self.app.preprocess_request()
+                if rv is None:
+                    g._login_user = await self._load_user() or self.app.login_manager.anonymous_user()
+                    if login and not current_user.is_authenticated:
+                        rv = self.app.login_manager.unauthorized()
+                    else:
+                        rv = await func(self.engine, **request.view_args)
+                        if rv is None:
+                            return None
+                response = self.app.make_response(rv)
+            except Exception as e:
+                logger.error("비동기 요청 처리 중 오류 (%s): %s", request.path, e)
+                response = self.app.make_response(('서버 오류가 발생했습니다.', 500))
+            response = self.app.process_response(response)
+            request_finished.send(self.app, response=response)
+            return response
+        finally:
+            ctx.pop()
 
-def get_local_ip():
-    """현재 시스템의 로컬 IP 주소를 반환합니다."""
-    import socket
-    try:
-        # 호스트 이름을 통해 IP 주소 가져오기
-        ip_address = socket.gethostbyname(socket.gethostname())
-        # 127.0.0.1이거나, gethostbyname이 실패한 경우
-        if ip_address == "127.0.0.1":
-            # 모든 네트워크 인터페이스를 확인하여 127.0.0.1이 아닌 IP 찾기
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80)) # 외부 서버에 연결 시도 (실제 데이터 전송 없음)
-            ip_address = s.getsockname()[0]
-            s.close()
-        return ip_address
-    except Exception:
-        return "127.0.0.1"
+    async def _events(self, scope, receive, send):
+        """변경 알림을 이벤트 루프에서 직접 보냅니다. (EventStreamServer와 같은 토큰/출처 확인과 stream_changes 사용)"""
+        query = urllib.parse.parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+        origin = headers.get('origin')
+        error, claims, expires_at = authorize_events_request(query.get('token', [''])[0], origin)
+        if error is None and self.event_clients >= EVENTS_MAX_CLIENTS:
+            error = '503 Service Unavailable'
+        if error is not None:
+            await send({'type': 'http.response.start', 'status': int(error.split(' ', 1)[0]),
+                        'headers': [(b'content-type', b'text/plain; charset=utf-8')]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
 
-def check_database_connection():
-    """데이터베이스 연결 상태를 확인합니다."""
-    try:
-        # 간단한 쿼리로 연결 테스트
-        db.session.execute(text('SELECT 1'))
-        db.session.commit()
-        return True
-    except Exception as e:
-        logger.error(f"데이터베이스 연결 확인 실패: {e}")
-        return False
+        response_headers = [(b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache')]
+        if origin:
+            response_headers += [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+        await send({'type': 'http.response.start', 'status': 200, 'headers': response_headers})
 
-if __name__ == '__main__':
-    # PyInstaller 호환성을 위한 템플릿 폴더 설정
-    if getattr(sys, 'frozen', False):
-        template_folder = os.path.join(sys._MEIPASS, 'templates')
-        app.template_folder = template_folder
-    
-    with app.app_context():
+        async def write(chunk):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+        async def cancel_on_disconnect(task):
+            # 클라이언트가 연결을 닫으면 다음 heartbeat를 기다리지 않고 바로 정리
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            task.cancel()
+
+        self.event_clients += 1
+        watcher = asyncio.create_task(cancel_on_disconnect(asyncio.current_task()))
         try:
-            db.create_all()
-            logger.info("데이터베이스 테이블이 생성되었습니다.")
-            
-            # 데이터베이스 연결 확인
-            if not check_database_connection():
-                raise Exception("데이터베이스 연결에 실패했습니다.")
-                
-        except Exception as e:
-            logger.error(f"데이터베이스 초기화 중 오류: {e}")
-            print(f"데이터베이스 초기화 중 오류가 발생했습니다: {e}")
+            await stream_changes(change_broker, claims, expires_at, write)
+            await send({'type': 'http.response.body', 'body': b''})
+        except asyncio.CancelledError:
+            pass
+        finally:
+            watcher.cancel()
+            self.event_clients -= 1
+
+    async def _load_user(self):
+        """세션의 사용자를 캐시에서 찾고, 없으면 비동기 엔진으로 조회합니다. (load_user의 비동기 버전)"""
+        user_id = session.get('_user_id')
+        if user_id is None:
+            return None
+        user_id = int(user_id)
+        user = find_loaded_user(user_id)
+        if user is None:
+            async with self.engine.connect() as conn:
+                row = (await conn.execute(
+                    db.select(User.id, User.username, User.email).where(User.id == user_id)
+                )).first()
+            user = remember_user(row)
+        return user
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+def create_asgi_app(production=None, threads=None):
+    """비동기 서빙 모드용 ASGI 앱 팩토리. (예: uvicorn --factory 'MyTODO:create_asgi_app')
+
+    데이터베이스 준비는 이벤트 루프를 막지 않도록 서버 시작 전에 끝냅니다.
+    """
+    flask_app = create_app(production)
+    return AsyncTodoApp(flask_app, threads=threads or int(os.getenv('MYTODO_THREADS', 8)),
+                        events=os.getenv('MYTODO_EVENTS_PORT') != '0')
+
+def serve_async(asgi_app, host, port):
+    """uvicorn(asyncio)으로 비동기 서빙 모드를 실행합니다. 워커 프로세스는 하나입니다. (변경 알림은 앱 포트에서 보냄)"""
+    import uvicorn
+    start_job_runner()
+    config = uvicorn.Config(asgi_app, host=host, port=port, lifespan='on', log_config=None,
+                            timeout_keep_alive=int(os.getenv('MYTODO_KEEPALIVE', 5)),
+                            timeout_graceful_shutdown=int(os.getenv('MYTODO_GRACEFUL_TIMEOUT', 30)))
+    logger.info("uvicorn 비동기 서버 시작: %s:%s", host, port)
+    uvicorn.Server(config).run()
+
+if __name__ == '__main__':
+    # 'serve' 인자: 비대화형 프로덕션 모드 (PORT 환경 변수 사용, 포트 검색/입력 대기 없음)
+    # 'serve-async' 인자: 같은 프로덕션 모드를 uvicorn 비동기 서빙 모드로 실행
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    use_async = command == 'serve-async'
+    production = command in ('serve', 'serve-async')
+
+    try:
+        if use_async:
+            try:
+                import uvicorn  # noqa: F401 (serve_async에서 사용, 서버 준비 전에 설치 여부 확인)
+                asgi_app = create_asgi_app(production=True)
+            except ImportError as e:
+                logger.error("비동기 서빙 모드에 필요한 패키지가 없습니다: %s", e.name or e)
+                print(f"비동기 서빙 모드에 필요한 패키지({e.name or e})가 설치되어 있지 않습니다.")
+                print("pip install -r requirements-async.txt 로 설치하거나 python MyTODO.py serve 로 실행해주세요.")
+                sys.exit(1)
+        else:
+            # 데이터베이스 준비는 백그라운드에서 진행하고 서버부터 시작
+            wsgi_app = create_app(production=True if production else None, background=True)
+    except Exception as e:
+        logger.error("앱 초기화 중 오류: %s", e)
+        print(f"앱 초기화 중 오류가 발생했습니다: {e}")
+        if not production:
             input("엔터를 눌러 종료합니다...")
-            sys.exit(1)
+        sys.exit(1)
     
     # 포트 설정 (Railway 환경 지원)
     port = int(os.getenv('PORT', 5002))
     
     # Railway 환경에서는 포트 검색 불필요
-    if not os.getenv('RAILWAY_ENVIRONMENT'):
+    if not production and not os.getenv('RAILWAY_ENVIRONMENT'):
         # 로컬 환경에서만 포트 검색
         port = find_available_port(5002)
         if port is None:
@@ -460,10 +4258,6 @@ if __name__ == '__main__':
             sys.exit(1)
     
     host = '0.0.0.0'
-    
-    # Railway 환경이 아닐 때만 로컬 IP 표시
-    if not os.getenv('RAILWAY_ENVIRONMENT'):
-        local_ip = get_local_ip()
 
     print("="*50)
     print("MyTODO 할 일 목록 애플리케이션")
@@ -474,19 +4268,24 @@ if __name__ == '__main__':
         print(f"Railway 환경에서 실행 중")
     else:
         print(f"로컬:   http://127.0.0.1:{port}")
-        if local_ip != '127.0.0.1':
-            print(f"네트워크: http://{local_ip}:{port}")
+        # 네트워크 주소는 서버가 포트를 연 뒤 표시 (로컬 IP 확인이 시작을 늦추지 않도록)
+        if not production:
+            announce_network_address(port)
     
     print("종료하려면 Ctrl+C를 누르세요")
     print("="*50)
     
     try:
-        logger.info(f"서버 시작: {host}:{port}")
-        app.run(debug=False, host=host, port=port, use_reloader=False)
+        logger.info("서버 시작: %s:%s", host, port)
+        if use_async:
+            serve_async(asgi_app, host, port)
+        else:
+            serve(wsgi_app, host, port)
     except KeyboardInterrupt:
         logger.info("사용자에 의해 서버가 종료되었습니다.")
         print("서버가 종료되었습니다.")
     except Exception as e:
-        logger.error(f"서버 실행 중 오류가 발생했습니다: {e}")
+        logger.error("서버 실행 중 오류가 발생했습니다: %s", e)
         print(f"서버 실행 중 오류가 발생했습니다: {e}")
-        input("엔터를 눌러 종료합니다...")
+        if not production:
+            input("엔터를 눌러 종료합니다...")
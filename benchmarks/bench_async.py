@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+MyTODO 비동기 서빙 모드 벤치마크
+로그인한 동시 연결 여러 개(기본 500개, keep-alive)가 대시보드를 계속 요청할 때의 처리량, 지연 시간, 오류 수를
+동기 서빙 모드(python MyTODO.py serve, 워커 1개)와 비동기 서빙 모드(python MyTODO.py serve-async)로 비교합니다.
+두 모드 모두 프로세스 하나로 실행하고, 조각 캐시는 꺼서 매 요청이 데이터베이스를 읽게 합니다.
+
+필요 패키지: pip install uvicorn a2wsgi aiosqlite
+사용법: python benchmarks/bench_async.py [-c 동시 연결 수] [-n 연결당 요청 수] [--todos 할 일 개수]
+"""
+
+import os
+import re
+import sys
+import time
+import json
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import urllib.parse
+import urllib.request
+import http.cookiejar
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERNAME = 'bench'
+PASSWORD = 'password'
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def free_port():
+    """비어 있는 로컬 포트를 반환합니다."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(todos):
+    """(별도 프로세스) 벤치마크용 사용자와 할 일을 만듭니다."""
+    sys.path.insert(0, ROOT)
+    import MyTODO
+
+    app = MyTODO.app
+    with app.app_context():
+        MyTODO.migrate_database()
+        user = MyTODO.User(username=USERNAME, email='bench@example.com')
+        user.set_password(PASSWORD)
+        MyTODO.db.session.add(user)
+        MyTODO.db.session.commit()
+        MyTODO.db.session.execute(MyTODO.db.insert(MyTODO.Todo), [
+            {'content': f'할 일 {i}', 'user_id': user.id, 'completed': i % 3 == 0} for i in range(todos)
+        ])
+        MyTODO.db.session.commit()
+        MyTODO.get_user_stats(user.id)
+
+
+def login(base_url, username=USERNAME, password=PASSWORD):
+    """로그인 폼을 제출하고 세션 쿠키 헤더 값을 반환합니다."""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    with opener.open(base_url + '/login') as response:
+        html = response.read().decode('utf-8')
+    token = re.search(r'name="csrf_token"[^>]*value="([^"]+)"', html)
+    data = {'username': username, 'password': password}
+    if token:
+        data['csrf_token'] = token.group(1)
+    with opener.open(base_url + '/login', urllib.parse.urlencode(data).encode()) as response:
+        if not response.geturl().endswith('/dashboard'):
+            raise RuntimeError("로그인에 실패했습니다")
+    return '; '.join(f'{cookie.name}={cookie.value}' for cookie in jar)
+
+
+async def client(port, cookie, requests, latencies, errors, path='/dashboard'):
+    """keep-alive 연결 하나로 path(기본 대시보드)를 반복 요청합니다."""
+    request = (f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nCookie: {cookie}\r\n\r\n').encode()
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        errors[0] += requests
+        return
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(request)
+            status = await reader.readline()
+            length = 0
+            chunked = False
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+                elif name.lower() == 'transfer-encoding' and 'chunked' in value.lower():
+                    chunked = True
+            if chunked:
+                while True:
+                    size = int((await reader.readline()).split(b';')[0], 16)
+                    await reader.readexactly(size + 2)
+                    if size == 0:
+                        break
+            else:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not status.startswith(b'HTTP/1.1 200'):
+                errors[0] += 1
+    except (OSError, asyncio.IncompleteReadError, ValueError):
+        errors[0] += 1
+    finally:
+        writer.close()
+
+
+async def load(port, cookie, connections, requests):
+    latencies = []
+    errors = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, cookie, requests, latencies, errors) for _ in range(connections)))
+    return latencies, errors[0], time.perf_counter() - start
+
+
+def run_mode(command, connections, requests, todos):
+    """서버를 띄우고 부하를 건 뒤 결과를 반환합니다. 매번 새 데이터베이스에서 시작합니다."""
+    data_dir = tempfile.mkdtemp()
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'DATABASE_URL': 'sqlite:///' + os.path.join(data_dir, 'bench.db'),
+        'MYTODO_SECRET_KEY_FILE': os.path.join(data_dir, 'secret_key'),
+        'MYTODO_LOG_FILE': os.path.join(data_dir, 'mytodo.log'),
+        'MYTODO_WORKERS': '1',
+        'MYTODO_EVENTS_PORT': '0',
+        'MYTODO_FRAGMENT_CACHE': 'off',
+    })
+    subprocess.run([sys.executable, os.path.abspath(__file__), '--seed', str(todos)],
+                   env=env, cwd=data_dir, check=True, capture_output=True)
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'MyTODO.py'), command], env=env, cwd=data_dir,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f'http://127.0.0.1:{port}'
+        deadline = time.time() + 60
+        while True:
+            try:
+                with urllib.request.urlopen(base_url + '/healthz', timeout=1) as response:
+                    response.read()
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    raise RuntimeError(f"{command} 서버가 시작되지 않았습니다")
+                time.sleep(0.1)
+        cookie = login(base_url)
+        latencies, errors, elapsed = asyncio.run(load(port, cookie, connections, requests))
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return {
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'errors': errors,
+    }
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--seed':
+        seed_database(int(sys.argv[2]))
+        return
+
+    parser = argparse.ArgumentParser(description="MyTODO 비동기 서빙 모드 벤치마크")
+    parser.add_argument('-c', '--connections', type=int, default=500, help="동시 연결 수")
+    parser.add_argument('-n', '--requests', type=int, default=10, help="연결당 요청 수")
+    parser.add_argument('--todos', type=int, default=200, help="미리 만들 할 일 개수")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    results = {}
+    if not args.json:
+        print("=" * 50)
+        print(f"MyTODO 서빙 모드 벤치마크 (동시 연결 {args.connections}, 연결당 요청 {args.requests})")
+        print("=" * 50)
+    for label, command in (('동기(serve)', 'serve'), ('비동기(serve-async)', 'serve-async')):
+        r = results[command] = run_mode(command, args.connections, args.requests, args.todos)
+        if not args.json:
+            print(f"{label:<18} {r['throughput']:>8.1f} req/s  p50 {r['p50_ms']:>7.1f} ms  "
+                  f"p99 {r['p99_ms']:>7.1f} ms  오류 {r['errors']}")
+    if args.json:
+        print(json.dumps(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+MyTODO 일괄 처리 벤치마크
+개별 라우트와 일괄 처리 엔드포인트의 항목당 커밋 수와 소요 시간을 비교합니다.
+
+사용법: python benchmarks/bench_bulk.py [항목 수]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+# 임시 SQLite DB를 사용하도록 MyTODO 임포트 전에 설정
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MyTODO  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+app = MyTODO.app
+db = MyTODO.db
+
+
+class CommitCounter:
+    """엔진 수준에서 커밋 횟수를 셉니다."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn):
+        self.count += 1
+
+
+def make_client(username):
+    """사용자를 등록하고 로그인된 테스트 클라이언트를 반환합니다."""
+    client = app.test_client()
+    client.post('/register', data={
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': 'password',
+        'confirm_password': 'password',
+    })
+    return client
+
+
+def user_todo_ids(username):
+    with app.app_context():
+        user = MyTODO.User.query.filter_by(username=username).one()
+        return [todo.id for todo in MyTODO.Todo.query.filter_by(user_id=user.id)]
+
+
+def measure(counter, label, items, func):
+    """func 실행 동안의 커밋 수와 시간을 측정하여 출력합니다."""
+    counter.count = 0
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} 커밋 {counter.count:>5}회  항목당 커밋 {counter.count / items:>7.4f}  "
+          f"{elapsed * 1000:>9.1f} ms")
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    logging.disable(logging.INFO)
+    app.config['WTF_CSRF_ENABLED'] = False
+
+    with app.app_context():
+        db.create_all()
+        counter = CommitCounter()
+        event.listen(db.engine, 'commit', counter)
+
+    single = make_client('single')
+    bulk = make_client('bulk')
+
+    print("=" * 50)
+    print(f"MyTODO 일괄 처리 벤치마크 (항목 {items}개)")
+    print("=" * 50)
+
+    measure(counter, '개별 추가 (/add_todo)', items,
+            lambda: [single.post('/add_todo', data={'content': f'할 일 {i}'}) for i in range(items)])
+    measure(counter, '일괄 추가 (API bulk add)', items,
+            lambda: bulk.post('/api/v1/todos/bulk', json={
+                'action': 'add', 'contents': [f'할 일 {i}' for i in range(items)]}))
+
+    single_ids = user_todo_ids('single')
+    bulk_ids = user_todo_ids('bulk')
+
+    measure(counter, '개별 완료 (/complete_todo)', items,
+            lambda: [single.get(f'/complete_todo/{todo_id}') for todo_id in single_ids])
+    measure(counter, '일괄 완료 (/bulk_todos)', items,
+            lambda: bulk.post('/bulk_todos', data={'action': 'complete', 'todo_ids': bulk_ids}))
+
+    measure(counter, '개별 삭제 (/delete_todo)', items,
+            lambda: [single.get(f'/delete_todo/{todo_id}') for todo_id in single_ids])
+    measure(counter, '일괄 삭제 (/bulk_todos)', items,
+            lambda: bulk.post('/bulk_todos', data={'action': 'delete', 'todo_ids': bulk_ids}))
+
+
+if __name__ == '__main__':
+    main()
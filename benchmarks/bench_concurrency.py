@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+MyTODO 동시성 벤치마크
+여러 스레드가 추가/완료/대시보드 요청을 섞어 보낼 때의 처리량, 지연 시간, 오류 수를
+데이터베이스 성능 프로필 적용 전(MYTODO_DB_PROFILE=0)과 후로 비교합니다.
+
+사용법: python benchmarks/bench_concurrency.py [스레드 수] [스레드당 요청 수]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import tempfile
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ErrorCounter(logging.Handler):
+    """앱이 기록한 ERROR 로그(예: database is locked)를 셉니다."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_worker(threads, requests_per_thread):
+    """현재 프로세스의 설정으로 부하를 실행하고 결과를 JSON으로 출력합니다."""
+    sys.path.insert(0, ROOT)
+    import MyTODO
+
+    app = MyTODO.app
+    app.config['WTF_CSRF_ENABLED'] = False
+    logging.disable(logging.WARNING)
+    errors = ErrorCounter()
+    MyTODO.logger.addHandler(errors)
+
+    with app.app_context():
+        MyTODO.migrate_database()
+
+    clients = []
+    for i in range(threads):
+        client = app.test_client()
+        client.post('/register', data={
+            'username': f'user{i}', 'email': f'user{i}@example.com',
+            'password': 'password', 'confirm_password': 'password',
+        })
+        client.post('/add_todo', data={'content': '준비용 할 일'})
+        clients.append(client)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def traffic(client, seed):
+        rng = random.Random(seed)
+        local = []
+        for _ in range(requests_per_thread):
+            roll = rng.random()
+            start = time.perf_counter()
+            if roll < 0.4:
+                client.get('/dashboard')
+            elif roll < 0.8:
+                client.post('/add_todo', data={'content': f'할 일 {rng.random()}'})
+            else:
+                todos = client.get('/api/v1/todos?filter=pending&per_page=1').get_json() or {}
+                for todo in todos.get('todos', []):
+                    client.get(f"/complete_todo/{todo['id']}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=traffic, args=(client, i)) for i, client in enumerate(clients)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'errors': errors.count,
+    }))
+
+
+def run_mode(profile, threads, requests_per_thread):
+    """별도 프로세스에서 한 가지 설정으로 벤치마크를 실행합니다."""
+    env = dict(os.environ)
+    env['MYTODO_DB_PROFILE'] = profile
+    env['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', str(threads), str(requests_per_thread)],
+        env=env, capture_output=True, text=True, cwd=tempfile.gettempdir()
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(result.returncode)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker(int(sys.argv[2]), int(sys.argv[3]))
+        return
+
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    requests_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print("=" * 50)
+    print(f"MyTODO 동시성 벤치마크 (스레드 {threads}, 스레드당 요청 {requests_per_thread})")
+    print("=" * 50)
+    for label, profile in (('기본 설정', '0'), ('성능 프로필', '1')):
+        r = run_mode(profile, threads, requests_per_thread)
+        print(f"{label:<8} {r['throughput']:>8.1f} req/s  p50 {r['p50_ms']:>7.1f} ms  "
+              f"p95 {r['p95_ms']:>7.1f} ms  p99 {r['p99_ms']:>7.1f} ms  오류 {r['errors']}")
+
+
+if __name__ == '__main__':
+    main()
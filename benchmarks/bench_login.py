@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+MyTODO 로그인 폭주 벤치마크
+여러 스레드가 틀린 비밀번호로 로그인을 계속 시도하는 동안 대시보드 요청의 지연 시간을
+해시 작업자 풀을 사실상 제한하지 않은 설정과 기본 설정(MYTODO_PASSWORD_HASH_WORKERS/QUEUE)으로 비교합니다.
+로그인 시도 제한은 끄고(한도를 크게) 해시 계산 부하만 측정합니다.
+
+사용법: python benchmarks/bench_login.py [로그인 스레드 수] [대시보드 스레드 수] [측정 시간(초)]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import threading
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run_worker(login_threads, dashboard_threads, seconds):
+    """현재 프로세스의 설정으로 부하를 실행하고 결과를 JSON으로 출력합니다."""
+    sys.path.insert(0, ROOT)
+    import MyTODO
+
+    app = MyTODO.app
+    app.config['WTF_CSRF_ENABLED'] = False
+    logging.disable(logging.WARNING)
+
+    with app.app_context():
+        MyTODO.migrate_database()
+
+    dashboard_clients = []
+    for i in range(dashboard_threads):
+        client = app.test_client()
+        client.post('/register', data={
+            'username': f'user{i}', 'email': f'user{i}@example.com',
+            'password': 'password', 'confirm_password': 'password',
+        })
+        for j in range(20):
+            client.post('/add_todo', data={'content': f'할 일 {j}'})
+        dashboard_clients.append(client)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies = []
+    login_status = {}
+
+    def dashboard(client):
+        local = []
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/dashboard')
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    def attacker(index):
+        client = app.test_client()
+        local = {}
+        while not stop.is_set():
+            response = client.post('/login', data={'username': 'user0', 'password': 'wrong-password'},
+                                   environ_base={'REMOTE_ADDR': f'10.0.{index}.1'})
+            local[response.status_code] = local.get(response.status_code, 0) + 1
+        with lock:
+            for status, count in local.items():
+                login_status[status] = login_status.get(status, 0) + count
+
+    workers = [threading.Thread(target=dashboard, args=(client,)) for client in dashboard_clients]
+    workers += [threading.Thread(target=attacker, args=(i,)) for i in range(login_threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    print(json.dumps({
+        'dashboard_requests': len(latencies),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'logins': {str(status): count for status, count in sorted(login_status.items())},
+    }))
+
+
+def run_mode(overrides, login_threads, dashboard_threads, seconds):
+    """별도 프로세스에서 한 가지 설정으로 벤치마크를 실행합니다."""
+    env = dict(os.environ)
+    env.update(overrides)
+    env.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'),
+        'MYTODO_LOGIN_IP_LIMIT': '1000000',
+        'MYTODO_LOGIN_USERNAME_LIMIT': '1000000',
+    })
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', str(login_threads), str(dashboard_threads), str(seconds)],
+        env=env, capture_output=True, text=True, cwd=tempfile.gettempdir()
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(result.returncode)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker(int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]))
+        return
+
+    login_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    dashboard_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    print("=" * 50)
+    print(f"MyTODO 로그인 폭주 벤치마크 (로그인 스레드 {login_threads}, 대시보드 스레드 {dashboard_threads}, {seconds:g}초)")
+    print("=" * 50)
+    modes = (
+        ('풀 제한 없음', {'MYTODO_PASSWORD_HASH_WORKERS': str(login_threads), 'MYTODO_PASSWORD_HASH_QUEUE': '0'}),
+        ('기본 설정', {}),
+    )
+    for label, overrides in modes:
+        r = run_mode(overrides, login_threads, dashboard_threads, seconds)
+        logins = ', '.join(f"{status}: {count}" for status, count in r['logins'].items())
+        print(f"{label:<8} 대시보드 {r['dashboard_requests']:>6}건  p50 {r['p50_ms']:>7.1f} ms  "
+              f"p99 {r['p99_ms']:>7.1f} ms  로그인 응답 {{{logins}}}")
+
+
+if __name__ == '__main__':
+    main()
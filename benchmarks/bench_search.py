@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+MyTODO 검색 벤치마크
+한 사용자에게 많은 할 일을 넣고 전문 검색 인덱스와 LIKE '%...%' 스캔의 검색 시간을 비교합니다.
+
+사용법: python benchmarks/bench_search.py [할 일 수]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+
+# 임시 SQLite DB를 사용하도록 MyTODO 임포트 전에 설정
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MyTODO  # noqa: E402
+
+app = MyTODO.app
+db = MyTODO.db
+
+WORDS = ['회의', '보고서', '장보기', '운동', '독서', '청소', '프로젝트', '발표', '메일', '병원',
+         'meeting', 'report', 'invoice', 'review', 'deploy', 'backup', 'call', 'plan']
+QUERIES = ['프로젝트', '보고서 작성', 'invoice', '회의를', '드물게나오는문구']
+
+
+def seed(user_id, count):
+    rng = random.Random(42)
+    rows = []
+    for i in range(count):
+        words = rng.sample(WORDS, 3)
+        rows.append({'user_id': user_id, 'content': f"{words[0]}를 {words[1]} 후 {words[2]} 하기 #{i}",
+                     'completed': False})
+    rows[count // 2]['content'] = '드물게나오는문구 확인하기'
+    for start in range(0, count, 10000):
+        db.session.execute(db.insert(MyTODO.Todo), rows[start:start + 10000])
+    db.session.commit()
+
+
+def time_search(user_id, search, per_page=10, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        todos, _, _ = MyTODO.keyset_page(user_id, 'all', per_page, None, search)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(todos)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    logging.disable(logging.INFO)
+
+    with app.app_context():
+        MyTODO.migrate_database()
+        user = MyTODO.User(username='bench', email='bench@example.com')
+        user.set_password('password')
+        db.session.add(user)
+        db.session.commit()
+        seed(user.id, count)
+
+        print("=" * 50)
+        print(f"MyTODO 검색 벤치마크 (사용자당 할 일 {count}개, 검색 방식: {MyTODO.get_search_backend()})")
+        print("=" * 50)
+        for search in QUERIES:
+            indexed, found = time_search(user.id, search)
+            MyTODO._search_backends[str(db.engine.url)] = 'like'
+            scanned, _ = time_search(user.id, search)
+            MyTODO._search_backends.clear()
+            print(f"{search:<16} 결과 {found:>3}개  인덱스 {indexed * 1000:>8.2f} ms  LIKE {scanned * 1000:>8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
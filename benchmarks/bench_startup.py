@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+MyTODO 시작 시간 벤치마크
+프로세스를 띄운 시점부터 로그인 페이지가 처음 응답할 때까지의 시간(time-to-first-response)을 측정합니다.
+- python: MyTODO.py를 현재 파이썬으로 실행
+- 빌드 결과물: build.py/build_mac.py --profile onefile|fast 로 만든 실행 파일
+
+오프라인 부팅 예산 확인 (--offline --budget-ms):
+DNS 조회는 10초 멈춘 뒤 실패하고 외부 연결은 즉시 실패하는 네트워크 없는 환경을 흉내 내고,
+포터블 실행과 같은 로컬 모드(포트 검색, 로컬 IP 표시 포함)로 띄워서
+중앙값이 예산을 넘으면 종료 코드 1로 끝납니다. (python 실행에만 적용, 빌드된 실행 파일은 제외)
+
+사용법: python benchmarks/bench_startup.py [-n 반복 횟수] [--offline] [--budget-ms ms] [이름=실행파일 ...]
+예시:   python benchmarks/bench_startup.py -n 5 onefile=MyTODO_Portable/MyTODO.exe fast=MyTODO_Portable_Fast/MyTODO.exe
+        python benchmarks/bench_startup.py --offline --budget-ms 3000
+"""
+
+import os
+import re
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+import urllib.error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMEOUT = 60
+
+# 네트워크 없는 환경 흉내 (sitecustomize로 자식 프로세스에 주입)
+OFFLINE_SITECUSTOMIZE = """
+import time, errno, socket
+
+def _hanging_lookup(*args, **kwargs):
+    time.sleep(10)
+    raise socket.gaierror(socket.EAI_AGAIN, 'offline')
+
+_connect = socket.socket.connect
+
+def _connect_local_only(self, address):
+    if self.family in (socket.AF_INET, socket.AF_INET6) and address[0] not in ('127.0.0.1', '::1', 'localhost'):
+        raise OSError(errno.ENETUNREACH, 'Network is unreachable')
+    return _connect(self, address)
+
+socket.gethostbyname = socket.gethostbyname_ex = socket.gethostbyaddr = _hanging_lookup
+socket.socket.connect = _connect_local_only
+"""
+
+
+def free_port():
+    """비어 있는 로컬 포트를 반환합니다."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure(command, offline_dir=None):
+    """명령을 실행하고 첫 응답까지 걸린 시간(초)을 반환합니다. 매번 빈 데이터 폴더에서 시작합니다."""
+    data_dir = tempfile.mkdtemp()
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'DATABASE_URL': 'sqlite:///' + os.path.join(data_dir, 'todo.db'),
+        'MYTODO_SECRET_KEY_FILE': os.path.join(data_dir, 'secret_key'),
+        'MYTODO_LOG_FILE': os.path.join(data_dir, 'mytodo.log'),
+        'MYTODO_WORKERS': '1',
+    })
+    start = time.perf_counter()
+    if offline_dir:
+        # 로컬 모드: 포트는 앱이 직접 찾으므로 시작 안내 문구에서 읽음
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [offline_dir, env.get('PYTHONPATH')]))
+        env['PYTHONUNBUFFERED'] = '1'
+        process = subprocess.Popen(command, env=env, cwd=data_dir, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8')
+    else:
+        process = subprocess.Popen(command + ['serve'], env=env, cwd=data_dir,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if offline_dir:
+            for line in process.stdout:
+                match = re.search(r'http://127\.0\.0\.1:(\d+)', line)
+                if match:
+                    port = int(match.group(1))
+                    break
+        url = f'http://127.0.0.1:{port}/login'
+        while time.perf_counter() - start < TIMEOUT:
+            if process.poll() is not None:
+                raise RuntimeError(f"프로세스가 종료되었습니다 (코드 {process.returncode})")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.01)
+        raise RuntimeError(f"{TIMEOUT}초 안에 응답이 없습니다")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyTODO 시작 시간 벤치마크")
+    parser.add_argument('-n', '--repeat', type=int, default=5, help="반복 횟수")
+    parser.add_argument('--offline', action='store_true', help="네트워크 없는 환경을 흉내 내어 측정")
+    parser.add_argument('--budget-ms', type=float, help="중앙값이 이 값을 넘으면 실패")
+    parser.add_argument('targets', nargs='*', metavar='이름=실행파일', help="빌드된 실행 파일")
+    args = parser.parse_args()
+
+    targets = [('python', [sys.executable, os.path.join(ROOT, 'MyTODO.py')])]
+    if not args.offline:
+        for arg in args.targets:
+            name, _, path = arg.partition('=')
+            targets.append((name, [os.path.abspath(path)]))
+
+    offline_dir = None
+    if args.offline:
+        offline_dir = tempfile.mkdtemp()
+        with open(os.path.join(offline_dir, 'sitecustomize.py'), 'w', encoding='utf-8') as f:
+            f.write(OFFLINE_SITECUSTOMIZE)
+
+    print("=" * 50)
+    mode = "오프라인, " if args.offline else ""
+    print(f"MyTODO 시작 시간 벤치마크 (첫 응답까지, {mode}{args.repeat}회 반복)")
+    print("=" * 50)
+    over_budget = False
+    for name, command in targets:
+        # 첫 실행은 디스크 캐시를 데우는 용도로 결과에서 제외
+        measure(command, offline_dir)
+        timings = [measure(command, offline_dir) for _ in range(args.repeat)]
+        median = statistics.median(timings) * 1000
+        line = f"{name:<12} 최소 {min(timings) * 1000:>8.1f} ms  중앙값 {median:>8.1f} ms"
+        if args.budget_ms is not None:
+            passed = median <= args.budget_ms
+            over_budget = over_budget or not passed
+            line += f"  예산 {args.budget_ms:.0f} ms {'통과' if passed else '초과'}"
+        print(line)
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+MyTODO 라우트별 벤치마크 모음
+사용자 여러 명(할 일 10^3~10^5개씩)의 데이터를 만든 뒤 실제 라우트를 두 가지 방법으로 측정합니다.
+- client: Flask 테스트 클라이언트로 라우트마다 순서대로 요청 (지연 시간, 요청당 SQL 쿼리 수)
+- http:   python MyTODO.py serve(또는 serve-async)를 띄우고 keep-alive 동시 연결로 부하 (처리량, 지연 시간)
+
+결과는 JSON 파일로 저장하며, --compare로 이전 결과와 비교해 p95 지연 시간/처리량이 임계값보다 나빠졌거나
+요청당 쿼리 수가 늘어난 라우트가 있으면 종료 코드 1로 끝납니다. (회귀 확인용)
+
+사용법: python benchmarks/bench_suite.py [--users 3] [--sizes 1000,10000,100000] [--output 결과.json]
+                                       [--compare 기준.json] [--threshold 0.2] [--database-url URL]
+예시:   python benchmarks/bench_suite.py --output base.json
+        python benchmarks/bench_suite.py --compare base.json --output new.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import urllib.request
+from datetime import datetime, timedelta
+
+from bench_async import ROOT, percentile, free_port, login, client
+
+PASSWORD = 'password'
+WORDS = ('회의', '보고서', '장보기', '운동', '독서', '청소', '예약', '결제', '메일', '전화',
+         '발표', '정리', '공부', '병원', '여행', '계획', '검토', '수리', '세탁', '산책')
+
+# 테스트 클라이언트로 측정할 라우트: (이름, 메서드, 경로). {id}는 사용자의 할 일 ID, {word}는 검색어
+CLIENT_ROUTES = (
+    ('GET /dashboard', 'GET', '/dashboard'),
+    ('GET /dashboard?filter=pending', 'GET', '/dashboard?filter=pending'),
+    ('GET /dashboard?page=5', 'GET', '/dashboard?page=5'),
+    ('GET /dashboard?q=', 'GET', '/dashboard?q={word}'),
+    ('GET /api/v1/todos', 'GET', '/api/v1/todos?per_page=50'),
+    ('GET /api/v1/todos/search', 'GET', '/api/v1/todos/search?q={word}'),
+    ('GET /edit_todo/<id>', 'GET', '/edit_todo/{id}'),
+    ('POST /add_todo', 'POST', '/add_todo'),
+    ('GET /complete_todo/<id>', 'GET', '/complete_todo/{id}'),
+    ('GET /uncomplete_todo/<id>', 'GET', '/uncomplete_todo/{id}'),
+)
+# HTTP 부하로 측정할 라우트
+HTTP_ROUTES = (
+    ('GET /dashboard', '/dashboard'),
+    ('GET /dashboard?filter=pending', '/dashboard?filter=pending'),
+    ('GET /api/v1/todos', '/api/v1/todos?per_page=50'),
+    ('GET /api/v1/todos/search', '/api/v1/todos/search?q=보고서'),
+)
+
+
+def summarize(latencies, elapsed=None, queries=None, errors=0):
+    """지연 시간 목록(초)을 결과 항목으로 요약합니다."""
+    result = {
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed if elapsed else len(latencies) / max(sum(latencies), 1e-9),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'errors': errors,
+    }
+    result['throughput'] = round(result['throughput'], 2)
+    if queries is not None:
+        result['queries_per_request'] = round(queries / len(latencies), 2) if latencies else 0.0
+    return result
+
+
+def seed_database(users, sizes, seed):
+    """(별도 프로세스) 사용자와 할 일을 만들고 사용자 목록을 JSON으로 출력합니다."""
+    sys.path.insert(0, ROOT)
+    import MyTODO
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(seed)
+    app = MyTODO.app
+    db = MyTODO.db
+    now = datetime.now(MyTODO.KST).replace(tzinfo=None)
+    # 모든 사용자가 같은 비밀번호를 쓰므로 해시는 한 번만 계산
+    password_hash = generate_password_hash(PASSWORD, MyTODO.PASSWORD_HASH_METHOD)
+    seeded = []
+    with app.app_context():
+        MyTODO.migrate_database()
+        for index in range(users):
+            size = sizes[index % len(sizes)]
+            user = MyTODO.User(username=f'bench{index}', email=f'bench{index}@example.com', password_hash=password_hash)
+            db.session.add(user)
+            db.session.commit()
+            rows = []
+            for i in range(size):
+                created_at = now - timedelta(minutes=size - i)
+                completed = rng.random() < 0.4
+                words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 6)))
+                rows.append({
+                    'user_id': user.id,
+                    'content': f'{words} #{i}',
+                    'completed': completed,
+                    'created_at': created_at,
+                    'completed_at': created_at + timedelta(hours=rng.randint(1, 72)) if completed else None,
+                })
+                if len(rows) == 5000:
+                    db.session.execute(db.insert(MyTODO.Todo), rows)
+                    rows = []
+            if rows:
+                db.session.execute(db.insert(MyTODO.Todo), rows)
+            MyTODO.rebuild_user_stats(user.id)
+            db.session.commit()
+            ids = [todo_id for (todo_id,) in db.session.query(MyTODO.Todo.id)
+                   .filter(MyTODO.Todo.user_id == user.id).order_by(MyTODO.Todo.id.desc()).limit(200)]
+            seeded.append({'username': user.username, 'size': size, 'ids': ids})
+    print(json.dumps(seeded))
+
+
+def run_client_phase(seeded, repeat):
+    """(별도 프로세스) 테스트 클라이언트로 라우트별 지연 시간과 요청당 쿼리 수를 측정해 JSON으로 출력합니다."""
+    sys.path.insert(0, ROOT)
+    import MyTODO
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    app = MyTODO.app
+    app.config['WTF_CSRF_ENABLED'] = False
+    logging.disable(logging.WARNING)
+    query_count = [0]
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        query_count[0] += 1
+
+    clients = []
+    for user in seeded:
+        test_client = app.test_client()
+        response = test_client.post('/login', data={'username': user['username'], 'password': PASSWORD})
+        if response.status_code != 302:
+            raise RuntimeError(f"{user['username']} 로그인에 실패했습니다")
+        clients.append((test_client, user))
+        # 첫 요청의 템플릿 로딩/연결 생성은 결과에서 제외
+        test_client.get('/dashboard')
+
+    rng = random.Random(0)
+    results = {}
+    for name, method, path in CLIENT_ROUTES:
+        latencies = []
+        queries = 0
+        errors = 0
+        for i in range(repeat):
+            test_client, user = clients[i % len(clients)]
+            url = path.format(id=user['ids'][i % len(user['ids'])], word=rng.choice(WORDS))
+            query_count[0] = 0
+            start = time.perf_counter()
+            if method == 'POST':
+                response = test_client.post(url, data={'content': f'벤치마크 {i}'})
+            else:
+                response = test_client.get(url)
+            latencies.append(time.perf_counter() - start)
+            queries += query_count[0]
+            if response.status_code >= 400:
+                errors += 1
+        results[name] = summarize(latencies, queries=queries, errors=errors)
+    print(json.dumps(results))
+
+
+async def http_load(port, cookies, path, connections, requests):
+    latencies = []
+    errors = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, cookies[i % len(cookies)], requests, latencies, errors, path)
+                           for i in range(connections)))
+    return latencies, errors[0], time.perf_counter() - start
+
+
+def run_http_phase(env, data_dir, seeded, command, connections, requests):
+    """서버를 띄우고 라우트별로 keep-alive 동시 연결 부하를 걸어 결과를 반환합니다."""
+    port = free_port()
+    env = dict(env, PORT=str(port))
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'MyTODO.py'), command], env=env, cwd=data_dir,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f'http://127.0.0.1:{port}'
+        deadline = time.time() + 60
+        while True:
+            try:
+                with urllib.request.urlopen(base_url + '/healthz', timeout=1) as response:
+                    response.read()
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    raise RuntimeError(f"{command} 서버가 시작되지 않았습니다")
+                time.sleep(0.1)
+        cookies = [login(base_url, user['username'], PASSWORD) for user in seeded]
+        results = {}
+        for name, path in HTTP_ROUTES:
+            latencies, errors, elapsed = asyncio.run(http_load(port, cookies, path, connections, requests))
+            results[name] = summarize(latencies, elapsed=elapsed, errors=errors)
+        return results
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def run_step(env, data_dir, *args):
+    """이 스크립트를 별도 프로세스로 실행하고 마지막 줄의 JSON을 반환합니다."""
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), *args],
+                            env=env, cwd=data_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(result.returncode)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """기준 결과와 비교해 회귀 목록을 반환합니다."""
+    regressions = []
+    for phase, routes in current['results'].items():
+        for name, now in routes.items():
+            before = baseline.get('results', {}).get(phase, {}).get(name)
+            if not before:
+                continue
+            if before['p95_ms'] and now['p95_ms'] > before['p95_ms'] * (1 + threshold):
+                regressions.append(f"[{phase}] {name}: p95 {before['p95_ms']:.1f} ms → {now['p95_ms']:.1f} ms")
+            if phase == 'http' and now['throughput'] < before['throughput'] * (1 - threshold):
+                regressions.append(f"[{phase}] {name}: 처리량 {before['throughput']:.1f} → {now['throughput']:.1f} req/s")
+            if now.get('queries_per_request', 0) > before.get('queries_per_request', 0):
+                regressions.append(f"[{phase}] {name}: 요청당 쿼리 {before.get('queries_per_request', 0)} → "
+                                   f"{now['queries_per_request']}")
+    return regressions
+
+
+def print_results(report):
+    for phase, routes in report['results'].items():
+        print(f"\n[{phase}]")
+        for name, r in routes.items():
+            line = (f"{name:<32} {r['throughput']:>8.1f} req/s  p50 {r['p50_ms']:>7.1f}  "
+                    f"p95 {r['p95_ms']:>7.1f}  p99 {r['p99_ms']:>7.1f} ms")
+            if 'queries_per_request' in r:
+                line += f"  쿼리 {r['queries_per_request']:>5.1f}/요청"
+            if r['errors']:
+                line += f"  오류 {r['errors']}"
+            print(line)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--seed':
+        seed_database(int(sys.argv[2]), [int(size) for size in sys.argv[3].split(',')], int(sys.argv[4]))
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == '--client-phase':
+        run_client_phase(json.loads(sys.argv[2]), int(sys.argv[3]))
+        return
+
+    parser = argparse.ArgumentParser(description="MyTODO 라우트별 벤치마크 모음")
+    parser.add_argument('--users', type=int, default=3, help="사용자 수")
+    parser.add_argument('--sizes', default='1000,10000,100000', help="사용자별 할 일 개수 (쉼표로 구분, 사용자에게 돌아가며 배정)")
+    parser.add_argument('--seed', type=int, default=42, help="데이터 생성용 난수 시드")
+    parser.add_argument('--repeat', type=int, default=200, help="client 단계의 라우트별 요청 수")
+    parser.add_argument('-c', '--connections', type=int, default=50, help="http 단계의 동시 연결 수")
+    parser.add_argument('-n', '--requests', type=int, default=20, help="http 단계의 연결당 요청 수")
+    parser.add_argument('--server', choices=('serve', 'serve-async'), default='serve', help="http 단계의 서빙 모드")
+    parser.add_argument('--phases', default='client,http', help="실행할 단계 (client, http)")
+    parser.add_argument('--database-url', help="데이터베이스 URL (기본: 임시 SQLite, PostgreSQL은 빈 데이터베이스 사용)")
+    parser.add_argument('--no-cache', action='store_true', help="대시보드 조각 캐시를 끄고 측정")
+    parser.add_argument('--output', help="결과 JSON 파일 경로")
+    parser.add_argument('--compare', help="비교할 기준 결과 JSON 파일")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀로 판단할 악화 비율 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    phases = [phase.strip() for phase in args.phases.split(',') if phase.strip()]
+    data_dir = tempfile.mkdtemp()
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': args.database_url or 'sqlite:///' + os.path.join(data_dir, 'bench.db'),
+        'MYTODO_SECRET_KEY_FILE': os.path.join(data_dir, 'secret_key'),
+        'MYTODO_LOG_FILE': os.path.join(data_dir, 'mytodo.log'),
+        'MYTODO_WORKERS': '1',
+        'MYTODO_EVENTS_PORT': '0',
+        # 같은 IP에서 여러 사용자로 로그인하므로 로그인 시도 제한은 끔
+        'MYTODO_LOGIN_IP_LIMIT': '1000000',
+    })
+    if args.no_cache:
+        env['MYTODO_FRAGMENT_CACHE'] = 'off'
+
+    print("=" * 50)
+    print(f"MyTODO 라우트별 벤치마크 (사용자 {args.users}명, 할 일 {args.sizes}개씩)")
+    print("=" * 50)
+    start = time.perf_counter()
+    seeded = run_step(env, data_dir, '--seed', str(args.users), args.sizes, str(args.seed))
+    print(f"데이터 생성: 할 일 {sum(user['size'] for user in seeded)}개, {time.perf_counter() - start:.1f}초")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'database': 'postgresql' if args.database_url and args.database_url.startswith('postgres') else 'sqlite',
+            'users': args.users,
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'connections': args.connections,
+            'requests_per_connection': args.requests,
+            'server': args.server,
+            'fragment_cache': not args.no_cache,
+        },
+        'results': {},
+    }
+    if 'client' in phases:
+        report['results']['client'] = run_step(env, data_dir, '--client-phase', json.dumps(seeded), str(args.repeat))
+    if 'http' in phases:
+        report['results']['http'] = run_http_phase(env, data_dir, seeded, args.server, args.connections, args.requests)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print(f"\n기준 결과({args.compare})와 비교 (임계값 {args.threshold:.0%})")
+        if regressions:
+            for line in regressions:
+                print(f"  회귀: {line}")
+            sys.exit(1)
+        print("  회귀 없음")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+MyTODO 템플릿 렌더링 벤치마크
+할 일 100개가 있는 dashboard.html 렌더링 시간을 템플릿 모드별로 비교합니다.
+- 개발 모드: templates 폴더, auto_reload 켬 (렌더링마다 파일 변경 확인)
+- 프로덕션 모드: templates 폴더, auto_reload 끔
+- 컴파일 모드: 미리 컴파일된 템플릿 모듈, auto_reload 끔
+
+사용법: python benchmarks/bench_templates.py [할 일 수] [반복 횟수]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_worker(mode, rows, repeat):
+    """한 가지 템플릿 모드로 렌더링 시간을 측정하여 (첫 렌더링 ms, 평균 ms)를 출력합니다."""
+    sys.path.insert(0, ROOT)
+    import MyTODO
+    from flask import render_template
+    from flask_login import login_user
+
+    logging.disable(logging.INFO)
+    app = MyTODO.app
+    app.config['WTF_CSRF_ENABLED'] = False
+    MyTODO.configure_templates(production=(mode != 'dev'))
+
+    now = datetime.now()
+    todos = [SimpleNamespace(id=i, content=f'할 일 {i} - 보고서 작성과 회의 준비', completed=i % 3 == 0,
+                             created_at=now - timedelta(minutes=i), completed_at=now if i % 3 == 0 else None)
+             for i in range(rows)]
+
+    def render():
+        list_html = MyTODO.Markup(render_template(
+            '_dashboard_list.html', todos=todos, filter_type='all', search='', page=1, per_page=rows,
+            pages=1, has_prev=False, has_next=False, pagination_mode='pages', prev_cursor=None, next_cursor=None))
+        stats_html = MyTODO.Markup(render_template(
+            '_dashboard_stats.html', total_todos=rows, completed_todos=rows // 3, pending_todos=rows - rows // 3))
+        return render_template('dashboard.html', form=MyTODO.TodoForm(), bulk_form=MyTODO.BulkTodoForm(),
+                               filter_type='all', search='', stats_html=stats_html, list_html=list_html)
+
+    with app.test_request_context('/dashboard'):
+        login_user(MyTODO.CachedUser(1, 'bench', 'bench@example.com'))
+        start = time.perf_counter()
+        render()
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        average = (time.perf_counter() - start) / repeat
+    print(f'{first * 1000:.3f} {average * 1000:.3f}')
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    compiled_dir = os.path.join(tempfile.mkdtemp(), 'compiled_templates')
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'MyTODO', 'compile-templates', compiled_dir],
+                   check=True, capture_output=True, cwd=ROOT)
+
+    print("=" * 50)
+    print(f"MyTODO 템플릿 렌더링 벤치마크 (할 일 {rows}개, {repeat}회 반복)")
+    print("=" * 50)
+    for label, mode in (('개발 (auto_reload)', 'dev'), ('프로덕션', 'production'), ('컴파일된 템플릿', 'compiled')):
+        env = dict(os.environ)
+        env['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+        env['MYTODO_COMPILED_TEMPLATES'] = compiled_dir if mode == 'compiled' else os.path.join(compiled_dir, 'none')
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', mode, str(rows), str(repeat)],
+                                env=env, capture_output=True, text=True, cwd=tempfile.gettempdir())
+        if result.returncode != 0:
+            print(result.stderr)
+            sys.exit(result.returncode)
+        first, average = result.stdout.split()
+        print(f"{label:<18} 첫 렌더링 {float(first):>8.2f} ms  평균 {float(average):>7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
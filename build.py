@@ -2,9 +2,12 @@
 """
 MyTODO 포터블 앱 빌드 스크립트
 Windows용 실행 파일 생성
+
+사용법: python build.py [--profile onefile|fast] [--startup-budget-ms ms]
 """
 
 import os
+import argparse
 import sys
 import shutil
 import subprocess
@@ -20,27 +23,98 @@ def check_pyinstaller():
         print("[!] 설치 명령어: pip install pyinstaller")
         return False
 
-def build_portable():
+def compile_templates(script_dir, compiled_path):
+    """템플릿을 파이썬 모듈로 미리 컴파일"""
+    print("[+] 템플릿을 컴파일합니다...")
+    cmd = [sys.executable, '-m', 'flask', '--app', 'MyTODO', 'compile-templates', compiled_path]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=script_dir)
+        print("[+] 템플릿 컴파일 완료")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"[-] 템플릿 컴파일 실패: {e}")
+        print(f"오류 출력: {e.stderr}")
+        return False
+
+def build_assets(script_dir, assets_path):
+    """정적 파일(Bootstrap, Font Awesome)을 해시 이름과 gzip/brotli 압축본으로 빌드"""
+    print("[+] 정적 파일을 빌드합니다...")
+    cmd = [sys.executable, '-m', 'flask', '--app', 'MyTODO', 'build-assets', assets_path]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=script_dir)
+        print("[+] 정적 파일 빌드 완료")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"[-] 정적 파일 빌드 실패: {e}")
+        print(f"오류 출력: {e.stderr}")
+        return False
+
+def check_startup_budget(script_dir, budget_ms):
+    """네트워크 없는 환경을 흉내 내어 첫 응답까지의 시간이 예산 안에 드는지 확인 (benchmarks/bench_startup.py)"""
+    print(f"[+] 오프라인 시작 시간을 확인합니다... (예산 {budget_ms:.0f} ms)")
+    cmd = [sys.executable, os.path.join('benchmarks', 'bench_startup.py'), '--offline', '-n', '3', '--budget-ms', str(budget_ms)]
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=script_dir)
+    print(result.stdout)
+    if result.returncode != 0:
+        print("[-] 시작 시간이 예산을 넘었거나 측정에 실패했습니다.")
+        if result.stderr:
+            print(f"오류 출력: {result.stderr}")
+        return False
+    print("[+] 시작 시간 확인 완료")
+    return True
+
+# 빌드 프로필
+# - onefile: 실행 파일 하나 (실행할 때마다 임시 폴더에 전체 압축을 풀어서 시작이 느림)
+# - fast: 폴더형(onedir) 배포, 필요한 모듈만 수집하여 압축 해제 없이 바로 시작
+BUILD_PROFILES = {
+    'onefile': [
+        '--onefile',                    # 단일 실행 파일
+        '--collect-all=jinja2',         # Jinja2 전체 수집
+        '--collect-all=flask',          # Flask 전체 수집
+    ],
+    'fast': [
+        '--onedir',                     # 폴더형 배포 (시작 시 압축 해제 없음)
+        '--noupx',                      # UPX 압축 해제 비용 제거
+        '--hidden-import=sqlalchemy.dialects.sqlite',  # 로컬 SQLite 드라이버
+        '--hidden-import=waitress',     # 로컬 WSGI 서버
+        '--exclude-module=psycopg2',    # 포터블 버전은 로컬 SQLite만 사용
+        '--exclude-module=gunicorn',    # Windows/로컬에서는 waitress 사용
+        '--exclude-module=redis',       # 조각 캐시는 메모리 백엔드 사용
+        '--exclude-module=tkinter',
+    ],
+}
+DEFAULT_PROFILE = 'onefile'
+
+def build_portable(profile=DEFAULT_PROFILE):
     """포터블 버전 빌드"""
-    print("[+] Windows용 포터블 빌드를 시작합니다...")
+    print(f"[+] Windows용 포터블 빌드를 시작합니다... (프로필: {profile})")
     
     script_dir = os.path.dirname(os.path.abspath(__file__))
     templates_path = os.path.join(script_dir, "templates")
+    compiled_path = os.path.join(script_dir, "build_temp", "compiled_templates")
+    assets_path = os.path.join(script_dir, "build_temp", "static_dist")
     main_script_path = os.path.join(script_dir, "MyTODO.py")
     
     
     print(f"[+] 템플릿 경로: {templates_path}")
     
+    if not compile_templates(script_dir, compiled_path):
+        return False
+    if not build_assets(script_dir, assets_path):
+        return False
+    
     # 빌드 명령어 구성
     cmd = [
         'pyinstaller',
-        '--onefile',                    # 단일 실행 파일
+        *BUILD_PROFILES[profile],       # 프로필별 옵션
         '--console',                    # 콘솔 창 표시 (디버깅용)
         '--name=MyTODO',                # 실행 파일명
         '--distpath=portable_build',    # 출력 디렉터리
         '--workpath=build_temp',        # 작업 디렉터리
         '--specpath=build_temp',        # spec 파일 위치
         f'--add-data={templates_path};templates',  # 템플릿 (절대 경로)
+        f'--add-data={compiled_path};compiled_templates',  # 컴파일된 템플릿
+        f'--add-data={assets_path};static_dist',  # 빌드된 정적 파일 (CDN 없이 오프라인에서 사용)
         '--hidden-import=flask',
         '--hidden-import=flask_sqlalchemy',
         '--hidden-import=werkzeug',
@@ -56,8 +130,6 @@ def build_portable():
         '--hidden-import=locale',       # 로케일 지원
         '--hidden-import=logging',      # 로깅 지원
         '--hidden-import=sqlalchemy.text',  # SQLAlchemy text 지원
-        '--collect-all=jinja2',         # Jinja2 전체 수집
-        '--collect-all=flask',          # Flask 전체 수집
         main_script_path                     # 메인 스크립트
     ]
     
@@ -73,7 +145,7 @@ def build_portable():
         print(f"오류 출력: {e.stderr}")
         return False
 
-def create_portable_package():
+def create_portable_package(profile=DEFAULT_PROFILE):
     """포터블 패키지 생성"""
     print("[+] 포터블 패키지를 생성합니다...")
     
@@ -84,17 +156,27 @@ def create_portable_package():
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
     
-    # 새 폴더 생성
-    os.makedirs(output_dir)
-    
-    # 실행 파일 복사
-    exe_path = os.path.join("portable_build", "MyTODO.exe")
-    if os.path.exists(exe_path):
-        shutil.copy2(exe_path, os.path.join(output_dir, "MyTODO.exe"))
-        print("[+] 실행 파일 복사 완료")
+    if profile == 'fast':
+        # 폴더형 빌드: 실행 파일과 _internal 라이브러리 폴더를 통째로 복사
+        bundle_dir = os.path.join("portable_build", "MyTODO")
+        if os.path.exists(os.path.join(bundle_dir, "MyTODO.exe")):
+            shutil.copytree(bundle_dir, output_dir)
+            print("[+] 실행 파일 폴더 복사 완료")
+        else:
+            print("[-] 실행 파일을 찾을 수 없습니다.")
+            return False
     else:
-        print("[-] 실행 파일을 찾을 수 없습니다.")
-        return False
+        # 새 폴더 생성
+        os.makedirs(output_dir)
+        
+        # 실행 파일 복사
+        exe_path = os.path.join("portable_build", "MyTODO.exe")
+        if os.path.exists(exe_path):
+            shutil.copy2(exe_path, os.path.join(output_dir, "MyTODO.exe"))
+            print("[+] 실행 파일 복사 완료")
+        else:
+            print("[-] 실행 파일을 찾을 수 없습니다.")
+            return False
     
     # README 파일 생성
     readme_content = """# MyTODO 포터블 앱
@@ -162,6 +244,13 @@ def cleanup():
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="Windows용 MyTODO 포터블 빌드 도구")
+    parser.add_argument('--profile', choices=sorted(BUILD_PROFILES), default=DEFAULT_PROFILE,
+                        help="onefile: 단일 실행 파일, fast: 시작이 빠른 폴더형 빌드")
+    parser.add_argument('--startup-budget-ms', type=float,
+                        help="지정하면 빌드 전에 오프라인 첫 응답까지의 시간을 재고, 중앙값이 이 값(ms)을 넘으면 빌드 중단")
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("Windows용 MyTODO 포터블 빌드 도구")
     print("=" * 50)
@@ -169,13 +258,18 @@ def main():
     # PyInstaller 확인
     if not check_pyinstaller():
         return
+
+    # 요청한 경우에만 느린 시작(DNS 조회 등)이 다시 들어오지 않았는지 확인한 뒤 빌드
+    # (빌드하는 컴퓨터의 부하에 따라 결과가 달라지므로 기본으로는 하지 않음)
+    if args.startup_budget_ms is not None and not check_startup_budget(os.path.dirname(os.path.abspath(__file__)), args.startup_budget_ms):
+        return
     
     # 빌드 실행
-    if not build_portable():
+    if not build_portable(args.profile):
         return
     
     # 포터블 패키지 생성
-    if not create_portable_package():
+    if not create_portable_package(args.profile):
         return
     
     